@@ -24,7 +24,7 @@ python --version
 
 REM Install dependencies
 echo Installing dependencies...
-pip install numpy scipy
+pip install "numpy>=1.23" "scipy>=1.10"
 
 REM Method 1: Direct Python execution
 echo Method 1: Running Python version...
@@ -3,15 +3,91 @@
 #https://mckenzie.page
 #Python Simple Statistical Tests
 
-from typing import Dict, List, Optional, Tuple
-import statistics
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
 from utils.validators import validate_numeric_data, parse_comma_separated
+from utils.sufficient_stats import RunningMoments
+from utils.ranking import RankInfo
+from utils.loaders import load_numeric_file
+
+SESSION_MANIFEST = "manifest.json"
+SESSION_FORMAT_VERSION = 1
+
+# Names select_dataset returns for data typed in directly; they are never
+# stored, so cached moments or ranks can't be looked up for the wrong data
+DIRECT_INPUT = "direct_input"
+DIRECT_INPUT_X = "direct_input_X"
+DIRECT_INPUT_Y = "direct_input_Y"
+RESERVED_NAMES = frozenset((DIRECT_INPUT, DIRECT_INPUT_X, DIRECT_INPUT_Y))
 
 class DataManager:
     """Manages datasets for statistical testing"""
     
     def __init__(self):
-        self.datasets: Dict[str, List[float]] = {}
+        # Each dataset is a contiguous, read-only float64 array
+        self.datasets: Dict[str, np.ndarray] = {}
+        self.metadata: Dict[str, Dict[str, Any]] = {}
+        # Summary statistics keyed by dataset name, dropped whenever the dataset changes
+        self._summary_cache: Dict[str, Dict[str, Any]] = {}
+        # Running count/mean/M2/min/max per dataset, updated in place on append
+        self._moments: Dict[str, RunningMoments] = {}
+        # Sort permutation, ranks and tie runs per dataset, shared by the rank-based tests
+        self._rank_info: Dict[str, RankInfo] = {}
+        # Over-allocated backing arrays for datasets that have been appended to
+        self._buffers: Dict[str, np.ndarray] = {}
+    
+    def _store(self, name: str, values: Union[Sequence[float], np.ndarray],
+               source: str = "manual", copy: bool = True) -> np.ndarray:
+        """
+        Store values as a contiguous float64 array with metadata
+        
+        Args:
+            name: Name for the dataset
+            values: Numeric values to store
+            source: Where the data came from (e.g. "manual", a file path)
+            copy: Copy the values; pass False for freshly parsed arrays
+                  that nothing else references
+            
+        Returns:
+            The stored (read-only) array
+        """
+        if copy:
+            array = np.array(values, dtype=np.float64, order='C')
+        else:
+            array = np.ascontiguousarray(values, dtype=np.float64)
+        if array.ndim != 1:
+            array = array.ravel()
+        array.setflags(write=False)
+        
+        self._buffers.pop(name, None)
+        self._register(name, array, source)
+        return array
+    
+    
+    def _register(self, name: str, array: np.ndarray, source: str,
+                  moments: Optional[RunningMoments] = None):
+        """Install an array under a name and invalidate anything derived from the old one"""
+        if name in RESERVED_NAMES:
+            raise ValueError(f"'{name}' is reserved for data entered directly")
+        
+        previous = self.metadata.get(name)
+        self._summary_cache.pop(name, None)
+        self._rank_info.pop(name, None)
+        if moments is None:
+            self._moments.pop(name, None)
+        else:
+            self._moments[name] = moments
+        
+        self.datasets[name] = array
+        self.metadata[name] = {
+            'source': source,
+            'dtype': str(array.dtype),
+            'nbytes': array.nbytes,
+            'version': previous['version'] + 1 if previous else 1,
+        }
     
     def add_dataset(self, name: str, data_str: str) -> bool:
         """
@@ -27,43 +103,214 @@ class DataManager:
         try:
             data = parse_comma_separated(data_str)
             if validate_numeric_data(data):
-                self.datasets[name] = data
+                self._store(name, data, copy=False)
                 return True
             return False
         except Exception as e:
             print(f"Error adding dataset: {e}")
             return False
     
-    def get_dataset(self, name: str) -> Optional[List[float]]:
-        """Get dataset by name"""
-        return self.datasets.get(name)
+    def add_dataset_from_file(self, name: str, path: str, column: Optional[Union[int, str]] = None,
+                              delimiter: Optional[str] = None) -> bool:
+        """
+        Add a dataset from one column of a CSV, TSV or plain text file
+        
+        Args:
+            name: Name for the dataset
+            path: File path
+            column: Zero-based column index or header name (default: the
+                    first column, or the whole line of a one-line file)
+            delimiter: Field delimiter (detected automatically if None)
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            data = load_numeric_file(path, column, delimiter)
+            self._store(name, data, source=os.path.abspath(path), copy=False)
+            return True
+        except (OSError, ValueError) as e:
+            print(f"Error loading file: {e}")
+            return False
+    
+    def append_to_dataset(self, name: str, values: Union[str, Sequence[float], np.ndarray]) -> bool:
+        """
+        Append values to an existing dataset (or create it)
+        
+        The dataset's running moments are merged with the moments of the new
+        block (Chan/Welford update) rather than recomputed, and the values are
+        written into an over-allocated buffer so repeated appends are
+        amortized O(new values).
+        
+        Args:
+            name: Name of the dataset
+            values: Comma-separated string or sequence of numbers to append
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            if isinstance(values, str):
+                values = parse_comma_separated(values)
+            if not validate_numeric_data(values):
+                return False
+            
+            new_values = np.asarray(values, dtype=np.float64).ravel()
+            existing = self.datasets.get(name)
+            if existing is None:
+                self._store(name, new_values, source="append")
+                return True
+            
+            # Fold the new block into the running moments before they are replaced
+            moments = self.get_moments(name).merge(RunningMoments.from_array(new_values))
+            
+            n_old = len(existing)
+            n_new = n_old + len(new_values)
+            buffer = self._buffers.get(name)
+            if buffer is None or len(buffer) < n_new:
+                grown = np.empty(max(n_new, 2 * n_old), dtype=np.float64)
+                grown[:n_old] = existing
+                buffer = grown
+                self._buffers[name] = buffer
+            buffer[n_old:n_new] = new_values
+            
+            # Existing views only cover the first n_old values, which are never rewritten
+            array = buffer[:n_new]
+            array.setflags(write=False)
+            self._register(name, array, self.metadata[name]['source'], moments)
+            return True
+        except Exception as e:
+            print(f"Error appending to dataset: {e}")
+            return False
+    
+    def get_moments(self, name: str) -> Optional[RunningMoments]:
+        """
+        Get running moments (count, mean, M2, min, max) for a dataset
+        
+        Computed on first use and then maintained incrementally by
+        append_to_dataset, so callers never need to rescan the data.
+        
+        Args:
+            name: Name of the dataset
+            
+        Returns:
+            RunningMoments, or None if the dataset does not exist
+        """
+        data = self.datasets.get(name)
+        if data is None:
+            return None
+        
+        moments = self._moments.get(name)
+        if moments is None:
+            moments = RunningMoments.from_array(data)
+            self._moments[name] = moments
+        return moments.copy()
+    
+    def get_rank_info(self, name: str) -> Optional[RankInfo]:
+        """
+        Get the sort permutation, ranks and tie counts of a dataset
+        
+        Computed on first use and kept until the dataset changes, so the
+        rank-based tests sort each stored dataset only once.
+        
+        Args:
+            name: Name of the dataset
+            
+        Returns:
+            RankInfo (read-only), or None if the dataset does not exist
+        """
+        data = self.datasets.get(name)
+        if data is None:
+            return None
+        
+        rank_info = self._rank_info.get(name)
+        if rank_info is None:
+            rank_info = RankInfo.from_array(data)
+            self._rank_info[name] = rank_info
+        return rank_info
+    
+    def get_dataset(self, name: str) -> Optional[np.ndarray]:
+        """Get a read-only view of a dataset by name"""
+        data = self.datasets.get(name)
+        return data.view() if data is not None else None
+    
+    def get_metadata(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get storage metadata for a dataset"""
+        meta = self.metadata.get(name)
+        return dict(meta) if meta is not None else None
     
     def list_datasets(self) -> List[str]:
         """Get list of all dataset names"""
         return list(self.datasets.keys())
     
+    def datasets_by_length(self) -> Dict[int, List[str]]:
+        """
+        Group dataset names by length, for analyses that need paired observations
+        
+        Returns:
+            Dictionary mapping each length to the names of the datasets of that length
+        """
+        groups: Dict[int, List[str]] = {}
+        for name, data in self.datasets.items():
+            groups.setdefault(len(data), []).append(name)
+        return groups
+    
     def remove_dataset(self, name: str) -> bool:
         """Remove a dataset"""
         if name in self.datasets:
             del self.datasets[name]
+            self.metadata.pop(name, None)
+            self._summary_cache.pop(name, None)
+            self._moments.pop(name, None)
+            self._rank_info.pop(name, None)
+            self._buffers.pop(name, None)
             return True
         return False
     
+    @staticmethod
+    def _compute_summary(data: np.ndarray, moments: RunningMoments) -> Dict[str, Any]:
+        """
+        Compute summary statistics from running moments plus a median
+        
+        The median uses a partial sort (np.partition), which is linear time
+        instead of the full sort done by statistics.median.
+        
+        Args:
+            data: Dataset values
+            moments: Running moments of the dataset
+            
+        Returns:
+            Dictionary of summary statistics
+        """
+        n = len(data)
+        half = n // 2
+        if n % 2:
+            median = float(np.partition(data, half)[half])
+        else:
+            lower_upper = np.partition(data, [half - 1, half])
+            median = float((lower_upper[half - 1] + lower_upper[half]) / 2)
+        
+        return {
+            'count': n,
+            'mean': moments.mean,
+            'median': median,
+            'std_dev': moments.std_dev if n > 1 else 0,
+            'min': moments.minimum,
+            'max': moments.maximum
+        }
+    
     def get_dataset_info(self, name: str) -> Optional[dict]:
-        """Get basic statistics about a dataset"""
-        data = self.get_dataset(name)
+        """Get basic statistics about a dataset (cached until the dataset changes)"""
+        data = self.datasets.get(name)
         if data is None:
             return None
         
-        return {
-            'name': name,
-            'count': len(data),
-            'mean': statistics.mean(data),
-            'median': statistics.median(data),
-            'std_dev': statistics.stdev(data) if len(data) > 1 else 0,
-            'min': min(data),
-            'max': max(data)
-        }
+        summary = self._summary_cache.get(name)
+        if summary is None:
+            summary = self._compute_summary(data, self.get_moments(name))
+            self._summary_cache[name] = summary
+        
+        return {'name': name, **summary}
     
     def display_datasets(self):
         """Display all datasets with basic info"""
@@ -84,7 +331,127 @@ class DataManager:
                       f"{info['std_dev']:<12.3f} {range_str:<15}")
         print("-" * 80)
     
-    def input_single_dataset(self, prompt: str = "Enter data", allow_naming: bool = True) -> List[float]:
+    @staticmethod
+    def _session_filename(name: str) -> str:
+        """Stable, filesystem-safe .npy filename for a dataset name"""
+        return hashlib.sha1(name.encode('utf-8')).hexdigest()[:16] + ".npy"
+    
+    @staticmethod
+    def _write_atomic(path: str, write):
+        """Write a file through a temporary name so readers never see a partial file"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    
+    def save_session(self, directory: str) -> bool:
+        """
+        Save all datasets to a session directory
+        
+        Each dataset is written as a raw float64 .npy file; names, metadata,
+        running moments and summaries go into a JSON manifest. Datasets that
+        were loaded from (or last saved to) the same file and have not changed
+        since are not rewritten.
+        
+        Args:
+            directory: Session directory (created if needed)
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            os.makedirs(directory, exist_ok=True)
+            manifest_path = os.path.join(directory, SESSION_MANIFEST)
+            previous_files = set()
+            if os.path.exists(manifest_path):
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    previous_files = {entry['file'] for entry in json.load(f).get('datasets', [])}
+            
+            entries = []
+            
+            for name, data in self.datasets.items():
+                filename = self._session_filename(name)
+                path = os.path.abspath(os.path.join(directory, filename))
+                meta = self.metadata[name]
+                
+                unchanged = (meta.get('session_file') == path and
+                             meta.get('session_version') == meta['version'] and
+                             os.path.exists(path))
+                if not unchanged:
+                    self._write_atomic(path, lambda f, data=data: np.save(f, np.ascontiguousarray(data)))
+                
+                entries.append({
+                    'name': name,
+                    'file': filename,
+                    'source': meta['source'],
+                    'count': len(data),
+                    'moments': self.get_moments(name).to_dict(),
+                    'summary': {k: v for k, v in self.get_dataset_info(name).items() if k != 'name'},
+                })
+                meta['session_file'] = path
+                meta['session_version'] = meta['version']
+            
+            manifest = {'format_version': SESSION_FORMAT_VERSION, 'datasets': entries}
+            self._write_atomic(manifest_path,
+                               lambda f: f.write(json.dumps(manifest, indent=2).encode('utf-8')))
+            
+            # Drop files of the previous save whose datasets no longer exist
+            referenced = {entry['file'] for entry in entries}
+            for filename in previous_files - referenced:
+                if os.path.exists(os.path.join(directory, filename)):
+                    try:
+                        os.remove(os.path.join(directory, filename))
+                    except OSError:
+                        pass  # Still mapped by this process (Windows); harmless to keep
+            return True
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Error saving session: {e}")
+            return False
+    
+    def load_session(self, directory: str) -> bool:
+        """
+        Load datasets saved by save_session
+        
+        Arrays are opened with np.load(mmap_mode='r'), i.e. as read-only
+        np.memmap objects, so restoring is close to instant and data is paged
+        in lazily as tests touch it. Moments and summaries come from the
+        manifest, so listing datasets does not read the arrays either.
+        Loaded datasets replace any existing datasets with the same name.
+        
+        Args:
+            directory: Session directory
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            with open(os.path.join(directory, SESSION_MANIFEST), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            
+            if manifest.get('format_version') != SESSION_FORMAT_VERSION:
+                print(f"Unsupported session format: {manifest.get('format_version')}")
+                return False
+            
+            for entry in manifest['datasets']:
+                path = os.path.abspath(os.path.join(directory, entry['file']))
+                array = np.load(path, mmap_mode='r')
+                
+                if array.ndim != 1 or array.dtype != np.float64 or len(array) != entry['count']:
+                    raise ValueError(f"Session file for '{entry['name']}' does not match the manifest")
+                
+                name = entry['name']
+                self._buffers.pop(name, None)
+                self._register(name, array, entry['source'],
+                               RunningMoments.from_dict(entry['moments']))
+                self._summary_cache[name] = entry['summary']
+                self.metadata[name]['session_file'] = path
+                self.metadata[name]['session_version'] = self.metadata[name]['version']
+            return True
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading session: {e}")
+            return False
+    
+    def input_single_dataset(self, prompt: str = "Enter data", allow_naming: bool = True) -> np.ndarray:
         """
         Interactive input for a single dataset
         
@@ -93,7 +460,7 @@ class DataManager:
             allow_naming: Whether to prompt for dataset naming after input
             
         Returns:
-            List of float values
+            Array of float64 values
         """
         while True:
             try:
@@ -121,7 +488,7 @@ class DataManager:
                                     break
                                 else:
                                     print("Please enter a valid name.")
-                    return data
+                    return np.asarray(data, dtype=np.float64)
                 else:
                     print("Invalid data format. Please enter numeric values only.")
                     
@@ -129,7 +496,7 @@ class DataManager:
                 print(f"Error parsing data: {e}")
                 print("Please try again with comma-separated numbers.")
     
-    def select_dataset(self, prompt: str = "Select dataset") -> Tuple[str, List[float]]:
+    def select_dataset(self, prompt: str = "Select dataset") -> Tuple[str, np.ndarray]:
         """
         Interactive dataset selection
         
@@ -142,7 +509,7 @@ class DataManager:
         if not self.datasets:
             print("No datasets available. Please enter data directly.")
             data = self.input_single_dataset("Enter your data")
-            return "direct_input", data
+            return DIRECT_INPUT, data
         
         print(f"\n{prompt}:")
         print("0. Enter new data directly")
@@ -162,10 +529,10 @@ class DataManager:
                 
                 if choice_num == 0:
                     data = self.input_single_dataset("Enter your data")
-                    return "direct_input", data
+                    return DIRECT_INPUT, data
                 elif 1 <= choice_num <= len(dataset_names):
                     name = dataset_names[choice_num - 1]
-                    return name, self.datasets[name]
+                    return name, self.get_dataset(name)
                 else:
                     print(f"Please enter a number between 0 and {len(dataset_names)}")
                     
@@ -173,7 +540,7 @@ class DataManager:
                 print("Please enter a valid number.")
     
     def select_two_datasets(self, x_prompt: str = "Select X variable dataset", 
-                           y_prompt: str = "Select Y variable dataset") -> Tuple[Tuple[str, List[float]], Tuple[str, List[float]]]:
+                           y_prompt: str = "Select Y variable dataset") -> Tuple[Tuple[str, np.ndarray], Tuple[str, np.ndarray]]:
         """
         Interactive selection for two datasets with custom prompts for X and Y variables
         
@@ -188,7 +555,7 @@ class DataManager:
             print("No datasets available. Please enter data directly.")
             x_data = self.input_single_dataset("Enter your data (X)")
             y_data = self.input_single_dataset("Enter your data (Y)")
-            return ("direct_input_X", x_data), ("direct_input_Y", y_data)
+            return (DIRECT_INPUT_X, x_data), (DIRECT_INPUT_Y, y_data)
         
         # Select X dataset
         x_name, x_data = self.select_dataset(x_prompt)
@@ -6,6 +6,7 @@
 
 import sys
 import os
+import sqlite3
 
 # Add current directory to path to import local modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -13,6 +14,10 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from menu_system import MenuSystem
 from data_manager import DataManager
 from utils.formatters import print_header, print_separator
+from utils.result_cache import enable_disk_cache
+
+# Persistent store for test results, reused across runs and processes
+RESULT_CACHE_FILE = "result_cache.sqlite3"
 
 def main():
     """Main application entry point"""
@@ -21,10 +26,15 @@ def main():
     print("https://mckenzie.page")
     print()
     print("Welcome to the comprehensive statistical testing toolkit!")
-    print("This application supports 13 different statistical tests with flexible data input.")
+    print("This application supports 15 different statistical tests with flexible data input.")
     print_separator()
     
     # Initialize core components
+    try:
+        enable_disk_cache(RESULT_CACHE_FILE)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Persistent result cache unavailable: {e}")
+    
     data_manager = DataManager()
     menu_system = MenuSystem(data_manager)
     
@@ -10,7 +10,15 @@ from tests.parametric_tests import ParametricTests
 from tests.nonparametric_tests import NonParametricTests
 from tests.chi_square_tests import ChiSquareTests
 from tests.correlation_tests import CorrelationTests
+from tests.regression_tests import RegressionTests
+from tests.posthoc_tests import PostHocTests
 from utils.formatters import print_header, print_separator
+from utils.validators import get_float_input
+from utils.loaders import stream_category_counts, stream_contingency_table
+from utils.sufficient_stats import ContingencyCounts
+from utils import result_cache as cache
+
+DEFAULT_SESSION_DIR = "saved_session"
 
 class MenuSystem:
     """Interactive menu system for statistical tests"""
@@ -21,6 +29,8 @@ class MenuSystem:
         self.nonparametric_tests = NonParametricTests()
         self.chi_square_tests = ChiSquareTests()
         self.correlation_tests = CorrelationTests()
+        self.regression_tests = RegressionTests()
+        self.posthoc_tests = PostHocTests()
         
         # Menu structure
         self.test_menu = {
@@ -37,6 +47,8 @@ class MenuSystem:
             '11': ('Kruskal-Wallis Test', self._kruskal_wallis_menu),
             '12': ("Spearman's Rank Correlation", self._spearman_menu),
             '13': ('Linear Regression Analysis', self._linear_regression_menu),
+            '14': ('Multiple Regression Analysis', self._multiple_regression_menu),
+            '15': ('Correlation Matrix (all datasets)', self._correlation_matrix_menu),
         }
     
     def run(self):
@@ -86,6 +98,11 @@ class MenuSystem:
             print("1. Add new dataset")
             print("2. View datasets")
             print("3. Remove dataset")
+            print("4. Append to dataset")
+            print("5. Save session")
+            print("6. Load session")
+            print("7. Load dataset from file")
+            print("8. Result cache statistics")
             print("0. Back to main menu")
             print_separator()
             
@@ -99,6 +116,16 @@ class MenuSystem:
                 self._view_datasets()
             elif choice == '3':
                 self._remove_dataset()
+            elif choice == '4':
+                self._append_to_dataset()
+            elif choice == '5':
+                self._save_session()
+            elif choice == '6':
+                self._load_session()
+            elif choice == '7':
+                self._add_dataset_from_file()
+            elif choice == '8':
+                self._result_cache_stats()
             else:
                 print("Invalid choice.")
             
@@ -133,6 +160,101 @@ class MenuSystem:
         else:
             print("Failed to add dataset. Please check your data format.")
     
+    def _add_dataset_from_file(self):
+        """Add a dataset from a CSV, TSV or plain text file"""
+        print("\nLoad Dataset From File")
+        print_separator("-", 30)
+        
+        path = input("Enter file path: ").strip().strip('"')
+        if not path:
+            print("File path cannot be empty.")
+            return
+        
+        column_str = input("Column number (1-based) or header name (default 1): ").strip()
+        column = int(column_str) - 1 if column_str.isdigit() else (column_str or None)
+        
+        name = input("Enter dataset name: ").strip()
+        if not name:
+            print("Dataset name cannot be empty.")
+            return
+        
+        if self.data_manager.add_dataset_from_file(name, path, column):
+            info = self.data_manager.get_dataset_info(name)
+            print(f"Dataset '{name}' loaded: n={info['count']}, mean={info['mean']:.3f}, std={info['std_dev']:.3f}")
+    
+    def _append_to_dataset(self):
+        """Append values to an existing dataset"""
+        datasets = self.data_manager.list_datasets()
+        if not datasets:
+            print("No datasets to append to.")
+            return
+        
+        print("\nAppend to Dataset")
+        print_separator("-", 30)
+        
+        for i, name in enumerate(datasets, 1):
+            print(f"{i}. {name}")
+        
+        try:
+            choice = int(input("Enter dataset number: "))
+        except ValueError:
+            print("Please enter a valid number.")
+            return
+        
+        if not 1 <= choice <= len(datasets):
+            print("Invalid dataset number.")
+            return
+        
+        name = datasets[choice - 1]
+        print("Enter values to append as comma-separated numbers:")
+        data_str = input("> ").strip()
+        
+        if self.data_manager.append_to_dataset(name, data_str):
+            info = self.data_manager.get_dataset_info(name)
+            print(f"Dataset '{name}' updated: n={info['count']}, mean={info['mean']:.3f}, std={info['std_dev']:.3f}")
+        else:
+            print("Failed to append data. Please check your data format.")
+    
+    def _save_session(self):
+        """Save all datasets to a session directory"""
+        if not self.data_manager.list_datasets():
+            print("No datasets to save.")
+            return
+        
+        directory = input(f"Session directory (default '{DEFAULT_SESSION_DIR}'): ").strip() or DEFAULT_SESSION_DIR
+        if self.data_manager.save_session(directory):
+            print(f"Saved {len(self.data_manager.list_datasets())} dataset(s) to '{directory}'.")
+    
+    def _load_session(self):
+        """Load datasets from a session directory"""
+        directory = input(f"Session directory (default '{DEFAULT_SESSION_DIR}'): ").strip() or DEFAULT_SESSION_DIR
+        if self.data_manager.load_session(directory):
+            print(f"Session loaded from '{directory}'.")
+            self.data_manager.display_datasets()
+    
+    def _result_cache_stats(self):
+        """Show result cache usage and optionally clear it"""
+        stats = cache.result_cache.stats()
+        print("\nResult Cache")
+        print_separator("-", 30)
+        print(f"Entries: {stats['entries']} / {stats['max_entries']}")
+        print(f"Memory: {stats['bytes'] / 1024:.1f} KB / {stats['max_bytes'] / 1024:.0f} KB")
+        print(f"Hits: {stats['hits']}, Misses: {stats['misses']} (hit rate {stats['hit_rate']:.1%})")
+        print(f"Evictions: {stats['evictions']}")
+        
+        if cache.disk_cache is not None:
+            disk_stats = cache.disk_cache.stats()
+            print(f"\nPersistent cache: {disk_stats['path']}")
+            print(f"Entries: {disk_stats['entries']}")
+            print(f"Size: {disk_stats['bytes'] / 1024:.1f} KB / {disk_stats['max_bytes'] / 1024:.0f} KB")
+            print(f"Hits: {disk_stats['hits']}, Misses: {disk_stats['misses']}")
+        
+        if input("Clear cache? (y/n): ").strip().lower() == 'y':
+            cache.result_cache.clear()
+            if cache.disk_cache is not None:
+                cache.disk_cache.clear()
+            print("Result cache cleared.")
+    
     def _view_datasets(self):
         """View all stored datasets"""
         print("\nStored Datasets")
@@ -190,15 +312,10 @@ class MenuSystem:
         
         if choice == '1':
             # One-sample test
-            _, data = self.data_manager.select_dataset("Select dataset for one-sample test")
-            # Get hypothesized median
-            while True:
-                try:
-                    hyp_median = float(input("Enter hypothesized median (default 0): ") or "0")
-                    break
-                except ValueError:
-                    print("Please enter a valid number.")
-            self.nonparametric_tests.one_sample_wilcoxon_test(data, hyp_median)
+            name, data = self.data_manager.select_dataset("Select dataset for one-sample test")
+            hyp_median = get_float_input("Enter hypothesized median (default 0): ")
+            self.nonparametric_tests.one_sample_wilcoxon_test(data, hyp_median,
+                                                              rank_info=self.data_manager.get_rank_info(name))
         elif choice == '2':
             # Two-sample paired test
             _, data1 = self.data_manager.select_dataset("Select first paired sample (e.g., before)")
@@ -209,14 +326,18 @@ class MenuSystem:
     
     def _students_t_menu(self):
         """Student's T-Test menu"""
-        _, data = self.data_manager.select_dataset("Select dataset for one-sample t-test")
-        self.parametric_tests.students_t_test(data)
+        name, data = self.data_manager.select_dataset("Select dataset for one-sample t-test")
+        population_mean = get_float_input("Enter hypothesized population mean (default 0): ")
+        self.parametric_tests.students_t_test(data, population_mean,
+                                              moments=self.data_manager.get_moments(name))
     
     def _independent_t_menu(self):
         """Independent T-Test menu"""
-        _, data1 = self.data_manager.select_dataset("Select first independent sample")
-        _, data2 = self.data_manager.select_dataset("Select second independent sample")
-        self.parametric_tests.independent_t_test(data1, data2)
+        name1, data1 = self.data_manager.select_dataset("Select first independent sample")
+        name2, data2 = self.data_manager.select_dataset("Select second independent sample")
+        self.parametric_tests.independent_t_test(data1, data2,
+                                                 moments1=self.data_manager.get_moments(name1),
+                                                 moments2=self.data_manager.get_moments(name2))
     
     def _paired_t_menu(self):
         """Paired T-Test menu"""
@@ -226,12 +347,22 @@ class MenuSystem:
     
     def _mann_whitney_menu(self):
         """Mann-Whitney U Test menu"""
-        _, data1 = self.data_manager.select_dataset("Select first independent sample")
-        _, data2 = self.data_manager.select_dataset("Select second independent sample")
-        self.nonparametric_tests.mann_whitney_test(data1, data2)
+        name1, data1 = self.data_manager.select_dataset("Select first independent sample")
+        name2, data2 = self.data_manager.select_dataset("Select second independent sample")
+        self.nonparametric_tests.mann_whitney_test(data1, data2,
+                                                   rank_info1=self.data_manager.get_rank_info(name1),
+                                                   rank_info2=self.data_manager.get_rank_info(name2))
     
     def _chi_square_gof_menu(self):
         """Chi-Square Goodness of Fit menu"""
+        print("1. Enter observed frequencies")
+        print("2. Count categories in a file of raw records")
+        if input("Select option (1-2, default 1): ").strip() == '2':
+            counts = self._load_category_records(1)
+            if counts is not None:
+                self.chi_square_tests.chi_square_goodness_of_fit(counts)
+            return
+        
         print("Enter observed frequencies (comma-separated):")
         observed_str = input("> ").strip()
         
@@ -259,9 +390,58 @@ class MenuSystem:
     
     def _chi_square_assoc_menu(self):
         """Chi-Square Test of Association menu"""
-        contingency_table = self.chi_square_tests.input_contingency_table()
+        print("1. Enter contingency table")
+        print("2. Cross-tabulate two category datasets (one record per position)")
+        print("3. Cross-tabulate two columns of a file of raw records")
+        option = input("Select option (1-3, default 1): ").strip()
+        
+        if option == '2':
+            (_, row_data), (_, col_data) = self.data_manager.select_two_datasets(
+                "Select row category dataset",
+                "Select column category dataset"
+            )
+            if len(row_data) != len(col_data):
+                print("Category datasets must have equal length.")
+                return
+            contingency_table = ContingencyCounts.from_arrays(row_data, col_data)
+        elif option == '3':
+            contingency_table = self._load_category_records(2)
+            if contingency_table is None:
+                return
+        else:
+            contingency_table = self.chi_square_tests.input_contingency_table()
         self.chi_square_tests.chi_square_association(contingency_table)
     
+    def _load_category_records(self, n_columns: int):
+        """
+        Ask for a file of raw categorical records and count it in chunks
+        
+        Args:
+            n_columns: 1 for category counts, 2 for a contingency table
+        
+        Returns:
+            CategoryCounts or ContingencyCounts, or None if loading failed
+        """
+        path = input("Enter file path: ").strip().strip('"')
+        if not path:
+            print("File path cannot be empty.")
+            return None
+        
+        prompts = ["Category"] if n_columns == 1 else ["Row category", "Column category"]
+        columns = []
+        for default, which in enumerate(prompts, 1):
+            column_str = input(f"{which} column number (1-based) or header name (default {default}): ").strip()
+            columns.append(int(column_str) - 1 if column_str.isdigit() else (column_str or default - 1))
+        has_header = input("Does the file have a header line? (y/n, default y): ").strip().lower() != 'n'
+        
+        try:
+            if n_columns == 1:
+                return stream_category_counts(path, columns[0], has_header=has_header)
+            return stream_contingency_table(path, columns[0], columns[1], has_header=has_header)
+        except (OSError, ValueError) as e:
+            print(f"Error loading file: {e}")
+            return None
+    
     def _coefficient_determination_menu(self):
         """Coefficient of Determination menu"""
         (_, x_data), (_, y_data) = self.data_manager.select_two_datasets(
@@ -272,22 +452,54 @@ class MenuSystem:
     
     def _f_test_menu(self):
         """F-Test menu"""
-        _, data1 = self.data_manager.select_dataset("Select first sample")
-        _, data2 = self.data_manager.select_dataset("Select second sample")
-        self.parametric_tests.f_test(data1, data2)
+        name1, data1 = self.data_manager.select_dataset("Select first sample")
+        name2, data2 = self.data_manager.select_dataset("Select second sample")
+        self.parametric_tests.f_test(data1, data2,
+                                     moments1=self.data_manager.get_moments(name1),
+                                     moments2=self.data_manager.get_moments(name2))
+    
+    def _select_grouped_data(self):
+        """
+        Ask whether groups are entered one by one or as value + label datasets
+        
+        Returns:
+            (values, labels) for label-indexed data, or None for group-by-group entry
+        """
+        print("1. Enter groups one by one")
+        print("2. Grouped data (one values dataset + one group label dataset)")
+        if input("Select option (1-2, default 1): ").strip() != '2':
+            return None
+        
+        (_, values), (_, labels) = self.data_manager.select_two_datasets(
+            "Select values dataset",
+            "Select group label dataset"
+        )
+        if len(values) != len(labels):
+            raise ValueError("Values and labels must have equal length")
+        return values, labels
     
     def _anova_menu(self):
         """One-Way ANOVA menu"""
+        grouped = self._select_grouped_data()
+        if grouped is not None:
+            results = self.parametric_tests.one_way_anova_grouped(*grouped)
+            self._anova_post_hoc(results, list(results.details['group_labels']))
+            return
+        
         print("One-Way ANOVA - Enter groups one by one")
         groups = []
+        group_moments = []
+        names = []
         group_num = 1
         
         while True:
             print(f"\nGroup {group_num} (press Enter without data to finish):")
-            _, data = self.data_manager.select_dataset(f"Select dataset for Group {group_num}")
+            name, data = self.data_manager.select_dataset(f"Select dataset for Group {group_num}")
             
-            if data:
+            if data is not None and len(data) > 0:
                 groups.append(data)
+                group_moments.append(self.data_manager.get_moments(name))
+                names.append(name)
                 group_num += 1
                 
                 if len(groups) >= 2:
@@ -298,22 +510,47 @@ class MenuSystem:
                 break
         
         if len(groups) >= 2:
-            self.parametric_tests.one_way_anova(*groups)
+            results = self.parametric_tests.one_way_anova(*groups, group_moments=group_moments)
+            self._anova_post_hoc(results, names)
         else:
             print("ANOVA requires at least 2 groups.")
     
+    def _anova_post_hoc(self, results, group_labels):
+        """Offer all-pairs comparisons after a one-way ANOVA"""
+        print("\nPost-hoc pairwise comparisons:")
+        print("1. Tukey HSD")
+        print("2. Games-Howell (unequal variances)")
+        print("3. Skip")
+        choice = input("Select option (1-3, default 3): ").strip()
+        
+        group_moments = results.details['group_moments']
+        if choice == '1':
+            self.posthoc_tests.tukey_hsd(group_moments=group_moments, group_labels=group_labels)
+        elif choice == '2':
+            self.posthoc_tests.games_howell(group_moments=group_moments, group_labels=group_labels)
+    
     def _kruskal_wallis_menu(self):
         """Kruskal-Wallis Test menu"""
+        grouped = self._select_grouped_data()
+        if grouped is not None:
+            results = self.nonparametric_tests.kruskal_wallis_grouped(*grouped)
+            self._kruskal_wallis_post_hoc(results, list(results.details['group_labels']))
+            return
+        
         print("Kruskal-Wallis Test - Enter groups one by one")
         groups = []
+        rank_infos = []
+        names = []
         group_num = 1
         
         while True:
             print(f"\nGroup {group_num} (press Enter without data to finish):")
-            _, data = self.data_manager.select_dataset(f"Select dataset for Group {group_num}")
+            name, data = self.data_manager.select_dataset(f"Select dataset for Group {group_num}")
             
-            if data:
+            if data is not None and len(data) > 0:
                 groups.append(data)
+                rank_infos.append(self.data_manager.get_rank_info(name))
+                names.append(name)
                 group_num += 1
                 
                 if len(groups) >= 2:
@@ -324,17 +561,28 @@ class MenuSystem:
                 break
         
         if len(groups) >= 2:
-            self.nonparametric_tests.kruskal_wallis_test(*groups)
+            results = self.nonparametric_tests.kruskal_wallis_test(*groups, rank_infos=rank_infos)
+            self._kruskal_wallis_post_hoc(results, names)
         else:
             print("Kruskal-Wallis test requires at least 2 groups.")
     
+    def _kruskal_wallis_post_hoc(self, results, group_labels):
+        """Offer Dunn's test after a Kruskal-Wallis test"""
+        if 'error' in results:
+            return
+        if input("\nRun Dunn's post-hoc test (Holm-adjusted)? (y/n): ").strip().lower() == 'y':
+            self.posthoc_tests.dunn_test(rank_summary=results.details['rank_summary'],
+                                         group_labels=group_labels)
+    
     def _spearman_menu(self):
         """Spearman's Rank Correlation menu"""
-        (_, x_data), (_, y_data) = self.data_manager.select_two_datasets(
+        (x_name, x_data), (y_name, y_data) = self.data_manager.select_two_datasets(
             "Select X variable dataset", 
             "Select Y variable dataset"
         )
-        self.correlation_tests.spearmans_rank_correlation(x_data, y_data)
+        self.correlation_tests.spearmans_rank_correlation(x_data, y_data,
+                                                          rank_info_x=self.data_manager.get_rank_info(x_name),
+                                                          rank_info_y=self.data_manager.get_rank_info(y_name))
     
     def _linear_regression_menu(self):
         """Linear Regression Analysis menu"""
@@ -343,3 +591,58 @@ class MenuSystem:
             "Select Y variable (response) dataset"
         )
         self.correlation_tests.linear_regression_tests(x_data, y_data)
+    
+    def _multiple_regression_menu(self):
+        """Multiple Regression Analysis menu"""
+        _, y_data = self.data_manager.select_dataset("Select Y variable (response) dataset")
+        
+        print("Multiple Regression - Enter predictors one by one")
+        predictors = []
+        names = []
+        
+        while True:
+            print(f"\nPredictor {len(predictors) + 1} (press Enter without data to finish):")
+            name, data = self.data_manager.select_dataset(f"Select dataset for predictor {len(predictors) + 1}")
+            
+            if data is not None and len(data) > 0:
+                predictors.append(data)
+                names.append(name)
+                
+                continue_input = input("Add another predictor? (y/n): ").strip().lower()
+                if continue_input != 'y':
+                    break
+            else:
+                break
+        
+        if predictors:
+            self.regression_tests.multiple_regression(predictors, y_data, predictor_names=names)
+        else:
+            print("Multiple regression requires at least 1 predictor.")
+    
+    def _correlation_matrix_menu(self):
+        """All-pairs correlation matrix over stored datasets of equal length"""
+        candidates = {length: names for length, names in self.data_manager.datasets_by_length().items()
+                      if len(names) >= 2}
+        if not candidates:
+            print("A correlation matrix needs at least 2 stored datasets of the same length.")
+            return
+        
+        lengths = sorted(candidates, key=lambda length: (-len(candidates[length]), length))
+        length = lengths[0]
+        if len(lengths) > 1:
+            print("\nDatasets of equal length:")
+            for i, option in enumerate(lengths, 1):
+                print(f"{i}. n={option}: {', '.join(candidates[option])}")
+            choice = input(f"Select group (1-{len(lengths)}, default 1): ").strip()
+            if choice.isdigit() and 1 <= int(choice) <= len(lengths):
+                length = lengths[int(choice) - 1]
+        names = candidates[length]
+        
+        print("1. Pearson")
+        print("2. Spearman")
+        method = 'spearman' if input("Select method (1-2, default 1): ").strip() == '2' else 'pearson'
+        
+        datasets = [self.data_manager.get_dataset(name) for name in names]
+        rank_infos = ([self.data_manager.get_rank_info(name) for name in names]
+                      if method == 'spearman' else None)
+        self.correlation_tests.correlation_matrix(datasets, method, names=names, rank_infos=rank_infos)
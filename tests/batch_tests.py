@@ -0,0 +1,422 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+import numpy as np
+import scipy.stats as stats
+from typing import Optional, Union
+from utils.results import TestResult
+from utils.multiple_testing import correct_results
+from utils.exact_distributions import (EXACT_MAX_N, mann_whitney_exact_applies,
+                                       mann_whitney_exact_p, wilcoxon_exact_p)
+
+ArrayLike = Union[np.ndarray, list]
+
+def _as_columns(data: ArrayLike, axis: int) -> np.ndarray:
+    """Float array with observations along axis 0 and metrics along axis 1"""
+    array = np.asarray(data, dtype=float)
+    if array.ndim == 1:
+        return array[:, np.newaxis]
+    if array.ndim != 2:
+        raise ValueError("Batch tests expect 1-D or 2-D arrays")
+    return array if axis == 0 else array.T
+
+def _column_moments(columns: np.ndarray):
+    """Per-column count, mean and sample variance (ddof=1)"""
+    n = columns.shape[0]
+    mean = columns.mean(axis=0)
+    deviations = columns - mean
+    variance = np.einsum('ij,ij->j', deviations, deviations) / (n - 1)
+    return n, mean, variance
+
+def _two_sided(t_statistic: np.ndarray, df: Union[float, np.ndarray]) -> np.ndarray:
+    """Two-sided p-values for t statistics"""
+    return 2 * stats.t.sf(np.abs(t_statistic), df)
+
+def _levene_p(columns1: np.ndarray, columns2: np.ndarray) -> np.ndarray:
+    """Median-centred Levene test p-value for every column pair"""
+    z1 = np.abs(columns1 - np.median(columns1, axis=0))
+    z2 = np.abs(columns2 - np.median(columns2, axis=0))
+    n1, n2 = z1.shape[0], z2.shape[0]
+    
+    mean1, mean2 = z1.mean(axis=0), z2.mean(axis=0)
+    grand_mean = (n1 * mean1 + n2 * mean2) / (n1 + n2)
+    between = n1 * (mean1 - grand_mean)**2 + n2 * (mean2 - grand_mean)**2
+    within = ((z1 - mean1)**2).sum(axis=0) + ((z2 - mean2)**2).sum(axis=0)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        w_statistic = (n1 + n2 - 2) * between / within
+    return stats.f.sf(w_statistic, 1, n1 + n2 - 2)
+
+def _column_tie_sums(sorted_columns: np.ndarray) -> np.ndarray:
+    """Sum of t^3 - t over the tie runs of every sorted column (NaNs never tie)"""
+    n = sorted_columns.shape[0]
+    tied = np.zeros(sorted_columns.shape, dtype=bool)
+    tied[1:] = sorted_columns[1:] == sorted_columns[:-1]
+    
+    # Position k within its run; a run of length t contributes
+    # sum(3k^2 + 3k for k = 1..t-1) = t^3 - t
+    index = np.arange(n)[:, np.newaxis]
+    run_start = np.maximum.accumulate(np.where(tied, 0, index), axis=0)
+    k = (index - run_start).astype(np.float64)
+    return np.sum(3 * k**2 + 3 * k, axis=0)
+
+class BatchTests:
+    """
+    Column-wise tests over 2-D arrays
+    
+    Each method runs the same test on every column of an (n x m) array in a
+    single vectorized pass and returns a TestResult whose entries are
+    length-m arrays. The per-column numbers match the corresponding
+    ParametricTests or NonParametricTests method run on that column alone.
+    The 'reject' flags use the raw alpha per column; correct() adds
+    family-wise or false discovery rate adjusted p-values and flags.
+    """
+    
+    @staticmethod
+    def one_sample_t_test(data: ArrayLike, population_mean: Union[float, ArrayLike] = 0.0,
+                          alpha: float = 0.05, axis: int = 0) -> TestResult:
+        """
+        One-sample Student's t-test on every column
+        
+        Args:
+            data: (n x m) array of samples
+            population_mean: Hypothesized mean, scalar or one per column
+            alpha: Significance level
+            axis: Axis holding the observations
+        
+        Returns:
+            TestResult of per-column arrays
+        """
+        columns = _as_columns(data, axis)
+        n, sample_mean, variance = _column_moments(columns)
+        
+        warnings = []
+        if n < 5:
+            warnings.append("Very small sample size. Results may be unreliable.")
+        
+        population_mean = np.asarray(population_mean, dtype=float)
+        sample_std = np.sqrt(variance)
+        se = sample_std / np.sqrt(n)
+        df = n - 1
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_statistic = (sample_mean - population_mean) / se
+            cohens_d = (sample_mean - population_mean) / sample_std
+        p_value = _two_sided(t_statistic, df)
+        
+        t_critical = stats.t.ppf(1 - alpha/2, df)
+        
+        results = {
+            'test_name': "One-Sample Student's t-test",
+            'statistic': t_statistic,
+            'p_value': p_value,
+            'degrees_of_freedom': df,
+            'sample_mean': sample_mean,
+            'hypothesized_mean': np.broadcast_to(population_mean, sample_mean.shape),
+            'effect_size': cohens_d,
+            'ci_lower': sample_mean - t_critical * se,
+            'ci_upper': sample_mean + t_critical * se,
+            'reject': p_value < alpha
+        }
+        
+        return TestResult(results, warnings)
+    
+    @staticmethod
+    def paired_t_test(data1: ArrayLike, data2: ArrayLike, alpha: float = 0.05,
+                      axis: int = 0) -> TestResult:
+        """
+        Paired samples t-test on every column pair
+        
+        Args:
+            data1: (n x m) first samples (e.g., pre-treatment)
+            data2: (n x m) second samples (e.g., post-treatment)
+            alpha: Significance level
+            axis: Axis holding the observations
+        
+        Returns:
+            TestResult of per-column arrays
+        """
+        columns1 = _as_columns(data1, axis)
+        columns2 = _as_columns(data2, axis)
+        if columns1.shape != columns2.shape:
+            raise ValueError("Paired t-test requires equal sample sizes")
+        
+        n, mean_diff, variance = _column_moments(columns2 - columns1)
+        
+        warnings = []
+        if n < 5:
+            warnings.append("Very small sample size. Results may be unreliable.")
+        
+        std_diff = np.sqrt(variance)
+        se_diff = std_diff / np.sqrt(n)
+        df = n - 1
+        
+        # Sign follows scipy's ttest_rel(data1, data2), as in ParametricTests
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_statistic = -mean_diff / se_diff
+            cohens_d = mean_diff / std_diff
+        p_value = _two_sided(t_statistic, df)
+        
+        t_critical = stats.t.ppf(1 - alpha/2, df)
+        
+        results = {
+            'test_name': "Paired Samples t-test",
+            'statistic': t_statistic,
+            'p_value': p_value,
+            'degrees_of_freedom': df,
+            'mean_difference': mean_diff,
+            'effect_size': cohens_d,
+            'ci_lower': mean_diff - t_critical * se_diff,
+            'ci_upper': mean_diff + t_critical * se_diff,
+            'reject': p_value < alpha
+        }
+        
+        return TestResult(results, warnings)
+    
+    @staticmethod
+    def independent_t_test(data1: ArrayLike, data2: ArrayLike, alpha: float = 0.05,
+                           equal_var: bool = True, check_variances: bool = True,
+                           axis: int = 0) -> TestResult:
+        """
+        Independent samples t-test on every column pair
+        
+        Args:
+            data1: (n1 x m) first samples
+            data2: (n2 x m) second samples
+            alpha: Significance level
+            equal_var: Whether to assume equal variances
+            check_variances: Run Levene's test per column and switch that
+                             column to Welch's t-test when it rejects (the
+                             behaviour of ParametricTests.independent_t_test)
+            axis: Axis holding the observations
+        
+        Returns:
+            TestResult of per-column arrays
+        """
+        columns1 = _as_columns(data1, axis)
+        columns2 = _as_columns(data2, axis)
+        if columns1.shape[1] != columns2.shape[1]:
+            raise ValueError("Both samples must have the same number of columns")
+        
+        n1, mean1, var1 = _column_moments(columns1)
+        n2, mean2, var2 = _column_moments(columns2)
+        
+        warnings = []
+        if n1 < 5 or n2 < 5:
+            warnings.append("Small sample sizes. Results may be unreliable.")
+        
+        pooled = np.full(mean1.shape, bool(equal_var))
+        if check_variances:
+            pooled &= _levene_p(columns1, columns2) > 0.05
+            n_welch = int(np.count_nonzero(~pooled)) if equal_var else 0
+            if n_welch:
+                warnings.append(f"Unequal variances detected in {n_welch} column(s). Using Welch's t-test there.")
+        
+        # Pooled (Student) and Welch standard errors, chosen per column
+        pooled_std = np.sqrt(((n1-1)*var1 + (n2-1)*var2) / (n1+n2-2))
+        se_pooled = pooled_std * np.sqrt(1/n1 + 1/n2)
+        
+        se1_sq, se2_sq = var1/n1, var2/n2
+        se_welch = np.sqrt(se1_sq + se2_sq)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df_welch = (se1_sq + se2_sq)**2 / (se1_sq**2/(n1-1) + se2_sq**2/(n2-1))
+        
+        se_diff = np.where(pooled, se_pooled, se_welch)
+        df = np.where(pooled, n1 + n2 - 2, df_welch)
+        
+        # Effect size (Cohen's d), with the same fallbacks as the single test
+        mean_diff = mean1 - mean2
+        average_std = np.sqrt((var1 + var2) / 2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cohens_d = np.where(pooled & (pooled_std > 0), mean_diff / pooled_std,
+                                np.where((var1 > 0) & (var2 > 0), mean_diff / average_std, 0.0))
+            t_statistic = mean_diff / se_diff
+        p_value = _two_sided(t_statistic, df)
+        
+        t_critical = stats.t.ppf(1 - alpha/2, df)
+        
+        results = {
+            'test_name': "Independent Samples t-test",
+            'statistic': t_statistic,
+            'p_value': p_value,
+            'degrees_of_freedom': df,
+            'mean_1': mean1,
+            'mean_2': mean2,
+            'mean_difference': mean_diff,
+            'effect_size': cohens_d,
+            'equal_variances_assumed': pooled,
+            'ci_lower': mean_diff - t_critical * se_diff,
+            'ci_upper': mean_diff + t_critical * se_diff,
+            'reject': p_value < alpha
+        }
+        
+        return TestResult(results, warnings)
+    
+    @staticmethod
+    def mann_whitney_test(data1: ArrayLike, data2: ArrayLike, alpha: float = 0.05,
+                          axis: int = 0) -> TestResult:
+        """
+        Mann-Whitney U test on every column pair
+        
+        Columns without ties share one exact null distribution table
+        (all columns have the same sample sizes); the rest use the normal
+        approximation with tie correction.
+        
+        Args:
+            data1: (n1 x m) first samples
+            data2: (n2 x m) second samples
+            alpha: Significance level
+            axis: Axis holding the observations
+        
+        Returns:
+            TestResult of per-column arrays
+        """
+        columns1 = _as_columns(data1, axis)
+        columns2 = _as_columns(data2, axis)
+        if columns1.shape[1] != columns2.shape[1]:
+            raise ValueError("Both samples must have the same number of columns")
+        
+        n1, n2 = columns1.shape[0], columns2.shape[0]
+        if n1 == 0 or n2 == 0:
+            raise ValueError("Mann-Whitney U test requires non-empty samples")
+        
+        warnings = []
+        if n1 < 3 or n2 < 3:
+            warnings.append("Very small sample sizes. Results may be unreliable.")
+        
+        pooled = np.concatenate([columns1, columns2])
+        ranks = stats.rankdata(pooled, axis=0)
+        tie_term = _column_tie_sums(np.sort(pooled, axis=0))
+        u_statistic = ranks[:n1].sum(axis=0) - n1*(n1+1)/2
+        
+        # Normal approximation (continuity and tie corrected) for every
+        # column, replaced by the exact p-value where that applies
+        n = n1 + n2
+        u = np.maximum(u_statistic, n1*n2 - u_statistic)
+        std_u = np.sqrt(n1*n2/12 * ((n + 1) - tie_term/(n*(n-1))))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p_value = np.clip(2 * stats.norm.sf((u - n1*n2/2 - 0.5) / std_u), 0, 1)
+        
+        exact = np.zeros(u_statistic.shape, dtype=bool)
+        if mann_whitney_exact_applies(n1, n2):
+            exact = tie_term == 0
+            p_value[exact] = mann_whitney_exact_p(u_statistic[exact], n1, n2)
+        
+        # Effect size (r = Z / sqrt(N)), as in the single test
+        z_score = (u_statistic - n1*n2/2) / np.sqrt(n1*n2*(n + 1)/12)
+        
+        results = {
+            'test_name': "Mann-Whitney U Test",
+            'u_statistic': u_statistic,
+            'p_value': p_value,
+            'exact': exact,
+            'effect_size': np.abs(z_score) / np.sqrt(n),
+            'probability_superiority': u_statistic / (n1*n2),
+            'reject': p_value < alpha
+        }
+        
+        return TestResult(results, warnings)
+    
+    @staticmethod
+    def wilcoxon_signed_rank_test(data1: ArrayLike, data2: Optional[ArrayLike] = None,
+                                  hypothesized_median: Union[float, ArrayLike] = 0.0,
+                                  alpha: float = 0.05, axis: int = 0) -> TestResult:
+        """
+        Wilcoxon signed-rank test on every column (one-sample) or column pair
+        
+        Zero differences are dropped per column. Columns with at most
+        EXACT_MAX_N non-zero differences get exact p-values; untied columns
+        with the same count share one null distribution table.
+        
+        Args:
+            data1: (n x m) samples, or first paired samples
+            data2: (n x m) second paired samples, or None for a one-sample test
+            hypothesized_median: One-sample median, scalar or one per column
+            alpha: Significance level
+            axis: Axis holding the observations
+        
+        Returns:
+            TestResult of per-column arrays
+        """
+        columns1 = _as_columns(data1, axis)
+        if data2 is None:
+            test_name = "One-Sample Wilcoxon Signed-Rank Test"
+            differences = columns1 - np.asarray(hypothesized_median, dtype=float)
+        else:
+            test_name = "Paired-Sample Wilcoxon Signed-Rank Test"
+            columns2 = _as_columns(data2, axis)
+            if columns1.shape != columns2.shape:
+                raise ValueError("Paired test requires equal sample sizes")
+            differences = columns2 - columns1
+        
+        warnings = []
+        if differences.shape[0] < 6:
+            warnings.append("Small sample size. The test has very little power.")
+        
+        # Rank |d| per column with zeros left out: zeros take the lowest
+        # ranks, so the non-zero ranks are shifted down by the zero count
+        n_zero = np.count_nonzero(differences == 0, axis=0)
+        ranks = stats.rankdata(np.abs(differences), axis=0) - n_zero
+        magnitudes = np.where(differences == 0, np.nan, np.abs(differences))
+        sorted_magnitudes = np.sort(magnitudes, axis=0)
+        tie_term = _column_tie_sums(sorted_magnitudes)
+        
+        n = differences.shape[0] - n_zero
+        r_plus = np.where(differences > 0, ranks, 0.0).sum(axis=0)
+        r_minus = n*(n+1)/2 - r_plus
+        
+        n_empty = int(np.count_nonzero(n == 0))
+        if n_empty:
+            warnings.append(f"All differences are zero in {n_empty} column(s).")
+        
+        # Normal approximation everywhere, then exact p-values for small n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            se = np.sqrt((n*(n+1)*(2*n+1) - tie_term/2) / 24)
+            p_value = 2 * stats.norm.sf(np.abs((r_plus - n*(n+1)/4) / se))
+        
+        exact = (n > 0) & (n <= EXACT_MAX_N)
+        untied = exact & (tie_term == 0)
+        for size in np.unique(n[untied]):
+            columns = untied & (n == size)
+            p_value[columns] = wilcoxon_exact_p(r_plus[columns], int(size))
+        for column in np.flatnonzero(exact & ~untied):
+            values = sorted_magnitudes[:n[column], column]
+            _, tie_counts = np.unique(values, return_counts=True)
+            p_value[column] = wilcoxon_exact_p(r_plus[column], int(n[column]), tie_counts)
+        
+        statistic = np.minimum(r_plus, r_minus)
+        
+        # Effect size (r = Z / sqrt(N)) where N > 10, as in the single test
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_score = (statistic - n*(n+1)/4) / np.sqrt(n*(n+1)*(2*n+1)/24)
+            effect_size = np.where(n > 10, np.abs(z_score) / np.sqrt(n), np.nan)
+        
+        results = {
+            'test_name': test_name,
+            'statistic': statistic,
+            'p_value': p_value,
+            'n_nonzero': n,
+            'exact': exact,
+            'median_difference': np.median(differences, axis=0),
+            'effect_size': effect_size,
+            'reject': p_value < alpha
+        }
+        
+        return TestResult(results, warnings)
+    
+    @staticmethod
+    def correct(results: TestResult, method: str = 'holm', alpha: float = 0.05) -> TestResult:
+        """
+        Multiple-testing correction across the columns of a batch result
+        
+        Args:
+            results: TestResult returned by one of the batch tests; updated in place
+            method: 'bonferroni', 'holm', 'bh' (Benjamini-Hochberg) or 'by' (Benjamini-Yekutieli)
+            alpha: Family-wise error rate or false discovery rate to control
+        
+        Returns:
+            The same TestResult with 'adjusted_p_value' and 'reject_adjusted' arrays
+        """
+        return correct_results(results, method, alpha)
@@ -0,0 +1,342 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+import numpy as np
+import scipy.stats as stats
+from typing import Any, Dict, List, Optional
+from utils.results import TestResult
+from utils.result_cache import cached_result
+from utils.bootstrap import DEFAULT_RESAMPLES, Statistic, bootstrap_ci
+from utils.resampling import SeedLike
+
+# Effect sizes as reported by the parametric and non-parametric tests,
+# written for 2-D inputs (one resample per row)
+
+def _cohens_d_one_sample(x: np.ndarray, population_mean: float) -> np.ndarray:
+    """(mean - population mean) / sample standard deviation"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (x.mean(axis=-1) - population_mean) / x.std(axis=-1, ddof=1)
+
+def _cohens_d_two_sample(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Difference in means over the pooled standard deviation"""
+    n1, n2 = x.shape[-1], y.shape[-1]
+    pooled_var = ((n1 - 1) * x.var(axis=-1, ddof=1) + (n2 - 1) * y.var(axis=-1, ddof=1)) / (n1 + n2 - 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (x.mean(axis=-1) - y.mean(axis=-1)) / np.sqrt(pooled_var)
+
+def _mann_whitney_r(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """r = |Z| / sqrt(N) of the Mann-Whitney U statistic"""
+    n1, n2 = x.shape[-1], y.shape[-1]
+    ranks = stats.rankdata(np.concatenate([x, y], axis=-1), axis=-1)
+    u_statistic = ranks[..., :n1].sum(axis=-1) - n1 * (n1 + 1) / 2
+    z_score = (u_statistic - n1 * n2 / 2) / np.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    return np.abs(z_score) / np.sqrt(n1 + n2)
+
+def _wilcoxon_r(d: np.ndarray) -> np.ndarray:
+    """r = |Z| / sqrt(n) of the signed-rank statistic, zero differences dropped"""
+    # Zeros take the lowest ranks of |d|, so shift the others down past them
+    n_zero = np.count_nonzero(d == 0, axis=-1)
+    ranks = stats.rankdata(np.abs(d), axis=-1) - n_zero[..., np.newaxis]
+    n = d.shape[-1] - n_zero
+    r_plus = np.where(d > 0, ranks, 0.0).sum(axis=-1)
+    statistic = np.minimum(r_plus, n * (n + 1) / 2 - r_plus)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_score = (statistic - n * (n + 1) / 4) / np.sqrt(n * (n + 1) * (2 * n + 1) / 24)
+        return np.abs(z_score) / np.sqrt(n)
+
+def _eta_squared(*groups: np.ndarray) -> np.ndarray:
+    """Between-groups over total sum of squares"""
+    sizes = np.array([group.shape[-1] for group in groups])
+    sums = np.stack([group.sum(axis=-1) for group in groups], axis=-1)
+    sums_of_squares = sum(np.sum(group**2, axis=-1) for group in groups)
+    grand_sum = sums.sum(axis=-1)
+    n_total = sizes.sum()
+    
+    ss_between = np.sum(sums**2 / sizes, axis=-1) - grand_sum**2 / n_total
+    ss_total = sums_of_squares - grand_sum**2 / n_total
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return ss_between / ss_total
+
+class BootstrapTests:
+    """
+    Bootstrap confidence intervals for the reported effect sizes
+    
+    Covers Cohen's d from the t-tests, the r = |Z| / sqrt(N) effect sizes
+    of the Mann-Whitney and Wilcoxon tests and eta-squared from one-way
+    ANOVA. Intervals are percentile or BCa; the resampling is vectorized,
+    chunked and spread over worker processes by utils.bootstrap.
+    
+    Unlike the permutation and Monte Carlo tests there is no sequential
+    mode: an interval is not a decision at alpha that a SequentialStopper
+    could settle early (r and eta-squared are never negative, so "the
+    interval excludes zero" is not a test), and cutting the run short only
+    adds Monte Carlo error to the interval endpoints.
+    
+    The compute_* methods are memoized by cached_result under their seed;
+    runs without a seed are stored under the fresh seed they report back,
+    so repeating a call never replays the same random draw.
+    """
+    
+    @staticmethod
+    def _interval(test_name: str, statistic: Statistic, samples: List[np.ndarray], args: tuple,
+                  n_resamples: int, confidence_level: float, method: str, seed: SeedLike,
+                  workers: Optional[int], extra: Optional[Dict[str, Any]] = None) -> TestResult:
+        """Run the bootstrap and package the interval as a TestResult"""
+        warnings = []
+        if min(len(sample) for sample in samples) < 10:
+            warnings.append("Small sample size. Bootstrap intervals may undercover.")
+        
+        ci = bootstrap_ci(statistic, samples, args, n_resamples, confidence_level,
+                          method, seed, workers)
+        if ci['n_resamples'] < n_resamples:
+            warnings.append(f"{n_resamples - ci['n_resamples']} resamples gave an undefined "
+                            "effect size and were dropped.")
+        
+        results = {
+            'test_name': test_name,
+            'effect_size': ci['statistic'],
+            **(extra or {}),
+            'confidence_interval': (ci['ci_lower'], ci['ci_upper']),
+            'confidence_level': confidence_level,
+            'standard_error': ci['standard_error'],
+            'method': ci['method'],
+            'n_resamples': ci['n_resamples'],
+            'seed': ci['seed']
+        }
+        
+        return TestResult(results, warnings)
+    
+    @staticmethod
+    @cached_result('bootstrap_cohens_d_one_sample', seed_argument='seed',
+                   ignored_arguments=('workers',))
+    def compute_cohens_d_one_sample(data: List[float], population_mean: float = 0.0,
+                                    n_resamples: int = DEFAULT_RESAMPLES, confidence_level: float = 0.95,
+                                    method: str = 'bca', seed: SeedLike = None,
+                                    workers: Optional[int] = None) -> TestResult:
+        """
+        Bootstrap CI of Cohen's d for the one-sample t-test
+        
+        Args:
+            data: Sample data
+            population_mean: Hypothesized mean
+            n_resamples: Number of bootstrap resamples
+            confidence_level: Coverage of the interval
+            method: 'percentile' or 'bca'
+            seed: Seed for reproducible results
+            workers: Worker processes (default: all CPUs for large runs)
+        
+        Returns:
+            TestResult with the effect size and its confidence interval
+        """
+        data = np.asarray(data, dtype=float)
+        return BootstrapTests._interval(
+            "Bootstrap CI: Cohen's d (one sample)", _cohens_d_one_sample, [data],
+            (population_mean,), n_resamples, confidence_level, method, seed, workers)
+    
+    @staticmethod
+    @cached_result('bootstrap_cohens_d_paired', seed_argument='seed',
+                   ignored_arguments=('workers',))
+    def compute_cohens_d_paired(data1: List[float], data2: List[float],
+                                n_resamples: int = DEFAULT_RESAMPLES, confidence_level: float = 0.95,
+                                method: str = 'bca', seed: SeedLike = None,
+                                workers: Optional[int] = None) -> TestResult:
+        """
+        Bootstrap CI of Cohen's d for the paired t-test (pairs resampled together)
+        
+        Args:
+            data1: First measurements (e.g., pre-treatment)
+            data2: Second measurements (e.g., post-treatment)
+            n_resamples: Number of bootstrap resamples
+            confidence_level: Coverage of the interval
+            method: 'percentile' or 'bca'
+            seed: Seed for reproducible results
+            workers: Worker processes (default: all CPUs for large runs)
+        
+        Returns:
+            TestResult with the effect size and its confidence interval
+        """
+        data1 = np.asarray(data1, dtype=float)
+        data2 = np.asarray(data2, dtype=float)
+        if len(data1) != len(data2):
+            raise ValueError("Paired test requires equal sample sizes")
+        return BootstrapTests._interval(
+            "Bootstrap CI: Cohen's d (paired)", _cohens_d_one_sample, [data2 - data1],
+            (0.0,), n_resamples, confidence_level, method, seed, workers)
+    
+    @staticmethod
+    @cached_result('bootstrap_cohens_d_independent', seed_argument='seed',
+                   ignored_arguments=('workers',))
+    def compute_cohens_d_independent(data1: List[float], data2: List[float],
+                                     n_resamples: int = DEFAULT_RESAMPLES, confidence_level: float = 0.95,
+                                     method: str = 'bca', seed: SeedLike = None,
+                                     workers: Optional[int] = None) -> TestResult:
+        """
+        Bootstrap CI of Cohen's d (pooled standard deviation) for two
+        independent samples, each resampled separately
+        
+        Args:
+            data1: First independent sample
+            data2: Second independent sample
+            n_resamples: Number of bootstrap resamples
+            confidence_level: Coverage of the interval
+            method: 'percentile' or 'bca'
+            seed: Seed for reproducible results
+            workers: Worker processes (default: all CPUs for large runs)
+        
+        Returns:
+            TestResult with the effect size and its confidence interval
+        """
+        return BootstrapTests._interval(
+            "Bootstrap CI: Cohen's d (independent samples)", _cohens_d_two_sample,
+            [np.asarray(data1, dtype=float), np.asarray(data2, dtype=float)], (),
+            n_resamples, confidence_level, method, seed, workers)
+    
+    @staticmethod
+    @cached_result('bootstrap_mann_whitney_r', seed_argument='seed',
+                   ignored_arguments=('workers',))
+    def compute_mann_whitney_r(data1: List[float], data2: List[float],
+                               n_resamples: int = DEFAULT_RESAMPLES, confidence_level: float = 0.95,
+                               method: str = 'bca', seed: SeedLike = None,
+                               workers: Optional[int] = None) -> TestResult:
+        """
+        Bootstrap CI of the Mann-Whitney effect size r = |Z| / sqrt(N)
+        
+        Args:
+            data1: First independent sample
+            data2: Second independent sample
+            n_resamples: Number of bootstrap resamples
+            confidence_level: Coverage of the interval
+            method: 'percentile' or 'bca'
+            seed: Seed for reproducible results
+            workers: Worker processes (default: all CPUs for large runs)
+        
+        Returns:
+            TestResult with the effect size and its confidence interval
+        """
+        return BootstrapTests._interval(
+            "Bootstrap CI: Mann-Whitney r", _mann_whitney_r,
+            [np.asarray(data1, dtype=float), np.asarray(data2, dtype=float)], (),
+            n_resamples, confidence_level, method, seed, workers)
+    
+    @staticmethod
+    @cached_result('bootstrap_wilcoxon_r', seed_argument='seed',
+                   ignored_arguments=('workers',))
+    def compute_wilcoxon_r(data1: List[float], data2: Optional[List[float]] = None,
+                           hypothesized_median: float = 0.0, n_resamples: int = DEFAULT_RESAMPLES,
+                           confidence_level: float = 0.95, method: str = 'bca', seed: SeedLike = None,
+                           workers: Optional[int] = None) -> TestResult:
+        """
+        Bootstrap CI of the Wilcoxon signed-rank effect size r = |Z| / sqrt(n)
+        
+        Args:
+            data1: Sample (one-sample test) or first paired sample
+            data2: Second paired sample, or None for a one-sample test
+            hypothesized_median: Median tested against in the one-sample case
+            n_resamples: Number of bootstrap resamples
+            confidence_level: Coverage of the interval
+            method: 'percentile' or 'bca'
+            seed: Seed for reproducible results
+            workers: Worker processes (default: all CPUs for large runs)
+        
+        Returns:
+            TestResult with the effect size and its confidence interval
+        """
+        data1 = np.asarray(data1, dtype=float)
+        if data2 is None:
+            differences = data1 - hypothesized_median
+        else:
+            data2 = np.asarray(data2, dtype=float)
+            if len(data1) != len(data2):
+                raise ValueError("Paired test requires equal sample sizes")
+            differences = data2 - data1
+        return BootstrapTests._interval(
+            "Bootstrap CI: Wilcoxon signed-rank r", _wilcoxon_r, [differences], (),
+            n_resamples, confidence_level, method, seed, workers)
+    
+    @staticmethod
+    @cached_result('bootstrap_eta_squared', seed_argument='seed',
+                   ignored_arguments=('workers',))
+    def compute_eta_squared(*groups: List[float], n_resamples: int = DEFAULT_RESAMPLES,
+                            confidence_level: float = 0.95, method: str = 'bca',
+                            seed: SeedLike = None, workers: Optional[int] = None) -> TestResult:
+        """
+        Bootstrap CI of eta-squared for one-way ANOVA, resampling within groups
+        
+        Args:
+            groups: Variable number of independent groups
+            n_resamples: Number of bootstrap resamples
+            confidence_level: Coverage of the interval
+            method: 'percentile' or 'bca'
+            seed: Seed for reproducible results
+            workers: Worker processes (default: all CPUs for large runs)
+        
+        Returns:
+            TestResult with the effect size and its confidence interval
+        """
+        if len(groups) < 2:
+            raise ValueError("ANOVA requires at least 2 groups")
+        return BootstrapTests._interval(
+            "Bootstrap CI: eta-squared (one-way ANOVA)", _eta_squared,
+            [np.asarray(group, dtype=float) for group in groups], (),
+            n_resamples, confidence_level, method, seed, workers, {'n_groups': len(groups)})
+    
+    @staticmethod
+    def cohens_d_one_sample(data: List[float], population_mean: float = 0.0,
+                            n_resamples: int = DEFAULT_RESAMPLES, confidence_level: float = 0.95,
+                            method: str = 'bca', seed: SeedLike = None,
+                            workers: Optional[int] = None) -> TestResult:
+        """Bootstrap CI of Cohen's d, one sample (see compute_cohens_d_one_sample)"""
+        return BootstrapTests.compute_cohens_d_one_sample(
+            data, population_mean=population_mean, n_resamples=n_resamples,
+            confidence_level=confidence_level, method=method, seed=seed, workers=workers)
+    
+    @staticmethod
+    def cohens_d_paired(data1: List[float], data2: List[float],
+                        n_resamples: int = DEFAULT_RESAMPLES, confidence_level: float = 0.95,
+                        method: str = 'bca', seed: SeedLike = None,
+                        workers: Optional[int] = None) -> TestResult:
+        """Bootstrap CI of Cohen's d, paired samples (see compute_cohens_d_paired)"""
+        return BootstrapTests.compute_cohens_d_paired(
+            data1, data2, n_resamples=n_resamples, confidence_level=confidence_level,
+            method=method, seed=seed, workers=workers)
+    
+    @staticmethod
+    def cohens_d_independent(data1: List[float], data2: List[float],
+                             n_resamples: int = DEFAULT_RESAMPLES, confidence_level: float = 0.95,
+                             method: str = 'bca', seed: SeedLike = None,
+                             workers: Optional[int] = None) -> TestResult:
+        """Bootstrap CI of Cohen's d, independent samples (see compute_cohens_d_independent)"""
+        return BootstrapTests.compute_cohens_d_independent(
+            data1, data2, n_resamples=n_resamples, confidence_level=confidence_level,
+            method=method, seed=seed, workers=workers)
+    
+    @staticmethod
+    def mann_whitney_r(data1: List[float], data2: List[float],
+                       n_resamples: int = DEFAULT_RESAMPLES, confidence_level: float = 0.95,
+                       method: str = 'bca', seed: SeedLike = None,
+                       workers: Optional[int] = None) -> TestResult:
+        """Bootstrap CI of the Mann-Whitney effect size r (see compute_mann_whitney_r)"""
+        return BootstrapTests.compute_mann_whitney_r(
+            data1, data2, n_resamples=n_resamples, confidence_level=confidence_level,
+            method=method, seed=seed, workers=workers)
+    
+    @staticmethod
+    def wilcoxon_r(data1: List[float], data2: Optional[List[float]] = None,
+                   hypothesized_median: float = 0.0, n_resamples: int = DEFAULT_RESAMPLES,
+                   confidence_level: float = 0.95, method: str = 'bca', seed: SeedLike = None,
+                   workers: Optional[int] = None) -> TestResult:
+        """Bootstrap CI of the Wilcoxon effect size r (see compute_wilcoxon_r)"""
+        return BootstrapTests.compute_wilcoxon_r(
+            data1, data2, hypothesized_median=hypothesized_median, n_resamples=n_resamples,
+            confidence_level=confidence_level, method=method, seed=seed, workers=workers)
+    
+    @staticmethod
+    def eta_squared(*groups: List[float], n_resamples: int = DEFAULT_RESAMPLES,
+                    confidence_level: float = 0.95, method: str = 'bca',
+                    seed: SeedLike = None, workers: Optional[int] = None) -> TestResult:
+        """Bootstrap CI of eta-squared for one-way ANOVA (see compute_eta_squared)"""
+        return BootstrapTests.compute_eta_squared(
+            *groups, n_resamples=n_resamples, confidence_level=confidence_level,
+            method=method, seed=seed, workers=workers)
@@ -3,32 +3,191 @@
 #https://mckenzie.page
 #Python Simple Statistical Tests
 
+import heapq
 import numpy as np
 import scipy.stats as stats
-from typing import List, Dict, Any, Tuple
+from scipy import sparse
+from typing import List, Dict, Any, Optional, Tuple, Union
 from utils.validators import (validate_categorical_data, validate_contingency_table,
                             get_hypothesis_input)
 from utils.formatters import print_test_results, print_assumption_warnings
+from utils.sufficient_stats import CategoryCounts, ContingencyCounts
+from utils.results import TestResult
+from utils.result_cache import cached_result
+from utils.resampling import (DEFAULT_TOLERANCE, SeedLike, SequentialStopper, block_size_for,
+                              resample_blocks, seed_sequence, sequential_block_sizes)
+
+# Standardized residuals listed for sparse tables, which are too large to
+# report cell by cell
+DEFAULT_TOP_RESIDUALS = 10
+
+# Tables with more cells than this are analysed and reported as sparse
+# tables, by their largest residuals rather than cell by cell
+MAX_DENSE_CELLS = 2_500
+
+# Sample budget of the Monte Carlo test used when expected counts are small
+DEFAULT_MONTE_CARLO_SAMPLES = 10_000
+
+# Relative tolerance when comparing simulated statistics with the observed
+# one, so that rounding is not counted as a difference
+TOLERANCE = 100 * np.finfo(np.float64).eps
+
+def _count_extreme_tables(shared: Tuple[np.ndarray, np.ndarray, np.ndarray, float],
+                          rng: np.random.Generator, size: int) -> int:
+    """Random tables with the observed margins (Patefield's algorithm) at least as extreme as observed"""
+    row_totals, col_totals, expected, observed = shared
+    tables = stats.random_table(row_totals, col_totals).rvs(size=size, method='patefield',
+                                                           random_state=rng)
+    statistics = np.sum((tables - expected)**2 / expected, axis=(1, 2))
+    return int(np.count_nonzero(statistics >= observed - TOLERANCE * observed))
+
+def _count_extreme_frequencies(shared: Tuple[int, np.ndarray, np.ndarray, float],
+                               rng: np.random.Generator, size: int) -> int:
+    """Multinomial samples under the expected frequencies at least as extreme as observed"""
+    total, probabilities, expected, observed = shared
+    samples = rng.multinomial(total, probabilities, size=size)
+    statistics = np.sum((samples - expected)**2 / expected, axis=1)
+    return int(np.count_nonzero(statistics >= observed - TOLERANCE * observed))
+
+def _monte_carlo_p_value(function: Any, shared: Tuple[Any, ...], n_cells: int, n_samples: int,
+                         seed: SeedLike, workers: Optional[int], alpha: float,
+                         sequential: bool = False,
+                         tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, Any]:
+    """
+    Monte Carlo p-value of the chi-square statistic with its standard error
+    
+    Samples are drawn in vectorized blocks over a process pool by
+    resample_blocks, so a seed reproduces the p-value for any worker count.
+    With sequential=True, n_samples is an upper limit and the run stops as
+    soon as the decision at alpha is settled (see SequentialStopper), as
+    for the sequential permutation tests.
+    """
+    if n_samples < 1:
+        raise ValueError("At least one Monte Carlo sample is required")
+    
+    seed = seed_sequence(seed)
+    block_size = block_size_for(n_cells)
+    stopper = None
+    if sequential:
+        block_size = sequential_block_sizes(n_samples, block_size)
+        stopper = SequentialStopper(alpha, tolerance, n_samples)
+    
+    n_extreme = n_used = 0
+    blocks = resample_blocks(function, shared, n_samples, block_size, seed, workers, n_cells)
+    for i, count in enumerate(blocks):
+        n_extreme += count
+        n_used += block_size[i] if sequential else min(block_size, n_samples - n_used)
+        if stopper is not None and stopper.settled(n_extreme, n_used):
+            blocks.close()
+            break
+    
+    # The observed data counts as one of the samples
+    p_value = (n_extreme + 1) / (n_used + 1)
+    run = {
+        'exact_p_value': p_value,
+        'monte_carlo_std_error': np.sqrt(p_value * (1 - p_value) / n_used),
+        'monte_carlo_samples': n_used,
+        'seed': seed.entropy
+    }
+    if sequential:
+        run['max_monte_carlo_samples'] = n_samples
+        run['error_tolerance'] = tolerance
+        run['stopped_early'] = n_used < n_samples
+    return run
+
+def _largest_empty_cells(row_totals: np.ndarray, col_totals: np.ndarray,
+                         occupied: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The k empty cells with the largest expected counts
+    
+    An empty cell's residual is -sqrt(r_i * c_j / N), so these are also the
+    empty cells with the largest residuals. Pairs of rows and columns are
+    walked in decreasing order of r_i * c_j with a heap, skipping occupied
+    cells, so only O(k + nnz) of the R x C cells are ever looked at.
+    
+    Args:
+        row_totals: Row margins
+        col_totals: Column margins
+        occupied: Sorted flat indices (row * C + col) of the non-empty cells
+        k: Number of cells wanted
+    
+    Returns:
+        tuple: (row indices, column indices) in decreasing expected count
+    """
+    n_cols = len(col_totals)
+    row_order = np.argsort(-row_totals, kind='stable')
+    col_order = np.argsort(-col_totals, kind='stable')
+    
+    rows, cols = [], []
+    heap = [(-row_totals[row_order[0]] * col_totals[col_order[0]], 0, 0)]
+    while heap and len(rows) < k:
+        _, a, b = heapq.heappop(heap)
+        i, j = row_order[a], col_order[b]
+        flat = i * n_cols + j
+        position = np.searchsorted(occupied, flat)
+        if position == len(occupied) or occupied[position] != flat:
+            rows.append(i)
+            cols.append(j)
+        # Every pair is pushed exactly once: along its row, and down column 0
+        if b + 1 < n_cols:
+            heapq.heappush(heap, (-row_totals[i] * col_totals[col_order[b + 1]], a, b + 1))
+        if b == 0 and a + 1 < len(row_totals):
+            heapq.heappush(heap, (-row_totals[row_order[a + 1]] * col_totals[col_order[0]], a + 1, 0))
+    return np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)
 
 class ChiSquareTests:
-    """Class containing chi-square statistical tests"""
+    """
+    Class containing chi-square statistical tests
+    
+    Each test has a compute_* method that returns a TestResult without any
+    input() or print() calls, and an interactive method of the original
+    name that asks for hypotheses and prints the tables and results.
+    """
     
     @staticmethod
-    def chi_square_goodness_of_fit(observed: List[float], expected: List[float] = None,
-                                  alpha: float = 0.05) -> Dict[str, Any]:
+    @cached_result('chi_square_goodness_of_fit', seed_argument='seed',
+                   ignored_arguments=('workers',))
+    def compute_chi_square_goodness_of_fit(observed: Union[List[float], CategoryCounts],
+                                           expected: List[float] = None,
+                                           alpha: float = 0.05, exact_fallback: bool = True,
+                                           monte_carlo_samples: int = DEFAULT_MONTE_CARLO_SAMPLES,
+                                           seed: SeedLike = None,
+                                           workers: Optional[int] = None,
+                                           sequential: bool = False,
+                                           tolerance: float = DEFAULT_TOLERANCE) -> TestResult:
         """
-        Chi-Square Goodness of Fit Test
+        Chi-Square Goodness of Fit Test (no I/O)
+        
+        When some expected frequencies are below 5 the chi-square
+        approximation is doubtful, so (with exact_fallback) the decision is
+        based on a Monte Carlo p-value from multinomial samples instead.
         
         Args:
-            observed: Observed frequencies
-            expected: Expected frequencies (if None, assumes equal distribution)
+            observed: Observed frequencies, or CategoryCounts built from raw
+                      records (e.g. by utils.loaders.stream_category_counts)
+            expected: Expected frequencies (if None, assumes equal distribution),
+                      in the order of observed.categories.labels for CategoryCounts
             alpha: Significance level
+            exact_fallback: Use the Monte Carlo test when expected frequencies are small
+            monte_carlo_samples: Sample budget of the Monte Carlo test
+            seed: Seed for reproducible Monte Carlo results
+            workers: Worker processes for the Monte Carlo test (default: all CPUs for large runs)
+            sequential: Stop the Monte Carlo test as soon as the decision at
+                        alpha is settled, using at most monte_carlo_samples
+            tolerance: Chance of a different decision than the full run
+                       (sequential mode)
             
         Returns:
-            Dictionary with test results
+            TestResult with test results and assumption warnings; details
+            hold the category labels when observed is a CategoryCounts
         """
         test_name = "Chi-Square Goodness of Fit Test"
         
+        details = {}
+        if isinstance(observed, CategoryCounts):
+            details['categories'] = list(observed.categories.labels)
+            observed = observed.counts.tolist()
+        
         # Validate data
         if not validate_categorical_data(observed):
             raise ValueError("Observed data must be non-negative integers (frequencies)")
@@ -39,7 +198,6 @@ class ChiSquareTests:
         if expected is None:
             total = sum(observed)
             expected = [total / len(observed)] * len(observed)
-            print(f"Using equal expected frequencies: {expected[0]:.2f} for each category")
         else:
             if len(expected) != len(observed):
                 raise ValueError("Observed and expected must have the same length")
@@ -47,28 +205,26 @@ class ChiSquareTests:
             if not validate_categorical_data(expected):
                 raise ValueError("Expected data must be non-negative numbers")
         
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("Chi-Square Goodness of Fit Test")
-        
         # Validate assumptions
         warnings = []
         
-        if any(e < 5 for e in expected):
+        use_exact = exact_fallback and any(e < 5 for e in expected) and all(e > 0 for e in expected)
+        if use_exact:
+            warnings.append("Some expected frequencies < 5. Using a Monte Carlo p-value.")
+        elif any(e < 5 for e in expected):
             warnings.append("Some expected frequencies < 5. Results may be unreliable.")
         
         if sum(observed) < 30:
             warnings.append("Total sample size < 30. Consider exact tests.")
         
-        print_assumption_warnings(warnings)
-        
         # Perform test
         try:
             statistic, p_value = stats.chisquare(observed, expected)
         except ValueError as e:
-            return {
+            return TestResult({
                 'test_name': test_name,
                 'error': f"Test failed: {e}"
-            }
+            }, warnings)
         
         # Calculate additional statistics
         df = len(observed) - 1
@@ -80,25 +236,86 @@ class ChiSquareTests:
         # Calculate residuals
         residuals = [(obs - exp) / np.sqrt(exp) for obs, exp in zip(observed, expected)]
         
+        # Monte Carlo p-value when the chi-square approximation is doubtful
+        exact = {}
+        decision_p = p_value
+        if use_exact:
+            expected_array = np.asarray(expected, dtype=float)
+            exact = {'exact_test': "Monte Carlo (multinomial)",
+                     **_monte_carlo_p_value(_count_extreme_frequencies,
+                                            (total_observed, expected_array / expected_array.sum(),
+                                             expected_array, statistic),
+                                            len(observed), monte_carlo_samples, seed, workers,
+                                            alpha, sequential, tolerance)}
+            decision_p = exact['exact_p_value']
+        
         results = {
             'test_name': test_name,
             'chi2_statistic': statistic,
             'p_value': p_value,
+            **exact,
             'degrees_of_freedom': df,
             'observed_frequencies': observed,
             'expected_frequencies': expected,
             'cramers_v': cramers_v,
             'standardized_residuals': residuals,
-            'interpretation': f"{'Reject' if p_value < alpha else 'Fail to reject'} H0 at α = {alpha}"
+            'interpretation': f"{'Reject' if decision_p < alpha else 'Fail to reject'} H0 at α = {alpha}"
         }
         
+        return TestResult(results, warnings, details)
+    
+    @staticmethod
+    def chi_square_goodness_of_fit(observed: Union[List[float], CategoryCounts],
+                                  expected: List[float] = None,
+                                  alpha: float = 0.05, exact_fallback: bool = True,
+                                  monte_carlo_samples: int = DEFAULT_MONTE_CARLO_SAMPLES,
+                                  seed: SeedLike = None,
+                                  workers: Optional[int] = None,
+                                  sequential: bool = False,
+                                  tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, Any]:
+        """
+        Chi-Square Goodness of Fit Test
+        
+        Args:
+            observed: Observed frequencies, or CategoryCounts built from raw records
+            expected: Expected frequencies (if None, assumes equal distribution)
+            alpha: Significance level
+            exact_fallback: Use the Monte Carlo test when expected frequencies are small
+            monte_carlo_samples: Sample budget of the Monte Carlo test
+            seed: Seed for reproducible Monte Carlo results
+            workers: Worker processes for the Monte Carlo test (default: all CPUs for large runs)
+            sequential: Stop the Monte Carlo test once the decision at alpha is settled
+            tolerance: Chance of a different decision than the full run (sequential mode)
+        
+        Returns:
+            Dictionary with test results
+        """
+        results = ChiSquareTests.compute_chi_square_goodness_of_fit(observed, expected, alpha,
+                                                                   exact_fallback, monte_carlo_samples,
+                                                                   seed, workers, sequential, tolerance)
+        
+        if expected is None and 'expected_frequencies' in results:
+            print(f"Using equal expected frequencies: {results['expected_frequencies'][0]:.2f} for each category")
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Chi-Square Goodness of Fit Test")
+        
+        print_assumption_warnings(results.warnings)
+        
+        if 'error' in results:
+            return results
+        
         # Print frequency table
         print("\nFrequency Table:")
         print("-" * 50)
         print(f"{'Category':<10} {'Observed':<10} {'Expected':<10} {'Residual':<10}")
         print("-" * 50)
-        for i, (obs, exp, res) in enumerate(zip(observed, expected, residuals), 1):
-            print(f"Cat {i:<5} {obs:<10} {exp:<10.2f} {res:<10.2f}")
+        categories = results.details.get('categories')
+        for i, (obs, exp, res) in enumerate(zip(results['observed_frequencies'],
+                                                results['expected_frequencies'],
+                                                results['standardized_residuals']), 1):
+            label = f"{categories[i - 1]!s:<9.9}" if categories else f"Cat {i:<5}"
+            print(f"{label} {obs:<10} {exp:<10.2f} {res:<10.2f}")
         print("-" * 50)
         
         print_test_results(results, hypotheses)
@@ -106,20 +323,74 @@ class ChiSquareTests:
         return results
     
     @staticmethod
-    def chi_square_association(contingency_table: List[List[float]], 
-                              alpha: float = 0.05) -> Dict[str, Any]:
+    @cached_result('chi_square_association', seed_argument='seed',
+                   ignored_arguments=('workers',))
+    def compute_chi_square_association(contingency_table: Union[List[List[float]], sparse.spmatrix,
+                                                                ContingencyCounts],
+                                       alpha: float = 0.05,
+                                       n_top_residuals: int = DEFAULT_TOP_RESIDUALS,
+                                       exact_fallback: bool = True,
+                                       monte_carlo_samples: int = DEFAULT_MONTE_CARLO_SAMPLES,
+                                       seed: SeedLike = None,
+                                       workers: Optional[int] = None,
+                                       sequential: bool = False,
+                                       tolerance: float = DEFAULT_TOLERANCE) -> TestResult:
         """
-        Chi-Square Test of Association (Independence)
+        Chi-Square Test of Association (no I/O)
+        
+        A scipy.sparse table (COO, CSR, ...), a ContingencyCounts or a dense
+        table with more than MAX_DENSE_CELLS cells is analysed without forming
+        the dense expected frequencies; see _sparse_association.
+        
+        When some expected frequencies of a dense table of counts are below
+        5, the decision is based (with exact_fallback) on Fisher's exact test
+        for 2x2 tables, or otherwise on a Monte Carlo test over random tables
+        with the observed margins.
         
         Args:
-            contingency_table: 2D list representing contingency table
+            contingency_table: 2D list representing contingency table, a
+                               scipy.sparse matrix of counts, or ContingencyCounts
+                               built from raw records (e.g. by
+                               utils.loaders.stream_contingency_table)
             alpha: Significance level
+            n_top_residuals: Largest standardized residuals listed for sparse tables
+            exact_fallback: Use an exact or Monte Carlo test when expected frequencies are small
+            monte_carlo_samples: Sample budget of the Monte Carlo test
+            seed: Seed for reproducible Monte Carlo results
+            workers: Worker processes for the Monte Carlo test (default: all CPUs for large runs)
+            sequential: Stop the Monte Carlo test as soon as the decision at
+                        alpha is settled, using at most monte_carlo_samples
+            tolerance: Chance of a different decision than the full run
+                       (sequential mode)
             
         Returns:
-            Dictionary with test results
+            TestResult with test results and assumption warnings; details hold
+            the observed table, margins, expected frequencies and standardized
+            residuals (for sparse and large tables only the largest
+            residuals), plus the row and column labels for ContingencyCounts
         """
         test_name = "Chi-Square Test of Association"
         
+        if isinstance(contingency_table, ContingencyCounts):
+            row_codes, col_codes, counts = contingency_table.cells()
+            shape = contingency_table.shape
+            if shape[0] * shape[1] <= MAX_DENSE_CELLS:
+                table = np.zeros(shape, dtype=np.int64)
+                table[row_codes, col_codes] = counts
+            else:
+                table = sparse.coo_matrix((counts, (row_codes, col_codes)), shape=shape)
+            results = ChiSquareTests.compute_chi_square_association(table, alpha,
+                                                                   n_top_residuals, exact_fallback,
+                                                                   monte_carlo_samples, seed, workers,
+                                                                   sequential, tolerance)
+            results = results.copy()
+            results.details['row_labels'] = list(contingency_table.rows.labels)
+            results.details['col_labels'] = list(contingency_table.cols.labels)
+            return results
+        
+        if sparse.issparse(contingency_table):
+            return ChiSquareTests._sparse_association(contingency_table, alpha, n_top_residuals)
+        
         # Convert to numpy array and validate
         table = np.array(contingency_table, dtype=float)
         
@@ -132,8 +403,9 @@ class ChiSquareTests:
         if np.any(table < 0):
             raise ValueError("All frequencies must be non-negative")
         
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("Chi-Square Test of Association")
+        if table.size > MAX_DENSE_CELLS:
+            return ChiSquareTests._sparse_association(sparse.csr_matrix(table), alpha,
+                                                      n_top_residuals)
         
         # Validate assumptions
         warnings = []
@@ -145,22 +417,27 @@ class ChiSquareTests:
         
         expected = np.outer(row_totals, col_totals) / total
         
-        if np.any(expected < 5):
+        # Exact and Monte Carlo tests need counts and non-empty margins
+        is_2x2 = table.shape == (2, 2)
+        use_exact = (exact_fallback and np.any(expected < 5) and np.all(expected > 0)
+                     and np.all(table == np.round(table)))
+        if use_exact:
+            warnings.append("Some expected frequencies < 5. Using Fisher's exact test." if is_2x2 else
+                            "Some expected frequencies < 5. Using a Monte Carlo test with fixed margins.")
+        elif np.any(expected < 5):
             warnings.append("Some expected frequencies < 5. Consider Fisher's exact test.")
         
         if total < 30:
             warnings.append("Total sample size < 30. Results may be unreliable.")
         
-        print_assumption_warnings(warnings)
-        
         # Perform test
         try:
             statistic, p_value, dof, expected_freq = stats.chi2_contingency(table)
         except ValueError as e:
-            return {
+            return TestResult({
                 'test_name': test_name,
                 'error': f"Test failed: {e}"
-            }
+            }, warnings)
         
         # Calculate additional statistics
         rows, cols = table.shape
@@ -178,19 +455,238 @@ class ChiSquareTests:
         # Calculate standardized residuals
         std_residuals = (table - expected_freq) / np.sqrt(expected_freq)
         
+        # Exact or Monte Carlo p-value when the chi-square approximation is doubtful
+        exact = {}
+        decision_p = p_value
+        if use_exact and is_2x2:
+            odds_ratio, fisher_p = stats.fisher_exact(table.astype(np.int64))
+            exact = {'exact_test': "Fisher's exact test", 'exact_p_value': fisher_p,
+                     'odds_ratio': odds_ratio}
+        elif use_exact:
+            # Tables larger than 2x2 have no continuity correction, so the
+            # statistic above is the plain Pearson statistic being simulated
+            exact = {'exact_test': "Monte Carlo (Patefield, fixed margins)",
+                     **_monte_carlo_p_value(_count_extreme_tables,
+                                            (row_totals.astype(np.int64), col_totals.astype(np.int64),
+                                             expected_freq, statistic),
+                                            table.size, monte_carlo_samples, seed, workers,
+                                            alpha, sequential, tolerance)}
+        if exact:
+            decision_p = exact['exact_p_value']
+        
         results = {
             'test_name': test_name,
             'chi2_statistic': statistic,
             'p_value': p_value,
+            **exact,
             'degrees_of_freedom': dof,
             'cramers_v': cramers_v,
             'contingency_coefficient': contingency_coeff,
-            'interpretation': f"{'Reject' if p_value < alpha else 'Fail to reject'} H0 at α = {alpha}"
+            'interpretation': f"{'Reject' if decision_p < alpha else 'Fail to reject'} H0 at α = {alpha}"
         }
         
         if phi is not None:
             results['phi_coefficient'] = phi
         
+        details = {
+            'table': table,
+            'row_totals': row_totals,
+            'col_totals': col_totals,
+            'expected': expected_freq,
+            'standardized_residuals': std_residuals
+        }
+        
+        return TestResult(results, warnings, details)
+    
+    @staticmethod
+    def _sparse_association(contingency_table: sparse.spmatrix, alpha: float,
+                            n_top_residuals: int) -> TestResult:
+        """
+        Chi-Square Test of Association for a sparse table
+        
+        Only the non-empty cells are visited. With E_ij = r_i c_j / N,
+        chi² = Σ (O - E)² / E over the non-empty cells plus Σ E over the
+        empty ones, and the latter is N minus the expected mass of the
+        non-empty cells. Rows and columns with no observations are dropped
+        (they carry no information about association).
+        """
+        test_name = "Chi-Square Test of Association"
+        
+        table = sparse.csr_matrix(contingency_table, dtype=float, copy=True)
+        table.sum_duplicates()
+        table.eliminate_zeros()
+        
+        if table.shape[0] < 2 or table.shape[1] < 2:
+            raise ValueError("Contingency table must be at least 2x2")
+        
+        if np.any(table.data < 0):
+            raise ValueError("All frequencies must be non-negative")
+        
+        # Validate assumptions
+        warnings = []
+        
+        row_totals = np.asarray(table.sum(axis=1)).ravel()
+        col_totals = np.asarray(table.sum(axis=0)).ravel()
+        total = row_totals.sum()
+        
+        kept_rows = np.flatnonzero(row_totals)
+        kept_cols = np.flatnonzero(col_totals)
+        n_dropped = (table.shape[0] - len(kept_rows)) + (table.shape[1] - len(kept_cols))
+        if n_dropped:
+            warnings.append(f"{n_dropped} empty row(s)/column(s) were left out of the test.")
+            table = table[kept_rows][:, kept_cols]
+            row_totals, col_totals = row_totals[kept_rows], col_totals[kept_cols]
+        
+        rows, cols = table.shape
+        if rows < 2 or cols < 2:
+            return TestResult({
+                'test_name': test_name,
+                'error': "Test failed: fewer than 2 non-empty rows or columns"
+            }, warnings)
+        
+        if row_totals.min() * col_totals.min() / total < 5:
+            warnings.append("Some expected frequencies < 5. Consider Fisher's exact test.")
+        
+        if total < 30:
+            warnings.append("Total sample size < 30. Results may be unreliable.")
+        
+        # Non-empty cells in row-major order
+        coo = table.tocoo()
+        cell_rows, cell_cols, observed = coo.row, coo.col, coo.data
+        order = np.lexsort((cell_cols, cell_rows))
+        cell_rows, cell_cols, observed = cell_rows[order], cell_cols[order], observed[order]
+        expected = row_totals[cell_rows] * col_totals[cell_cols] / total
+        residuals = (observed - expected) / np.sqrt(expected)
+        
+        dof = (rows - 1) * (cols - 1)
+        if dof == 1:
+            # 2x2 after dropping empty margins: Yates' correction, as in the dense path
+            statistic, p_value = stats.chi2_contingency(table.toarray())[:2]
+        else:
+            statistic = np.sum(residuals**2) + max(total - expected.sum(), 0.0)
+            p_value = stats.chi2.sf(statistic, dof)
+        
+        # Effect size measures
+        cramers_v = np.sqrt(statistic / (total * min(rows - 1, cols - 1)))
+        contingency_coeff = np.sqrt(statistic / (statistic + total))
+        
+        # Largest |residuals|: among the non-empty cells, and among the empty
+        # cells (-sqrt(E), largest for the largest expected counts)
+        k = min(n_top_residuals, rows * cols)
+        top = np.argsort(-np.abs(residuals), kind='stable')[:k]
+        empty_rows, empty_cols = _largest_empty_cells(row_totals, col_totals,
+                                                      cell_rows * cols + cell_cols, k)
+        empty_expected = row_totals[empty_rows] * col_totals[empty_cols] / total
+        
+        candidate_rows = np.concatenate([cell_rows[top], empty_rows])
+        candidate_cols = np.concatenate([cell_cols[top], empty_cols])
+        candidate_observed = np.concatenate([observed[top], np.zeros(len(empty_rows))])
+        candidate_expected = np.concatenate([expected[top], empty_expected])
+        candidate_residuals = np.concatenate([residuals[top], -np.sqrt(empty_expected)])
+        best = np.argsort(-np.abs(candidate_residuals), kind='stable')[:k]
+        
+        results = {
+            'test_name': test_name,
+            'chi2_statistic': statistic,
+            'p_value': p_value,
+            'degrees_of_freedom': dof,
+            'cramers_v': cramers_v,
+            'contingency_coefficient': contingency_coeff,
+            'table_shape': (rows, cols),
+            'nonzero_cells': len(observed),
+            'interpretation': f"{'Reject' if p_value < alpha else 'Fail to reject'} H0 at α = {alpha}"
+        }
+        
+        details = {
+            'table': table,
+            'row_totals': row_totals,
+            'col_totals': col_totals,
+            'kept_rows': kept_rows,
+            'kept_cols': kept_cols,
+            'top_residuals': {
+                'rows': kept_rows[candidate_rows[best]],
+                'cols': kept_cols[candidate_cols[best]],
+                'observed': candidate_observed[best],
+                'expected': candidate_expected[best],
+                'residuals': candidate_residuals[best]
+            }
+        }
+        
+        return TestResult(results, warnings, details)
+    
+    @staticmethod
+    def chi_square_association(contingency_table: Union[List[List[float]], sparse.spmatrix,
+                                                        ContingencyCounts],
+                              alpha: float = 0.05,
+                              n_top_residuals: int = DEFAULT_TOP_RESIDUALS,
+                              exact_fallback: bool = True,
+                              monte_carlo_samples: int = DEFAULT_MONTE_CARLO_SAMPLES,
+                              seed: SeedLike = None,
+                              workers: Optional[int] = None,
+                              sequential: bool = False,
+                              tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, Any]:
+        """
+        Chi-Square Test of Association (Independence)
+        
+        Args:
+            contingency_table: 2D list representing contingency table, a
+                               scipy.sparse matrix of counts, or ContingencyCounts
+            alpha: Significance level
+            n_top_residuals: Largest standardized residuals listed for sparse tables
+            exact_fallback: Use an exact or Monte Carlo test when expected frequencies are small
+            monte_carlo_samples: Sample budget of the Monte Carlo test
+            seed: Seed for reproducible Monte Carlo results
+            workers: Worker processes for the Monte Carlo test (default: all CPUs for large runs)
+            sequential: Stop the Monte Carlo test once the decision at alpha is settled
+            tolerance: Chance of a different decision than the full run (sequential mode)
+        
+        Returns:
+            Dictionary with test results
+        """
+        results = ChiSquareTests.compute_chi_square_association(contingency_table, alpha,
+                                                               n_top_residuals, exact_fallback,
+                                                               monte_carlo_samples, seed, workers,
+                                                               sequential, tolerance)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Chi-Square Test of Association")
+        
+        print_assumption_warnings(results.warnings)
+        
+        if 'error' in results:
+            return results
+        
+        if 'top_residuals' in results.details:
+            # Sparse or large table: list the cells that deviate most instead of every cell
+            top = results.details['top_residuals']
+            row_labels = results.details.get('row_labels')
+            col_labels = results.details.get('col_labels')
+            print("\nLargest Standardized Residuals:")
+            print("-" * 60)
+            print(f"{'Row':>10} {'Col':>10} {'Observed':>12} {'Expected':>12} {'Residual':>12}")
+            print("-" * 60)
+            for i, j, obs, exp, res in zip(top['rows'], top['cols'], top['observed'],
+                                           top['expected'], top['residuals']):
+                row_name = f"{row_labels[i]!s:.10}" if row_labels else i + 1
+                col_name = f"{col_labels[j]!s:.10}" if col_labels else j + 1
+                print(f"{row_name:>10} {col_name:>10} {obs:>12.0f} {exp:>12.2f} {res:>12.2f}")
+            print("-" * 60)
+            
+            print_test_results(results, hypotheses)
+            return results
+        
+        table = results.details['table']
+        row_totals = results.details['row_totals']
+        col_totals = results.details['col_totals']
+        expected_freq = results.details['expected']
+        total = table.sum()
+        rows, cols = table.shape
+        row_names = [f"{label!s:.9}" for label in results.details.get('row_labels', [])]
+        col_names = [f"{label!s:.9}" for label in results.details.get('col_labels', [])]
+        if not row_names:
+            row_names = [f"Row{i+1}" for i in range(rows)]
+            col_names = [f"Col{j+1}" for j in range(cols)]
+        
         # Print contingency table with margins
         print("\nContingency Table:")
         print("-" * (cols * 12 + 15))
@@ -198,14 +694,14 @@ class ChiSquareTests:
         # Header
         header = "Row\\Col".ljust(10)
         for j in range(cols):
-            header += f"Col{j+1}".rjust(10)
+            header += col_names[j].rjust(10)
         header += "Total".rjust(12)
         print(header)
         print("-" * (cols * 12 + 15))
         
         # Data rows
         for i in range(rows):
-            row_str = f"Row{i+1}".ljust(10)
+            row_str = row_names[i].ljust(10)
             for j in range(cols):
                 row_str += f"{table[i,j]:.0f}".rjust(10)
             row_str += f"{row_totals[i]:.0f}".rjust(12)
@@ -224,7 +720,7 @@ class ChiSquareTests:
         print("\nExpected Frequencies:")
         print("-" * (cols * 12 + 10))
         for i in range(rows):
-            row_str = f"Row{i+1}".ljust(10)
+            row_str = row_names[i].ljust(10)
             for j in range(cols):
                 row_str += f"{expected_freq[i,j]:.2f}".rjust(10)
             print(row_str)
@@ -5,27 +5,49 @@
 
 import numpy as np
 import scipy.stats as stats
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from utils.validators import validate_correlation_data, get_hypothesis_input
 from utils.formatters import (print_test_results, print_assumption_warnings, 
-                            print_data_summary, format_regression_results)
+                            print_data_summary, print_moments_summary, format_regression_results,
+                            get_significance_stars, print_significance_legend)
+from utils.sufficient_stats import CrossProducts
+from utils.results import TestResult
+from utils.result_cache import cached_result
+from utils.ranking import RankInfo, rank_info_or_compute
+from utils.correlation_matrix import DEFAULT_TILE_SIZE, correlation_matrix, strongest_pairs
+
+# Variables shown as a full matrix, and strongest pairs listed, by the
+# interactive correlation matrix
+MAX_PRINTED_VARIABLES = 8
+MAX_PRINTED_PAIRS = 20
 
 class CorrelationTests:
-    """Class containing correlation and regression tests"""
+    """
+    Class containing correlation and regression tests
+    
+    Each test has a compute_* method that returns a TestResult without any
+    input() or print() calls, and an interactive method of the original
+    name that asks for hypotheses and prints the results.
+    """
     
     @staticmethod
-    def spearmans_rank_correlation(x_data: List[float], y_data: List[float],
-                                  alpha: float = 0.05) -> Dict[str, Any]:
+    @cached_result('spearmans_rank_correlation')
+    def compute_spearmans_rank_correlation(x_data: List[float], y_data: List[float],
+                                          alpha: float = 0.05,
+                                          rank_info_x: Optional[RankInfo] = None,
+                                          rank_info_y: Optional[RankInfo] = None) -> TestResult:
         """
-        Spearman's Rank Correlation Test
+        Spearman's Rank Correlation Test (no I/O)
         
         Args:
             x_data: X variable data
             y_data: Y variable data
             alpha: Significance level
+            rank_info_x: Precomputed ranks of x_data
+            rank_info_y: Precomputed ranks of y_data
             
         Returns:
-            Dictionary with test results
+            TestResult with test results and assumption warnings
         """
         test_name = "Spearman's Rank Correlation"
         
@@ -34,37 +56,34 @@ class CorrelationTests:
         if not is_valid:
             raise ValueError(error_msg)
         
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("Spearman's Rank Correlation")
-        
         # Validate assumptions
         warnings = []
         
         if len(x_data) < 10:
             warnings.append("Small sample size. Results may be unreliable.")
         
+        rank_info_x = rank_info_or_compute(x_data, rank_info_x)
+        rank_info_y = rank_info_or_compute(y_data, rank_info_y)
+        
         # Check for ties
-        x_ties = len(x_data) - len(set(x_data))
-        y_ties = len(y_data) - len(set(y_data))
+        x_ties = len(x_data) - len(rank_info_x.tie_counts)
+        y_ties = len(y_data) - len(rank_info_y.tie_counts)
         
         if x_ties > len(x_data) * 0.1:
             warnings.append("Many ties in X variable. Consider alternative methods.")
         if y_ties > len(y_data) * 0.1:
             warnings.append("Many ties in Y variable. Consider alternative methods.")
         
-        print_assumption_warnings(warnings)
-        
-        # Perform test
-        try:
-            correlation, p_value = stats.spearmanr(x_data, y_data)
-        except ValueError as e:
-            return {
-                'test_name': test_name,
-                'error': f"Test failed: {e}"
-            }
+        # Perform test: Pearson correlation of the ranks with the t
+        # approximation used by scipy.stats.spearmanr
+        n = len(x_data)
+        dof = n - 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = np.corrcoef(rank_info_x.ranks, rank_info_y.ranks)[1, 0]
+            t_statistic = correlation * np.sqrt((dof / ((correlation + 1.0) * (1.0 - correlation))).clip(0))
+        p_value = 2 * stats.t.sf(np.abs(t_statistic), dof)
         
         # Calculate additional statistics
-        n = len(x_data)
         
         # Confidence interval for correlation (Fisher's z-transformation approximation)
         if abs(correlation) < 0.999:
@@ -105,6 +124,37 @@ class CorrelationTests:
         if ci_lower is not None and ci_upper is not None:
             results['confidence_interval'] = (ci_lower, ci_upper)
         
+        return TestResult(results, warnings)
+    
+    @staticmethod
+    def spearmans_rank_correlation(x_data: List[float], y_data: List[float],
+                                  alpha: float = 0.05,
+                                  rank_info_x: Optional[RankInfo] = None,
+                                  rank_info_y: Optional[RankInfo] = None) -> Dict[str, Any]:
+        """
+        Spearman's Rank Correlation Test
+        
+        Args:
+            x_data: X variable data
+            y_data: Y variable data
+            alpha: Significance level
+            rank_info_x: Precomputed ranks of x_data
+            rank_info_y: Precomputed ranks of y_data
+        
+        Returns:
+            Dictionary with test results
+        """
+        results = CorrelationTests.compute_spearmans_rank_correlation(x_data, y_data, alpha,
+                                                                      rank_info_x, rank_info_y)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Spearman's Rank Correlation")
+        
+        print_assumption_warnings(results.warnings)
+        
+        if 'error' in results:
+            return results
+        
         print_data_summary(x_data, "X Variable")
         print_data_summary(y_data, "Y Variable")
         print_test_results(results, hypotheses)
@@ -112,44 +162,49 @@ class CorrelationTests:
         return results
     
     @staticmethod
-    def coefficient_of_determination(x_data: List[float], y_data: List[float],
-                                   alpha: float = 0.05) -> Dict[str, Any]:
+    @cached_result('coefficient_of_determination')
+    def compute_coefficient_of_determination(x_data: Optional[List[float]] = None,
+                                            y_data: Optional[List[float]] = None,
+                                            alpha: float = 0.05,
+                                            cross_products: Optional[CrossProducts] = None) -> TestResult:
         """
-        Coefficient of Determination (R-squared) with significance test
+        Coefficient of Determination (R-squared) with significance test (no I/O)
+        
+        Computed from the regression cross-products, so it can also be
+        finished from a CrossProducts accumulator built in chunks.
         
         Args:
-            x_data: X variable (predictor)
-            y_data: Y variable (response)
+            x_data: X variable (predictor), may be None when cross_products is given
+            y_data: Y variable (response), may be None when cross_products is given
             alpha: Significance level
+            cross_products: Precomputed CrossProducts of (x, y)
             
         Returns:
-            Dictionary with test results
+            TestResult with test results
         """
         test_name = "Coefficient of Determination"
         
-        # Validate data
-        is_valid, error_msg = validate_correlation_data(x_data, y_data)
-        if not is_valid:
-            raise ValueError(error_msg)
-        
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("Coefficient of Determination")
-        
-        # Convert to numpy arrays
-        x = np.array(x_data)
-        y = np.array(y_data)
-        n = len(x)
+        cross_products = CorrelationTests._regression_cross_products(x_data, y_data, cross_products)
+        n = cross_products.count
         
         # Calculate linear regression
-        slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
+        sxx, sxy, syy = np.float64(cross_products.cxx), np.float64(cross_products.cxy), np.float64(cross_products.cyy)
+        slope = sxy / sxx
+        intercept = cross_products.y.mean - slope * cross_products.x.mean
+        r_value = np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0)
+        
+        # Slope t-test, as in scipy.stats.linregress
+        df = n - 2
+        with np.errstate(divide='ignore'):
+            t_statistic = r_value * np.sqrt(df / ((1.0 - r_value) * (1.0 + r_value)))
+        p_value = 2 * stats.t.sf(abs(t_statistic), df)
         
         # Calculate R-squared
         r_squared = r_value ** 2
         
         # Calculate additional regression statistics
-        y_pred = slope * x + intercept
-        ss_res = np.sum((y - y_pred) ** 2)  # Sum of squares of residuals
-        ss_tot = np.sum((y - np.mean(y)) ** 2)  # Total sum of squares
+        ss_tot = syy  # Total sum of squares
+        ss_res = max(ss_tot - sxy * sxy / sxx, 0.0)  # Sum of squares of residuals
         
         # Mean squared error
         mse = ss_res / (n - 2)
@@ -157,7 +212,8 @@ class CorrelationTests:
         
         # F-statistic for overall model significance
         if ss_tot > 0:
-            f_statistic = (ss_tot - ss_res) / (ss_res / (n - 2))
+            with np.errstate(divide='ignore'):
+                f_statistic = (ss_tot - ss_res) / (ss_res / (n - 2))
         else:
             f_statistic = 0
         
@@ -199,47 +255,101 @@ class CorrelationTests:
         if r2_lower is not None and r2_upper is not None:
             results['r2_confidence_interval'] = (r2_lower, r2_upper)
         
+        return TestResult(results, details={'cross_products': cross_products})
+    
+    @staticmethod
+    def coefficient_of_determination(x_data: Optional[List[float]] = None,
+                                     y_data: Optional[List[float]] = None,
+                                     alpha: float = 0.05,
+                                     cross_products: Optional[CrossProducts] = None) -> Dict[str, Any]:
+        """
+        Coefficient of Determination (R-squared) with significance test
+        
+        Args:
+            x_data: X variable (predictor), may be None when cross_products is given
+            y_data: Y variable (response), may be None when cross_products is given
+            alpha: Significance level
+            cross_products: Precomputed CrossProducts of (x, y)
+        
+        Returns:
+            Dictionary with test results
+        """
+        results = CorrelationTests.compute_coefficient_of_determination(x_data, y_data, alpha, cross_products)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Coefficient of Determination")
+        
+        slope, intercept = results['slope'], results['intercept']
+        r_squared = results['r_squared']
+        
         # Print regression equation and fit statistics
         print(f"\nRegression Analysis:")
         print(f"Equation: y = {slope:.4f}x + {intercept:.4f}")
         print(f"R-squared: {r_squared:.4f} ({r_squared*100:.2f}% of variance explained)")
-        print(f"Adjusted R-squared: {adj_r_squared:.4f}")
-        print(f"RMSE: {rmse:.4f}")
+        print(f"Adjusted R-squared: {results['adjusted_r_squared']:.4f}")
+        print(f"RMSE: {results['rmse']:.4f}")
         
-        print_data_summary(x_data, "X Variable (Predictor)")
-        print_data_summary(y_data, "Y Variable (Response)")
+        if x_data is not None and y_data is not None:
+            print_data_summary(x_data, "X Variable (Predictor)")
+            print_data_summary(y_data, "Y Variable (Response)")
+        else:
+            cross_products = results.details['cross_products']
+            print_moments_summary(cross_products.x, "X Variable (Predictor)")
+            print_moments_summary(cross_products.y, "Y Variable (Response)")
         print_test_results(results, hypotheses)
         
         return results
     
     @staticmethod
-    def linear_regression_tests(x_data: List[float], y_data: List[float],
-                               alpha: float = 0.05) -> Dict[str, Any]:
+    def _regression_cross_products(x_data: Optional[List[float]], y_data: Optional[List[float]],
+                                   cross_products: Optional[CrossProducts]) -> CrossProducts:
+        """Validate the regression input and reduce raw data to cross-products"""
+        if cross_products is None:
+            is_valid, error_msg = validate_correlation_data(x_data, y_data)
+            if not is_valid:
+                raise ValueError(error_msg)
+            
+            # View as float arrays (no copy for stored datasets)
+            return CrossProducts.from_arrays(np.asarray(x_data, dtype=float),
+                                             np.asarray(y_data, dtype=float))
+        
+        if cross_products.count < 3:
+            raise ValueError("Need at least 3 data points for correlation")
+        if cross_products.cxx <= 0:
+            raise ValueError("X variable is constant (no variation)")
+        if cross_products.cyy <= 0:
+            raise ValueError("Y variable is constant (no variation)")
+        return cross_products
+    
+    @staticmethod
+    @cached_result('linear_regression_tests')
+    def compute_linear_regression_tests(x_data: Optional[List[float]] = None,
+                                        y_data: Optional[List[float]] = None,
+                                        alpha: float = 0.05,
+                                        cross_products: Optional[CrossProducts] = None) -> TestResult:
         """
-        Comprehensive Linear Regression Analysis with multiple tests
+        Comprehensive Linear Regression Analysis with multiple tests (no I/O)
+        
+        Every statistic, including Durbin-Watson (from the lag sums of
+        successive differences), is computed from the regression
+        cross-products, so the analysis can also be finished from a
+        CrossProducts accumulator built in chunks (e.g. by
+        utils.loaders.stream_cross_products) without the raw data.
         
         Args:
-            x_data: X variable (predictor)
-            y_data: Y variable (response)
+            x_data: X variable (predictor), may be None when cross_products is given
+            y_data: Y variable (response), may be None when cross_products is given
             alpha: Significance level
+            cross_products: Precomputed CrossProducts of (x, y)
             
         Returns:
-            Dictionary with comprehensive regression results
+            TestResult with regression results; details hold the ANOVA table
+            sums of squares and the cross-products
         """
         test_name = "Linear Regression Analysis"
         
-        # Validate data
-        is_valid, error_msg = validate_correlation_data(x_data, y_data)
-        if not is_valid:
-            raise ValueError(error_msg)
-        
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("Linear Regression Analysis")
-        
-        # Convert to numpy arrays
-        x = np.array(x_data)
-        y = np.array(y_data)
-        n = len(x)
+        cross_products = CorrelationTests._regression_cross_products(x_data, y_data, cross_products)
+        n = cross_products.count
         
         # Validate assumptions
         warnings = []
@@ -247,19 +357,16 @@ class CorrelationTests:
         if n < 10:
             warnings.append("Small sample size. Results may be unreliable.")
         
-        print_assumption_warnings(warnings)
-        
-        # Perform regression analysis
-        slope, intercept, r_value, p_value_overall, std_err = stats.linregress(x, y)
-        
-        # Calculate comprehensive statistics
-        y_pred = slope * x + intercept
-        residuals = y - y_pred
+        # Perform regression analysis from the cross-products
+        sxx, sxy, syy = np.float64(cross_products.cxx), np.float64(cross_products.cxy), np.float64(cross_products.cyy)
+        slope = sxy / sxx
+        intercept = cross_products.y.mean - slope * cross_products.x.mean
+        r_value = sxy / np.sqrt(sxx * syy)
         
         # Sums of squares
-        ss_res = np.sum(residuals ** 2)
-        ss_tot = np.sum((y - np.mean(y)) ** 2)
-        ss_reg = ss_tot - ss_res
+        ss_tot = syy
+        ss_reg = sxy * sxy / sxx
+        ss_res = max(ss_tot - ss_reg, 0.0)
         
         # Degrees of freedom
         df_reg = 1  # One predictor
@@ -282,7 +389,7 @@ class CorrelationTests:
         se_regression = np.sqrt(ms_res)
         
         # Standard error of slope
-        se_slope = se_regression / np.sqrt(np.sum((x - np.mean(x)) ** 2))
+        se_slope = se_regression / np.sqrt(sxx)
         
         # t-test for slope
         t_statistic = slope / se_slope if se_slope > 0 else 0
@@ -293,13 +400,9 @@ class CorrelationTests:
         slope_ci_lower = slope - t_critical * se_slope
         slope_ci_upper = slope + t_critical * se_slope
         
-        # Prediction intervals (for mean response)
-        x_mean = np.mean(x)
-        se_pred_mean = se_regression * np.sqrt(1/n + (x - x_mean)**2 / np.sum((x - x_mean)**2))
-        
-        # Durbin-Watson test for autocorrelation (approximate)
-        if n > 2:
-            dw_statistic = np.sum(np.diff(residuals)**2) / np.sum(residuals**2)
+        # Durbin-Watson test for autocorrelation (approximate): Σ(Δe)² / Σe²
+        if n > 2 and ss_res > 0:
+            dw_statistic = cross_products.residual_lag_sum(slope) / ss_res
         else:
             dw_statistic = None
         
@@ -325,6 +428,53 @@ class CorrelationTests:
         if dw_statistic is not None:
             results['durbin_watson'] = dw_statistic
         
+        details = {
+            'cross_products': cross_products,
+            'anova': {
+                'ss_reg': ss_reg, 'ss_res': ss_res, 'ss_tot': ss_tot,
+                'df_reg': df_reg, 'df_res': df_res, 'df_tot': df_tot,
+                'ms_reg': ms_reg, 'ms_res': ms_res
+            }
+        }
+        
+        return TestResult(results, warnings, details)
+    
+    @staticmethod
+    def linear_regression_tests(x_data: Optional[List[float]] = None, y_data: Optional[List[float]] = None,
+                               alpha: float = 0.05,
+                               cross_products: Optional[CrossProducts] = None) -> Dict[str, Any]:
+        """
+        Comprehensive Linear Regression Analysis with multiple tests
+        
+        Args:
+            x_data: X variable (predictor), may be None when cross_products is given
+            y_data: Y variable (response), may be None when cross_products is given
+            alpha: Significance level
+            cross_products: Precomputed CrossProducts of (x, y)
+        
+        Returns:
+            Dictionary with comprehensive regression results
+        """
+        results = CorrelationTests.compute_linear_regression_tests(x_data, y_data, alpha, cross_products)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Linear Regression Analysis")
+        
+        print_assumption_warnings(results.warnings)
+        
+        slope, intercept = results['slope'], results['intercept']
+        r_squared, adj_r_squared = results['r_squared'], results['adjusted_r_squared']
+        se_regression = results['regression_std_error']
+        f_statistic, f_p_value = results['f_statistic'], results['f_p_value']
+        t_statistic, t_p_value = results['t_statistic_slope'], results['slope_p_value']
+        slope_ci_lower, slope_ci_upper = results['slope_confidence_interval']
+        dw_statistic = results.get('durbin_watson')
+        anova = results.details['anova']
+        ss_reg, ss_res, ss_tot = anova['ss_reg'], anova['ss_res'], anova['ss_tot']
+        df_reg, df_res, df_tot = anova['df_reg'], anova['df_res'], anova['df_tot']
+        ms_reg, ms_res = anova['ms_reg'], anova['ms_res']
+        cross_products = results.details['cross_products']
+        
         # Print comprehensive results
         print(f"\nLinear Regression Analysis")
         print("=" * 50)
@@ -349,8 +499,144 @@ class CorrelationTests:
         print(f"{'Total':<12} {ss_tot:<12.4f} {df_tot:<6}")
         print("-" * 70)
         
-        print_data_summary(x_data, "X Variable (Predictor)")
-        print_data_summary(y_data, "Y Variable (Response)")
+        print_moments_summary(cross_products.x, "X Variable (Predictor)")
+        print_moments_summary(cross_products.y, "Y Variable (Response)")
+        print_test_results(results, hypotheses)
+        
+        return results
+    
+    @staticmethod
+    @cached_result('correlation_matrix', bypass_argument='out')
+    def compute_correlation_matrix(datasets: Sequence[List[float]], method: str = 'pearson',
+                                   alpha: float = 0.05, names: Optional[Sequence[str]] = None,
+                                   rank_infos: Optional[List[Optional[RankInfo]]] = None,
+                                   tile_size: int = DEFAULT_TILE_SIZE,
+                                   out: Optional[Sequence[np.ndarray]] = None) -> TestResult:
+        """
+        All-pairs Pearson or Spearman correlation matrix (no I/O)
+        
+        Every dataset is standardized (after ranking, for Spearman) once and
+        the matrix comes from tiled BLAS products of the standardized data;
+        p-values and Fisher z confidence limits are computed over whole
+        tiles. Per pair, the numbers match the single Spearman test.
+        
+        For many variables, pass four disk-backed m x m arrays as out (e.g.
+        from np.lib.format.open_memmap) to keep the matrices out of memory;
+        such calls are not cached, and results too large for the cache
+        budget are not stored either.
+        
+        Args:
+            datasets: Equal-length datasets, one per variable
+            method: 'pearson' or 'spearman'
+            alpha: Significance level
+            names: Names of the variables (default x1, x2, ...)
+            rank_infos: Precomputed ranks of each dataset (entries may be None)
+            tile_size: Variables per side of a tile
+            out: Four preallocated m x m float arrays to fill (r, p-values,
+                 lower and upper confidence limits)
+            
+        Returns:
+            TestResult with pair counts; details hold the names and the
+            correlation, p-value and confidence limit matrices
+        """
+        test_name = f"{'Spearman' if method == 'spearman' else 'Pearson'} Correlation Matrix"
+        
+        m = len(datasets)
+        if names is None:
+            names = [f"x{i}" for i in range(1, m + 1)]
+        elif len(names) != m:
+            raise ValueError("Need one name per dataset")
+        
+        r, p_values, ci_lower, ci_upper = correlation_matrix(datasets, method, alpha, rank_infos,
+                                                             tile_size, out)
+        n = len(datasets[0])
+        
+        # Validate assumptions
+        warnings = []
+        
+        if n < 10:
+            warnings.append("Small sample size. Results may be unreliable.")
+        constant = [name for name, value in zip(names, np.diag(r)) if np.isnan(value)]
+        if constant:
+            warnings.append(f"Constant datasets have no correlation: {', '.join(map(str, constant))}")
+        
+        # Significant pairs above the diagonal, counted a block of rows at a time
+        n_significant = 0
+        for start in range(0, m, tile_size):
+            rows = np.arange(start, min(start + tile_size, m))
+            upper = np.arange(m) > rows[:, np.newaxis]
+            n_significant += int(np.count_nonzero(upper & (p_values[rows] < alpha)))
+        n_pairs = m * (m - 1) // 2
+        
+        results = {
+            'test_name': test_name,
+            'n_variables': m,
+            'n_observations': n,
+            'n_pairs': n_pairs,
+            'n_significant': n_significant,
+            'interpretation': f"{n_significant} of {n_pairs} pairs significantly correlated at α = {alpha}"
+        }
+        
+        details = {
+            'names': list(names),
+            'correlation': r,
+            'p_values': p_values,
+            'ci_lower': ci_lower,
+            'ci_upper': ci_upper
+        }
+        
+        return TestResult(results, warnings, details)
+    
+    @staticmethod
+    def correlation_matrix(datasets: Sequence[List[float]], method: str = 'pearson',
+                           alpha: float = 0.05, names: Optional[Sequence[str]] = None,
+                           rank_infos: Optional[List[Optional[RankInfo]]] = None,
+                           out: Optional[Sequence[np.ndarray]] = None) -> Dict[str, Any]:
+        """
+        All-pairs Pearson or Spearman correlation matrix
+        
+        Args:
+            datasets: Equal-length datasets, one per variable
+            method: 'pearson' or 'spearman'
+            alpha: Significance level
+            names: Names of the variables (default x1, x2, ...)
+            rank_infos: Precomputed ranks of each dataset (entries may be None)
+            out: Four preallocated m x m arrays to fill (e.g. memory-mapped)
+        
+        Returns:
+            Dictionary with test results
+        """
+        results = CorrelationTests.compute_correlation_matrix(datasets, method, alpha, names, rank_infos,
+                                                              out=out)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input(results['test_name'])
+        
+        print_assumption_warnings(results.warnings)
+        
+        names = results.details['names']
+        r = results.details['correlation']
+        p_values = results.details['p_values']
+        
+        if len(names) <= MAX_PRINTED_VARIABLES:
+            print(f"\n{results['test_name']}:")
+            print("-" * (12 + 10 * len(names)))
+            print(f"{'':<12}" + "".join(f"{str(name)[:9]:>10}" for name in names))
+            for name, row in zip(names, r):
+                print(f"{str(name)[:11]:<12}" + "".join(f"{value:>10.4f}" for value in row))
+            print("-" * (12 + 10 * len(names)))
+        
+        print("\nStrongest Correlations:")
+        print("-" * 78)
+        print(f"{'Variable A':<16} {'Variable B':<16} {'r':<9} {'p-value':<10} {'CI lower':<10} {'CI upper':<10}")
+        print("-" * 78)
+        for i, j in strongest_pairs(r, MAX_PRINTED_PAIRS):
+            lower, upper = results.details['ci_lower'][i, j], results.details['ci_upper'][i, j]
+            print(f"{str(names[i])[:15]:<16} {str(names[j])[:15]:<16} {r[i, j]:<9.4f} {p_values[i, j]:<10.4f} "
+                  f"{lower:<10.4f} {upper:<10.4f} {get_significance_stars(p_values[i, j])}")
+        print("-" * 78)
+        print_significance_legend()
+        
         print_test_results(results, hypotheses)
         
         return results
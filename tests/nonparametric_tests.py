@@ -7,89 +7,79 @@ import numpy as np
 import scipy.stats as stats
 from typing import List, Dict, Any, Tuple, Optional
 from utils.validators import (validate_minimum_sample_size, validate_equal_sample_sizes,
-                            get_hypothesis_input)
+                            get_hypothesis_input, get_float_input)
 from utils.formatters import print_test_results, print_assumption_warnings, print_data_summary
+from utils.results import TestResult
+from utils.result_cache import cached_result
+from utils.sufficient_stats import encode_groups
+from utils.ranking import (RankInfo, rank_info_or_compute, sort_and_rank, sorted_median,
+                           pooled_rank_sums, signed_rank_sums, tie_sum, tie_correction,
+                           grouped_medians)
+from utils.exact_distributions import (EXACT_MAX_N, mann_whitney_exact_applies,
+                                       mann_whitney_exact_p, wilcoxon_exact_p)
 
 class NonParametricTests:
-    """Class containing non-parametric statistical tests"""
+    """
+    Class containing non-parametric statistical tests
+    
+    Each test has a compute_* method that returns a TestResult without any
+    input() or print() calls, and an interactive method of the original
+    name that asks for hypotheses and prints the results.
+    """
     
     @staticmethod
-    def wilcoxon_signed_rank_test(data1: List[float], data2: Optional[List[float]] = None,
-                                 alpha: float = 0.05) -> Dict[str, Any]:
+    def _signed_rank(differences: np.ndarray, test_name: str, alpha: float,
+                     warnings: List[str], n_key: str = 'n_pairs',
+                     extra: Optional[Dict[str, Any]] = None,
+                     sorted_differences: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """
-        Wilcoxon Signed-Rank Test
-        Can be used for one-sample or paired-sample testing
+        Shared signed-rank computation on a vector of differences
         
         Args:
-            data1: First sample or differences (for one-sample test)
-            data2: Second sample (for paired test) or None
+            differences: Differences from the hypothesized median (or paired differences)
+            test_name: Name reported in the results
             alpha: Significance level
+            warnings: Assumption warnings list, extended in place
+            n_key: Results key for the number of non-zero differences
+            extra: Additional results reported after the sample size
+            sorted_differences: The differences in ascending order, when
+                                already known from a cached sort
             
         Returns:
-            Dictionary with test results
+            Dictionary with test results (or an 'error' entry)
         """
-        if data2 is None:
-            # One-sample test against median of 0
-            test_name = "One-Sample Wilcoxon Signed-Rank Test"
-            differences = data1
-            
-            # Get hypothesized median
-            while True:
-                try:
-                    hyp_median = float(input("Enter hypothesized median (default 0): ") or "0")
-                    break
-                except ValueError:
-                    print("Please enter a valid number.")
-            
-            differences = [x - hyp_median for x in data1]
-            
-        else:
-            # Paired-sample test
-            test_name = "Paired-Sample Wilcoxon Signed-Rank Test"
-            
-            if not validate_equal_sample_sizes(data1, data2):
-                raise ValueError("Paired test requires equal sample sizes")
-            
-            differences = [x2 - x1 for x1, x2 in zip(data1, data2)]
-        
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("Wilcoxon Signed-Rank Test")
-        
-        # Validate assumptions
-        warnings = []
+        if sorted_differences is None:
+            sorted_differences = np.sort(differences)
         
         if not validate_minimum_sample_size(differences, 6):
-            warnings.append("Small sample size. Consider exact p-values.")
+            warnings.append("Small sample size. The test has very little power.")
         
-        # Remove zero differences
-        non_zero_diffs = [d for d in differences if d != 0]
+        # Ranks of the non-zero |differences| (zeros are dropped)
+        r_plus, r_minus, tie_counts = signed_rank_sums(sorted_differences)
+        n = int(np.sum(tie_counts))
         
-        if len(non_zero_diffs) < len(differences):
-            warnings.append(f"Removed {len(differences) - len(non_zero_diffs)} zero differences.")
+        if n < len(differences):
+            warnings.append(f"Removed {len(differences) - n} zero differences.")
         
-        if len(non_zero_diffs) == 0:
+        if n == 0:
             warnings.append("All differences are zero. Cannot perform test.")
-            
-        print_assumption_warnings(warnings)
-        
-        if len(non_zero_diffs) == 0:
             return {
                 'test_name': test_name,
                 'error': "Cannot perform test - all differences are zero"
             }
         
-        # Perform test
-        try:
-            statistic, p_value = stats.wilcoxon(non_zero_diffs, alternative='two-sided')
-        except ValueError as e:
-            return {
-                'test_name': test_name,
-                'error': f"Test failed: {e}"
-            }
+        # Perform test: exact null distribution (conditional on the ties)
+        # for small samples, normal approximation otherwise
+        statistic = min(r_plus, r_minus)
+        if n <= EXACT_MAX_N:
+            p_value = wilcoxon_exact_p(r_plus, n, tie_counts)
+        else:
+            se = np.sqrt((n*(n+1)*(2*n+1) - tie_sum(tie_counts)/2) / 24)
+            z = (r_plus - n*(n+1)/4) / se
+            p_value = 2 * stats.norm.sf(abs(z))
         
         # Calculate additional statistics
-        n = len(non_zero_diffs)
-        median_diff = np.median(differences)
+        median_diff = sorted_median(sorted_differences)
         
         # Effect size (r = Z / sqrt(N))
         if n > 10:
@@ -102,7 +92,8 @@ class NonParametricTests:
             'test_name': test_name,
             'statistic': statistic,
             'p_value': p_value,
-            'n_pairs': n,
+            n_key: n,
+            **(extra or {}),
             'median_difference': median_diff,
             'interpretation': f"{'Reject' if p_value < alpha else 'Fail to reject'} H0 at α = {alpha}"
         }
@@ -110,142 +101,225 @@ class NonParametricTests:
         if effect_size is not None:
             results['effect_size'] = effect_size
         
+        return results
+    
+    @staticmethod
+    @cached_result('wilcoxon_signed_rank_test')
+    def compute_wilcoxon_signed_rank_test(data1: List[float], data2: Optional[List[float]] = None,
+                                          hypothesized_median: float = 0.0,
+                                          alpha: float = 0.05,
+                                          rank_info: Optional[RankInfo] = None) -> TestResult:
+        """
+        Wilcoxon Signed-Rank Test (no I/O)
+        Can be used for one-sample or paired-sample testing
+        
+        Args:
+            data1: First sample or differences (for one-sample test)
+            data2: Second sample (for paired test) or None
+            hypothesized_median: Median tested against in the one-sample case
+            alpha: Significance level
+            rank_info: Precomputed ranks of data1 (used in the one-sample case;
+                       paired differences are sorted once per call)
+        
+        Returns:
+            TestResult with test results and assumption warnings
+        """
+        data1 = np.asarray(data1, dtype=float)
+        sorted_differences = None
+        
+        if data2 is None:
+            test_name = "One-Sample Wilcoxon Signed-Rank Test"
+            differences = data1 - hypothesized_median
+            if rank_info is not None:
+                sorted_data = rank_info_or_compute(data1, rank_info).sorted_values(data1)
+                sorted_differences = sorted_data - hypothesized_median
+        else:
+            # Paired-sample test
+            test_name = "Paired-Sample Wilcoxon Signed-Rank Test"
+            data2 = np.asarray(data2, dtype=float)
+            
+            if not validate_equal_sample_sizes(data1, data2):
+                raise ValueError("Paired test requires equal sample sizes")
+            
+            differences = data2 - data1
+        
+        warnings = []
+        results = NonParametricTests._signed_rank(differences, test_name, alpha, warnings,
+                                                  sorted_differences=sorted_differences)
+        
+        return TestResult(results, warnings, {'differences': differences})
+    
+    @staticmethod
+    def wilcoxon_signed_rank_test(data1: List[float], data2: Optional[List[float]] = None,
+                                 alpha: float = 0.05,
+                                 hypothesized_median: Optional[float] = None,
+                                 rank_info: Optional[RankInfo] = None) -> Dict[str, Any]:
+        """
+        Wilcoxon Signed-Rank Test
+        Can be used for one-sample or paired-sample testing
+        
+        Args:
+            data1: First sample or differences (for one-sample test)
+            data2: Second sample (for paired test) or None
+            alpha: Significance level
+            hypothesized_median: One-sample median (asked for when None)
+            rank_info: Precomputed ranks of data1 (one-sample case)
+        
+        Returns:
+            Dictionary with test results
+        """
+        if data2 is None and hypothesized_median is None:
+            hypothesized_median = get_float_input("Enter hypothesized median (default 0): ")
+        
+        results = NonParametricTests.compute_wilcoxon_signed_rank_test(
+            data1, data2, hypothesized_median or 0.0, alpha, rank_info)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Wilcoxon Signed-Rank Test")
+        
+        print_assumption_warnings(results.warnings)
+        
+        if 'error' in results:
+            return results
+        
         if data2 is None:
             print_data_summary(data1, "Sample")
         else:
             print_data_summary(data1, "Sample 1")
             print_data_summary(data2, "Sample 2")
         
-        print_data_summary(differences, "Differences")
+        print_data_summary(results.details['differences'], "Differences")
         print_test_results(results, hypotheses)
         
         return results
     
-    @staticmethod  
-    def one_sample_wilcoxon_test(data: List[float], hypothesized_median: float = 0,
-                               alpha: float = 0.05) -> Dict[str, Any]:
+    @staticmethod
+    @cached_result('one_sample_wilcoxon_test')
+    def compute_one_sample_wilcoxon_test(data: List[float], hypothesized_median: float = 0,
+                                         alpha: float = 0.05,
+                                         rank_info: Optional[RankInfo] = None) -> TestResult:
         """
-        One-Sample Wilcoxon Signed-Rank Test
+        One-Sample Wilcoxon Signed-Rank Test (no I/O)
         
         Args:
             data: Sample data
             hypothesized_median: Hypothesized population median
             alpha: Significance level
-            
+            rank_info: Precomputed ranks of data (avoids sorting it again)
+        
         Returns:
-            Dictionary with test results
+            TestResult with test results and assumption warnings
         """
         test_name = "One-Sample Wilcoxon Signed-Rank Test"
         
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("One-Sample Wilcoxon Signed-Rank Test")
-        
-        # Calculate differences from hypothesized median
-        differences = [x - hypothesized_median for x in data]
+        # Calculate differences from hypothesized median; shifting the
+        # sorted sample keeps it sorted
+        data = np.asarray(data, dtype=float)
+        differences = data - hypothesized_median
+        sorted_data = rank_info_or_compute(data, rank_info).sorted_values(data)
         
-        # Validate assumptions
         warnings = []
+        extra = {
+            'sample_median': sorted_median(sorted_data),
+            'hypothesized_median': hypothesized_median
+        }
+        results = NonParametricTests._signed_rank(differences, test_name, alpha, warnings,
+                                                  'n_observations', extra,
+                                                  sorted_data - hypothesized_median)
         
-        if not validate_minimum_sample_size(differences, 6):
-            warnings.append("Small sample size. Consider exact p-values.")
-        
-        # Remove zero differences
-        non_zero_diffs = [d for d in differences if d != 0]
-        
-        if len(non_zero_diffs) < len(differences):
-            warnings.append(f"Removed {len(differences) - len(non_zero_diffs)} zero differences.")
+        return TestResult(results, warnings, {'differences': differences})
+    
+    @staticmethod  
+    def one_sample_wilcoxon_test(data: List[float], hypothesized_median: float = 0,
+                               alpha: float = 0.05,
+                               rank_info: Optional[RankInfo] = None) -> Dict[str, Any]:
+        """
+        One-Sample Wilcoxon Signed-Rank Test
         
-        if len(non_zero_diffs) == 0:
-            warnings.append("All differences are zero. Cannot perform test.")
+        Args:
+            data: Sample data
+            hypothesized_median: Hypothesized population median
+            alpha: Significance level
+            rank_info: Precomputed ranks of data
             
-        print_assumption_warnings(warnings)
-        
-        if len(non_zero_diffs) == 0:
-            return {
-                'test_name': test_name,
-                'error': "Cannot perform test - all differences are zero"
-            }
-        
-        # Perform test
-        try:
-            statistic, p_value = stats.wilcoxon(non_zero_diffs, alternative='two-sided')
-        except ValueError as e:
-            return {
-                'test_name': test_name,
-                'error': f"Test failed: {e}"
-            }
-        
-        # Calculate additional statistics
-        n = len(non_zero_diffs)
-        median_diff = np.median(differences)
-        sample_median = np.median(data)
+        Returns:
+            Dictionary with test results
+        """
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("One-Sample Wilcoxon Signed-Rank Test")
         
-        # Effect size (r = Z / sqrt(N))
-        if n > 10:
-            z_score = (statistic - n*(n+1)/4) / np.sqrt(n*(n+1)*(2*n+1)/24)
-            effect_size = abs(z_score) / np.sqrt(n)
-        else:
-            effect_size = None
+        results = NonParametricTests.compute_one_sample_wilcoxon_test(data, hypothesized_median, alpha,
+                                                                       rank_info)
         
-        results = {
-            'test_name': test_name,
-            'statistic': statistic,
-            'p_value': p_value,
-            'n_observations': n,
-            'sample_median': sample_median,
-            'hypothesized_median': hypothesized_median,
-            'median_difference': median_diff,
-            'interpretation': f"{'Reject' if p_value < alpha else 'Fail to reject'} H0 at α = {alpha}"
-        }
+        print_assumption_warnings(results.warnings)
         
-        if effect_size is not None:
-            results['effect_size'] = effect_size
+        if 'error' in results:
+            return results
         
         print_data_summary(data, "Sample")
-        print_data_summary(differences, "Differences from hypothesized median")
+        print_data_summary(results.details['differences'], "Differences from hypothesized median")
         print_test_results(results, hypotheses)
         
         return results
 
     @staticmethod
-    def mann_whitney_test(data1: List[float], data2: List[float], 
-                         alpha: float = 0.05) -> Dict[str, Any]:
+    @cached_result('mann_whitney_test')
+    def compute_mann_whitney_test(data1: List[float], data2: List[float],
+                                  alpha: float = 0.05,
+                                  rank_info1: Optional[RankInfo] = None,
+                                  rank_info2: Optional[RankInfo] = None) -> TestResult:
         """
-        Mann-Whitney U Test (also known as Wilcoxon Rank-Sum Test)
+        Mann-Whitney U Test (no I/O)
+        
+        The pooled ranks come from merging the two sorted samples, so
+        precomputed RankInfo for either sample saves its sort.
         
         Args:
             data1: First independent sample
             data2: Second independent sample
             alpha: Significance level
+            rank_info1: Precomputed ranks of data1
+            rank_info2: Precomputed ranks of data2
             
         Returns:
-            Dictionary with test results
+            TestResult with test results and assumption warnings
         """
         test_name = "Mann-Whitney U Test"
         
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("Mann-Whitney U Test")
-        
         # Validate assumptions
         warnings = []
         
         if not validate_minimum_sample_size(data1, 3) or not validate_minimum_sample_size(data2, 3):
             warnings.append("Very small sample sizes. Results may be unreliable.")
         
-        print_assumption_warnings(warnings)
+        sorted1 = rank_info_or_compute(data1, rank_info1).sorted_values(data1)
+        sorted2 = rank_info_or_compute(data2, rank_info2).sorted_values(data2)
+        n1, n2 = len(sorted1), len(sorted2)
         
-        # Perform test
-        try:
-            statistic, p_value = stats.mannwhitneyu(data1, data2, alternative='two-sided')
-        except ValueError as e:
-            return {
+        if n1 == 0 or n2 == 0:
+            return TestResult({
                 'test_name': test_name,
-                'error': f"Test failed: {e}"
-            }
+                'error': "Test failed: `x` and `y` must be of nonzero size."
+            }, warnings)
+        
+        (rank_sum1, _), tie_counts = pooled_rank_sums([sorted1, sorted2])
+        statistic = rank_sum1 - n1*(n1+1)/2
+        
+        # Perform test: exact null distribution for small samples without
+        # ties, otherwise the normal approximation with continuity and tie
+        # corrections
+        if len(tie_counts) == n1 + n2 and mann_whitney_exact_applies(n1, n2):
+            p_value = mann_whitney_exact_p(statistic, n1, n2)
+        else:
+            n = n1 + n2
+            u = max(statistic, n1*n2 - statistic)
+            std_u = np.sqrt(n1*n2/12 * ((n + 1) - tie_sum(tie_counts)/(n*(n-1))))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                z_score = (u - n1*n2/2 - 0.5) / std_u
+            p_value = np.clip(2 * stats.norm.sf(z_score), 0, 1)
         
         # Calculate additional statistics
-        n1, n2 = len(data1), len(data2)
-        median1, median2 = np.median(data1), np.median(data2)
+        median1, median2 = sorted_median(sorted1), sorted_median(sorted2)
         
         # Effect size (r = Z / sqrt(N))
         n_total = n1 + n2
@@ -270,6 +344,37 @@ class NonParametricTests:
             'interpretation': f"{'Reject' if p_value < alpha else 'Fail to reject'} H0 at α = {alpha}"
         }
         
+        return TestResult(results, warnings)
+    
+    @staticmethod
+    def mann_whitney_test(data1: List[float], data2: List[float], 
+                         alpha: float = 0.05,
+                         rank_info1: Optional[RankInfo] = None,
+                         rank_info2: Optional[RankInfo] = None) -> Dict[str, Any]:
+        """
+        Mann-Whitney U Test (also known as Wilcoxon Rank-Sum Test)
+        
+        Args:
+            data1: First independent sample
+            data2: Second independent sample
+            alpha: Significance level
+            rank_info1: Precomputed ranks of data1
+            rank_info2: Precomputed ranks of data2
+        
+        Returns:
+            Dictionary with test results
+        """
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Mann-Whitney U Test")
+        
+        results = NonParametricTests.compute_mann_whitney_test(data1, data2, alpha,
+                                                                rank_info1, rank_info2)
+        
+        print_assumption_warnings(results.warnings)
+        
+        if 'error' in results:
+            return results
+        
         print_data_summary(data1, "Sample 1")
         print_data_summary(data2, "Sample 2")
         print_test_results(results, hypotheses)
@@ -277,25 +382,26 @@ class NonParametricTests:
         return results
     
     @staticmethod
-    def kruskal_wallis_test(*groups: List[float], alpha: float = 0.05) -> Dict[str, Any]:
+    @cached_result('kruskal_wallis_test')
+    def compute_kruskal_wallis_test(*groups: List[float], alpha: float = 0.05,
+                                    rank_infos: Optional[List[Optional[RankInfo]]] = None) -> TestResult:
         """
-        Kruskal-Wallis H Test (non-parametric one-way ANOVA)
+        Kruskal-Wallis H Test (no I/O)
         
         Args:
             groups: Variable number of independent groups
             alpha: Significance level
+            rank_infos: Precomputed ranks of each group (entries may be None)
             
         Returns:
-            Dictionary with test results
+            TestResult with test results and assumption warnings; details
+            hold rank_summary (group sizes, rank sums and tie counts)
         """
         test_name = "Kruskal-Wallis H Test"
         
         if len(groups) < 2:
             raise ValueError("Kruskal-Wallis test requires at least 2 groups")
         
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("Kruskal-Wallis Test")
-        
         # Validate assumptions
         warnings = []
         
@@ -303,21 +409,31 @@ class NonParametricTests:
             if not validate_minimum_sample_size(group, 5):
                 warnings.append(f"Group {i} has small sample size.")
         
-        print_assumption_warnings(warnings)
+        # Merge the sorted groups into pooled ranks
+        if rank_infos is None:
+            rank_infos = [None] * len(groups)
+        sorted_groups = [rank_info_or_compute(group, info).sorted_values(group)
+                         for group, info in zip(groups, rank_infos)]
+        rank_sums, tie_counts = pooled_rank_sums(sorted_groups)
         
-        # Perform test
-        try:
-            statistic, p_value = stats.kruskal(*groups)
-        except ValueError as e:
-            return {
+        k = len(groups)  # number of groups
+        counts = np.array([len(group) for group in sorted_groups])
+        n_total = int(counts.sum())
+        
+        correction = tie_correction(tie_counts, n_total)
+        if correction == 0:
+            return TestResult({
                 'test_name': test_name,
-                'error': f"Test failed: {e}"
-            }
+                'error': "Test failed: All numbers are identical in kruskal"
+            }, warnings)
+        
+        # Perform test
+        statistic = (12.0 / (n_total * (n_total + 1)) * np.sum(rank_sums**2 / counts)
+                     - 3 * (n_total + 1)) / correction
+        p_value = stats.chi2.sf(statistic, k - 1)
         
         # Calculate additional statistics
-        k = len(groups)  # number of groups
-        n_total = sum(len(group) for group in groups)
-        group_medians = [np.median(group) for group in groups]
+        group_medians = [sorted_median(group) for group in sorted_groups]
         
         # Effect size (eta-squared approximation)
         eta_squared = (statistic - k + 1) / (n_total - k)
@@ -335,9 +451,140 @@ class NonParametricTests:
             'interpretation': f"{'Reject' if p_value < alpha else 'Fail to reject'} H0 at α = {alpha}"
         }
         
+        return TestResult(results, warnings, {'rank_summary': (counts, rank_sums, tie_counts)})
+    
+    @staticmethod
+    def kruskal_wallis_test(*groups: List[float], alpha: float = 0.05,
+                            rank_infos: Optional[List[Optional[RankInfo]]] = None) -> Dict[str, Any]:
+        """
+        Kruskal-Wallis H Test (non-parametric one-way ANOVA)
+        
+        Args:
+            groups: Variable number of independent groups
+            alpha: Significance level
+            rank_infos: Precomputed ranks of each group (entries may be None)
+        
+        Returns:
+            Dictionary with test results
+        """
+        if len(groups) < 2:
+            raise ValueError("Kruskal-Wallis test requires at least 2 groups")
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Kruskal-Wallis Test")
+        
+        results = NonParametricTests.compute_kruskal_wallis_test(*groups, alpha=alpha,
+                                                                  rank_infos=rank_infos)
+        
+        print_assumption_warnings(results.warnings)
+        
+        if 'error' in results:
+            return results
+        
         for i, group in enumerate(groups, 1):
             print_data_summary(group, f"Group {i}")
         
         print_test_results(results, hypotheses)
         
         return results
+
+    @staticmethod
+    @cached_result('kruskal_wallis_grouped')
+    def compute_kruskal_wallis_grouped(values: List[float], labels: List[Any],
+                                       alpha: float = 0.05) -> TestResult:
+        """
+        Kruskal-Wallis H Test on label-indexed data (no I/O)
+        
+        The pooled sample is ranked once; rank sums and group sizes then
+        come from bincount reductions instead of one Python list per group.
+        
+        Args:
+            values: Observations from all groups
+            labels: Group label of each observation (same length)
+            alpha: Significance level
+            
+        Returns:
+            TestResult with test results and assumption warnings; details
+            hold group_labels and rank_summary
+        """
+        test_name = "Kruskal-Wallis H Test"
+        
+        values = np.asarray(values, dtype=float).ravel()
+        codes, group_labels = encode_groups(labels)
+        if len(codes) != len(values):
+            raise ValueError("Values and labels must have equal length")
+        
+        k = len(group_labels)  # number of groups
+        if k < 2:
+            raise ValueError("Kruskal-Wallis test requires at least 2 groups")
+        
+        counts = np.bincount(codes, minlength=k)
+        
+        # Validate assumptions
+        warnings = [f"Group {label} has small sample size."
+                    for label, count in zip(group_labels, counts) if count < 5]
+        
+        # Rank the pooled sample once
+        _, ranks, tie_counts = sort_and_rank(values)
+        n_total = len(values)
+        rank_sums = np.bincount(codes, weights=ranks, minlength=k)
+        
+        correction = tie_correction(tie_counts, n_total)
+        if correction == 0:
+            return TestResult({
+                'test_name': test_name,
+                'error': "Test failed: All numbers are identical in kruskal"
+            }, warnings, {'group_labels': group_labels})
+        
+        statistic = (12.0 / (n_total * (n_total + 1)) * np.sum(rank_sums**2 / counts)
+                     - 3 * (n_total + 1)) / correction
+        p_value = stats.chi2.sf(statistic, k - 1)
+        
+        group_medians = list(grouped_medians(values, codes, counts))
+        
+        # Effect size (eta-squared approximation)
+        eta_squared = (statistic - k + 1) / (n_total - k)
+        eta_squared = max(0, eta_squared)  # Ensure non-negative
+        
+        results = {
+            'test_name': test_name,
+            'h_statistic': statistic,
+            'p_value': p_value,
+            'degrees_of_freedom': k - 1,
+            'n_groups': k,
+            'total_n': n_total,
+            'group_medians': group_medians,
+            'eta_squared': eta_squared,
+            'interpretation': f"{'Reject' if p_value < alpha else 'Fail to reject'} H0 at α = {alpha}"
+        }
+        
+        return TestResult(results, warnings, {'group_labels': group_labels,
+                                              'rank_summary': (counts, rank_sums, tie_counts)})
+    
+    @staticmethod
+    def kruskal_wallis_grouped(values: List[float], labels: List[Any],
+                               alpha: float = 0.05) -> Dict[str, Any]:
+        """
+        Kruskal-Wallis H Test on label-indexed data
+        
+        Args:
+            values: Observations from all groups
+            labels: Group label of each observation (same length)
+            alpha: Significance level
+            
+        Returns:
+            Dictionary with test results
+        """
+        results = NonParametricTests.compute_kruskal_wallis_grouped(values, labels, alpha)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Kruskal-Wallis Test")
+        
+        print_assumption_warnings(results.warnings)
+        
+        if 'error' in results:
+            return results
+        
+        print_test_results(results, hypotheses)
+        
+        return results
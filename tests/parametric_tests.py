@@ -5,68 +5,68 @@
 
 import numpy as np
 import scipy.stats as stats
-from typing import List, Dict, Any, Tuple
-from utils.validators import (validate_minimum_sample_size, validate_equal_sample_sizes,
-                            validate_normality_assumption, get_hypothesis_input)
-from utils.formatters import print_test_results, print_assumption_warnings, print_data_summary
+from typing import List, Dict, Any, Optional, Tuple
+from utils.validators import (validate_equal_sample_sizes, validate_normality_assumption,
+                            get_hypothesis_input)
+from utils.formatters import (print_test_results, print_assumption_warnings, print_data_summary,
+                            print_moments_summary)
+from utils.sufficient_stats import RunningMoments, moments_or_compute, grouped_moments
+from utils.results import TestResult
+from utils.result_cache import cached_result
 
 class ParametricTests:
-    """Class containing parametric statistical tests"""
+    """Class containing parametric statistical tests
+    
+    Each test has a compute_* method that takes data (or precomputed
+    moments) and returns a TestResult without any input() or print()
+    calls, and an interactive method of the original name that asks for
+    hypotheses and prints the results for the menu system.
+    """
     
     @staticmethod
-    def students_t_test(data: List[float], population_mean: float = 0.0, 
-                       alpha: float = 0.05) -> Dict[str, Any]:
+    @cached_result('students_t_test')
+    def compute_students_t_test(data: Optional[List[float]] = None, population_mean: float = 0.0,
+                                alpha: float = 0.05, moments: Optional[RunningMoments] = None) -> TestResult:
         """
-        One-sample Student's t-test
+        One-sample Student's t-test (no I/O)
         
         Args:
-            data: Sample data
+            data: Sample data (may be None when moments are given)
             population_mean: Hypothesized population mean
             alpha: Significance level
+            moments: Precomputed running moments of data (avoids rescanning it)
             
         Returns:
-            Dictionary with test results
+            TestResult with test results and assumption warnings
         """
-        print_test_results.__name__ = "One-Sample Student's t-test"
-        
-        # Get population mean if not provided
-        if population_mean == 0.0:
-            while True:
-                try:
-                    population_mean = float(input("Enter hypothesized population mean (default 0): ") or "0")
-                    break
-                except ValueError:
-                    print("Please enter a valid number.")
-        
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("One-Sample t-test")
+        data = np.asarray(data, dtype=float) if data is not None else None
+        moments = moments_or_compute(data, moments)
         
         # Validate assumptions
         warnings = []
         
-        if not validate_minimum_sample_size(data, 5):
+        if moments.count < 5:
             warnings.append("Very small sample size. Results may be unreliable.")
         
-        is_normal, norm_msg = validate_normality_assumption(data)
+        is_normal, norm_msg = validate_normality_assumption(data, moments=moments)
         if not is_normal:
             warnings.append(norm_msg)
         
-        print_assumption_warnings(warnings)
+        # Calculate statistics from the running moments
+        n = moments.count
+        sample_mean = np.float64(moments.mean)
+        sample_std = np.sqrt(np.float64(moments.variance))
+        se = sample_std / np.sqrt(n)
+        df = n - 1
         
         # Perform test
-        t_statistic, p_value = stats.ttest_1samp(data, population_mean)
-        
-        # Calculate additional statistics
-        n = len(data)
-        sample_mean = np.mean(data)
-        sample_std = np.std(data, ddof=1)
-        se = sample_std / np.sqrt(n)
+        t_statistic = (sample_mean - population_mean) / se
+        p_value = 2 * stats.t.sf(np.abs(t_statistic), df)
         
         # Cohen's d (effect size)
         cohens_d = (sample_mean - population_mean) / sample_std
         
         # Confidence interval for mean
-        df = n - 1
         t_critical = stats.t.ppf(1 - alpha/2, df)
         ci_lower = sample_mean - t_critical * se
         ci_upper = sample_mean + t_critical * se
@@ -83,63 +83,92 @@ class ParametricTests:
             'interpretation': f"{'Reject' if p_value < alpha else 'Fail to reject'} H0 at α = {alpha}"
         }
         
-        print_data_summary(data, "Sample")
+        return TestResult(results, warnings, {'moments': moments})
+    
+    @staticmethod
+    def students_t_test(data: Optional[List[float]] = None, population_mean: float = 0.0, 
+                       alpha: float = 0.05, moments: Optional[RunningMoments] = None) -> Dict[str, Any]:
+        """
+        One-sample Student's t-test
+        
+        Args:
+            data: Sample data (may be None when moments are given)
+            population_mean: Hypothesized population mean
+            alpha: Significance level
+            moments: Precomputed running moments of data (avoids rescanning it)
+        
+        Returns:
+            Dictionary with test results
+        """
+        print_test_results.__name__ = "One-Sample Student's t-test"
+        
+        results = ParametricTests.compute_students_t_test(data, population_mean, alpha, moments)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("One-Sample t-test")
+        
+        print_assumption_warnings(results.warnings)
+        print_moments_summary(results.details['moments'], "Sample")
         print_test_results(results, hypotheses)
         
         return results
     
     @staticmethod
-    def paired_t_test(data1: List[float], data2: List[float], 
-                     alpha: float = 0.05) -> Dict[str, Any]:
+    @cached_result('paired_t_test')
+    def compute_paired_t_test(data1: Optional[List[float]] = None, data2: Optional[List[float]] = None,
+                              alpha: float = 0.05,
+                              diff_moments: Optional[RunningMoments] = None) -> TestResult:
         """
-        Paired samples t-test
+        Paired samples t-test (no I/O)
         
         Args:
             data1: First sample (e.g., pre-treatment)
             data2: Second sample (e.g., post-treatment)
             alpha: Significance level
+            diff_moments: Precomputed moments of data2 - data1 (the samples
+                          may then be omitted)
             
         Returns:
-            Dictionary with test results
+            TestResult with test results and assumption warnings
         """
-        print_test_results.__name__ = "Paired Samples t-test"
+        differences = None
+        if diff_moments is None:
+            data1 = np.asarray(data1, dtype=float)
+            data2 = np.asarray(data2, dtype=float)
         
-        # Validate equal sample sizes
-        if not validate_equal_sample_sizes(data1, data2):
-            raise ValueError("Paired t-test requires equal sample sizes")
+            # Validate equal sample sizes
+            if not validate_equal_sample_sizes(data1, data2):
+                raise ValueError("Paired t-test requires equal sample sizes")
         
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("Paired t-test")
-        
-        # Calculate differences
-        differences = [x2 - x1 for x1, x2 in zip(data1, data2)]
+            # Calculate differences
+            differences = data2 - data1
+            diff_moments = RunningMoments.from_array(differences)
         
         # Validate assumptions
         warnings = []
         
-        if not validate_minimum_sample_size(differences, 5):
+        if diff_moments.count < 5:
             warnings.append("Very small sample size. Results may be unreliable.")
         
-        is_normal, norm_msg = validate_normality_assumption(differences)
+        is_normal, norm_msg = validate_normality_assumption(differences, moments=diff_moments)
         if not is_normal:
             warnings.append(norm_msg)
         
-        print_assumption_warnings(warnings)
-        
-        # Perform test
-        t_statistic, p_value = stats.ttest_rel(data1, data2)
-        
-        # Calculate additional statistics
-        n = len(differences)
-        mean_diff = np.mean(differences)
-        std_diff = np.std(differences, ddof=1)
+        # Calculate statistics from the moments of the differences
+        n = diff_moments.count
+        mean_diff = np.float64(diff_moments.mean)
+        std_diff = np.sqrt(np.float64(diff_moments.variance))
         se_diff = std_diff / np.sqrt(n)
+        df = n - 1
+        
+        # Perform test (sign follows scipy's ttest_rel(data1, data2))
+        t_statistic = -mean_diff / se_diff
+        p_value = 2 * stats.t.sf(np.abs(t_statistic), df)
         
         # Effect size (Cohen's d for paired samples)
         cohens_d = mean_diff / std_diff
         
         # Confidence interval for mean difference
-        df = n - 1
         t_critical = stats.t.ppf(1 - alpha/2, df)
         ci_lower = mean_diff - t_critical * se_diff
         ci_upper = mean_diff + t_critical * se_diff
@@ -155,41 +184,72 @@ class ParametricTests:
             'interpretation': f"{'Reject' if p_value < alpha else 'Fail to reject'} H0 at α = {alpha}"
         }
         
+        return TestResult(results, warnings, {'difference_moments': diff_moments})
+    
+    @staticmethod
+    def paired_t_test(data1: List[float], data2: List[float], 
+                     alpha: float = 0.05) -> Dict[str, Any]:
+        """
+        Paired samples t-test
+        
+        Args:
+            data1: First sample (e.g., pre-treatment)
+            data2: Second sample (e.g., post-treatment)
+            alpha: Significance level
+        
+        Returns:
+            Dictionary with test results
+        """
+        print_test_results.__name__ = "Paired Samples t-test"
+        
+        results = ParametricTests.compute_paired_t_test(data1, data2, alpha)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Paired t-test")
+        
+        print_assumption_warnings(results.warnings)
         print_data_summary(data1, "Sample 1")
         print_data_summary(data2, "Sample 2")
-        print_data_summary(differences, "Differences")
+        print_moments_summary(results.details['difference_moments'], "Differences")
         print_test_results(results, hypotheses)
         
         return results
     
     @staticmethod
-    def independent_t_test(data1: List[float], data2: List[float], 
-                          alpha: float = 0.05, equal_var: bool = True) -> Dict[str, Any]:
+    @cached_result('independent_t_test')
+    def compute_independent_t_test(data1: Optional[List[float]] = None, data2: Optional[List[float]] = None,
+                                   alpha: float = 0.05, equal_var: bool = True,
+                                   moments1: Optional[RunningMoments] = None,
+                                   moments2: Optional[RunningMoments] = None) -> TestResult:
         """
-        Independent samples t-test (unpaired two-sample t-test)
+        Independent samples t-test (no I/O)
         
         Args:
-            data1: First independent sample
-            data2: Second independent sample
+            data1: First independent sample (may be None when moments1 is given)
+            data2: Second independent sample (may be None when moments2 is given)
             alpha: Significance level
             equal_var: Whether to assume equal variances (None for automatic)
+            moments1: Precomputed running moments of data1
+            moments2: Precomputed running moments of data2
             
         Returns:
-            Dictionary with test results
+            TestResult with test results and assumption warnings
         """
         test_name = "Independent Samples t-test"
         
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("Independent samples t-test")
+        data1 = np.asarray(data1, dtype=float) if data1 is not None else None
+        data2 = np.asarray(data2, dtype=float) if data2 is not None else None
+        moments1 = moments_or_compute(data1, moments1)
+        moments2 = moments_or_compute(data2, moments2)
         
         # Validate assumptions
         warnings = []
         
-        if not validate_minimum_sample_size(data1, 5) or not validate_minimum_sample_size(data2, 5):
+        if moments1.count < 5 or moments2.count < 5:
             warnings.append("Small sample sizes. Results may be unreliable.")
         
-        is_normal1, norm_msg1 = validate_normality_assumption(data1)
-        is_normal2, norm_msg2 = validate_normality_assumption(data2)
+        is_normal1, norm_msg1 = validate_normality_assumption(data1, moments=moments1)
+        is_normal2, norm_msg2 = validate_normality_assumption(data2, moments=moments2)
         
         if not is_normal1:
             warnings.append(f"Sample 1: {norm_msg1}")
@@ -197,23 +257,21 @@ class ParametricTests:
             warnings.append(f"Sample 2: {norm_msg2}")
         
         # Test for equal variances automatically
-        # Levene's test for equal variances
-        _, levene_p = stats.levene(data1, data2)
-        auto_equal_var = levene_p > 0.05  # Assume equal if p > 0.05
-        
-        if not auto_equal_var:
-            warnings.append("Unequal variances detected. Using Welch's t-test.")
-            equal_var = False
-        
-        print_assumption_warnings(warnings)
+        # Levene's test for equal variances (median-centred, so it needs the raw data)
+        if data1 is not None and data2 is not None:
+            _, levene_p = stats.levene(data1, data2)
+            auto_equal_var = levene_p > 0.05  # Assume equal if p > 0.05
+            
+            if not auto_equal_var:
+                warnings.append("Unequal variances detected. Using Welch's t-test.")
+                equal_var = False
+        else:
+            warnings.append("Levene's test skipped (summary statistics only).")
         
-        # Perform test
-        t_statistic, p_value = stats.ttest_ind(data1, data2, equal_var=equal_var)
-        
-        # Calculate additional statistics
-        n1, n2 = len(data1), len(data2)
-        mean1, mean2 = np.mean(data1), np.mean(data2)
-        std1, std2 = np.std(data1, ddof=1), np.std(data2, ddof=1)
+        # Calculate statistics from the running moments
+        n1, n2 = moments1.count, moments2.count
+        mean1, mean2 = np.float64(moments1.mean), np.float64(moments2.mean)
+        std1, std2 = np.sqrt(np.float64(moments1.variance)), np.sqrt(np.float64(moments2.variance))
         
         # Pooled standard deviation (for equal variances)
         if equal_var:
@@ -237,9 +295,13 @@ class ParametricTests:
         else:
             cohens_d = 0
         
+        # Perform test
+        mean_diff = mean1 - mean2
+        t_statistic = mean_diff / se_diff
+        p_value = 2 * stats.t.sf(np.abs(t_statistic), df)
+        
         # Confidence interval for mean difference
         t_critical = stats.t.ppf(1 - alpha/2, df)
-        mean_diff = mean1 - mean2
         ci_lower = mean_diff - t_critical * se_diff
         ci_upper = mean_diff + t_critical * se_diff
         
@@ -260,60 +322,91 @@ class ParametricTests:
         if pooled_std is not None:
             results['pooled_std'] = pooled_std
         
-        print_data_summary(data1, "Sample 1")
-        print_data_summary(data2, "Sample 2")
+        return TestResult(results, warnings, {'moments': (moments1, moments2)})
+    
+    @staticmethod
+    def independent_t_test(data1: Optional[List[float]] = None, data2: Optional[List[float]] = None,
+                          alpha: float = 0.05, equal_var: bool = True,
+                          moments1: Optional[RunningMoments] = None,
+                          moments2: Optional[RunningMoments] = None) -> Dict[str, Any]:
+        """
+        Independent samples t-test (unpaired two-sample t-test)
+        
+        Args:
+            data1: First independent sample (may be None when moments1 is given)
+            data2: Second independent sample (may be None when moments2 is given)
+            alpha: Significance level
+            equal_var: Whether to assume equal variances (None for automatic)
+            moments1: Precomputed running moments of data1
+            moments2: Precomputed running moments of data2
+        
+        Returns:
+            Dictionary with test results
+        """
+        results = ParametricTests.compute_independent_t_test(data1, data2, alpha, equal_var,
+                                                             moments1, moments2)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Independent samples t-test")
+        
+        print_assumption_warnings(results.warnings)
+        moments1, moments2 = results.details['moments']
+        print_moments_summary(moments1, "Sample 1")
+        print_moments_summary(moments2, "Sample 2")
         print_test_results(results, hypotheses)
         
         return results
     
     @staticmethod
-    def f_test(data1: List[float], data2: List[float], 
-              alpha: float = 0.05) -> Dict[str, Any]:
+    @cached_result('f_test')
+    def compute_f_test(data1: Optional[List[float]] = None, data2: Optional[List[float]] = None,
+                       alpha: float = 0.05, moments1: Optional[RunningMoments] = None,
+                       moments2: Optional[RunningMoments] = None) -> TestResult:
         """
-        F-test for equality of variances
+        F-test for equality of variances (no I/O)
         
         Args:
-            data1: First sample
-            data2: Second sample
+            data1: First sample (may be None when moments1 is given)
+            data2: Second sample (may be None when moments2 is given)
             alpha: Significance level
+            moments1: Precomputed running moments of data1
+            moments2: Precomputed running moments of data2
             
         Returns:
-            Dictionary with test results
+            TestResult with test results and assumption warnings
         """
-        print_test_results.__name__ = "F-test for Equality of Variances"
-        
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("F-test for equality of variances")
+        data1 = np.asarray(data1, dtype=float) if data1 is not None else None
+        data2 = np.asarray(data2, dtype=float) if data2 is not None else None
+        moments1 = moments_or_compute(data1, moments1)
+        moments2 = moments_or_compute(data2, moments2)
         
         # Validate assumptions
         warnings = []
         
-        if not validate_minimum_sample_size(data1, 3) or not validate_minimum_sample_size(data2, 3):
+        if moments1.count < 3 or moments2.count < 3:
             warnings.append("Very small sample sizes. Results may be unreliable.")
         
-        is_normal1, norm_msg1 = validate_normality_assumption(data1)
-        is_normal2, norm_msg2 = validate_normality_assumption(data2)
+        is_normal1, norm_msg1 = validate_normality_assumption(data1, moments=moments1)
+        is_normal2, norm_msg2 = validate_normality_assumption(data2, moments=moments2)
         
         if not is_normal1:
             warnings.append(f"Sample 1: {norm_msg1}")
         if not is_normal2:
             warnings.append(f"Sample 2: {norm_msg2}")
         
-        print_assumption_warnings(warnings)
-        
         # Calculate variances
-        var1 = np.var(data1, ddof=1)
-        var2 = np.var(data2, ddof=1)
+        var1 = np.float64(moments1.variance)
+        var2 = np.float64(moments2.variance)
         
         # F-statistic (larger variance in numerator)
         if var1 >= var2:
             f_statistic = var1 / var2
-            df1 = len(data1) - 1
-            df2 = len(data2) - 1
+            df1 = moments1.count - 1
+            df2 = moments2.count - 1
         else:
             f_statistic = var2 / var1
-            df1 = len(data2) - 1
-            df2 = len(data1) - 1
+            df1 = moments2.count - 1
+            df2 = moments1.count - 1
         
         # Calculate p-value (two-tailed)
         p_value = 2 * (1 - stats.f.cdf(f_statistic, df1, df2))
@@ -342,63 +435,104 @@ class ParametricTests:
             'interpretation': f"{'Reject' if p_value < alpha else 'Fail to reject'} H0 at α = {alpha}"
         }
         
-        print_data_summary(data1, "Sample 1")
-        print_data_summary(data2, "Sample 2")
+        return TestResult(results, warnings, {'moments': (moments1, moments2)})
+    
+    @staticmethod
+    def f_test(data1: Optional[List[float]] = None, data2: Optional[List[float]] = None,
+              alpha: float = 0.05, moments1: Optional[RunningMoments] = None,
+              moments2: Optional[RunningMoments] = None) -> Dict[str, Any]:
+        """
+        F-test for equality of variances
+        
+        Args:
+            data1: First sample (may be None when moments1 is given)
+            data2: Second sample (may be None when moments2 is given)
+            alpha: Significance level
+            moments1: Precomputed running moments of data1
+            moments2: Precomputed running moments of data2
+        
+        Returns:
+            Dictionary with test results
+        """
+        print_test_results.__name__ = "F-test for Equality of Variances"
+        
+        results = ParametricTests.compute_f_test(data1, data2, alpha, moments1, moments2)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("F-test for equality of variances")
+        
+        print_assumption_warnings(results.warnings)
+        moments1, moments2 = results.details['moments']
+        print_moments_summary(moments1, "Sample 1")
+        print_moments_summary(moments2, "Sample 2")
         print_test_results(results, hypotheses)
         
         return results
     
     @staticmethod
-    def one_way_anova(*groups: List[float], alpha: float = 0.05) -> Dict[str, Any]:
+    @cached_result('one_way_anova')
+    def compute_one_way_anova(*groups: List[float], alpha: float = 0.05,
+                              group_moments: Optional[List[RunningMoments]] = None) -> TestResult:
         """
-        One-way ANOVA
+        One-way ANOVA (no I/O)
         
         Args:
-            groups: Variable number of group data
+            groups: Variable number of group data (may be omitted when
+                    group_moments is given)
             alpha: Significance level
+            group_moments: Precomputed running moments, one per group
             
         Returns:
-            Dictionary with test results
+            TestResult with test results and assumption warnings
         """
-        print_test_results.__name__ = "One-Way ANOVA"
+        if not groups and group_moments is not None:
+            groups = [None] * len(group_moments)
         
         if len(groups) < 2:
             raise ValueError("ANOVA requires at least 2 groups")
         
-        # Get hypotheses
-        hypotheses = get_hypothesis_input("One-way ANOVA")
+        groups = [np.asarray(group, dtype=float) if group is not None else None
+                  for group in groups]
+        if group_moments is None:
+            group_moments = [None] * len(groups)
+        elif len(group_moments) != len(groups):
+            raise ValueError("group_moments must have one entry per group")
+        group_moments = [moments_or_compute(group, moments)
+                         for group, moments in zip(groups, group_moments)]
         
         # Validate assumptions
         warnings = []
         
-        for i, group in enumerate(groups, 1):
-            if not validate_minimum_sample_size(group, 3):
+        for i, (group, moments) in enumerate(zip(groups, group_moments), 1):
+            if moments.count < 3:
                 warnings.append(f"Group {i} has very small sample size.")
             
-            is_normal, norm_msg = validate_normality_assumption(group)
+            is_normal, norm_msg = validate_normality_assumption(group, moments=moments)
             if not is_normal:
                 warnings.append(f"Group {i}: {norm_msg}")
         
-        print_assumption_warnings(warnings)
-        
-        # Perform ANOVA
-        f_statistic, p_value = stats.f_oneway(*groups)
-        
         # Calculate additional statistics
         k = len(groups)  # number of groups
-        n_total = sum(len(group) for group in groups)
+        counts = np.array([moments.count for moments in group_moments], dtype=float)
+        n_total = int(counts.sum())
         df_between = k - 1
         df_within = n_total - k
         
-        # Calculate group means and overall mean
-        group_means = [np.mean(group) for group in groups]
-        overall_mean = np.mean([x for group in groups for x in group])
+        # Group means and overall mean from the running moments
+        means = np.array([moments.mean for moments in group_moments])
+        group_means = list(means)
+        overall_mean = np.dot(counts, means) / n_total
         
-        # Calculate eta-squared (effect size)
-        ss_between = sum(len(group) * (mean - overall_mean)**2 
-                        for group, mean in zip(groups, group_means))
-        ss_total = sum((x - overall_mean)**2 for group in groups for x in group)
+        # Sums of squares: SS_within is the sum of the groups' M2 terms
+        ss_between = np.dot(counts, (means - overall_mean)**2)
+        ss_within = np.sum([moments.m2 for moments in group_moments])
+        ss_total = ss_between + ss_within
         
+        # Perform ANOVA
+        f_statistic = (ss_between / df_between) / (ss_within / df_within)
+        p_value = stats.f.sf(f_statistic, df_between, df_within)
+        
+        # Calculate eta-squared (effect size)
         eta_squared = ss_between / ss_total if ss_total > 0 else 0
         
         results = {
@@ -413,9 +547,197 @@ class ParametricTests:
             'interpretation': f"{'Reject' if p_value < alpha else 'Fail to reject'} H0 at α = {alpha}"
         }
         
-        for i, group in enumerate(groups, 1):
-            print_data_summary(group, f"Group {i}")
+        return TestResult(results, warnings, {'group_moments': group_moments})
+    
+    @staticmethod
+    def one_way_anova(*groups: List[float], alpha: float = 0.05,
+                      group_moments: Optional[List[RunningMoments]] = None) -> Dict[str, Any]:
+        """
+        One-way ANOVA
+        
+        Args:
+            groups: Variable number of group data (may be omitted when
+                    group_moments is given)
+            alpha: Significance level
+            group_moments: Precomputed running moments, one per group
+        
+        Returns:
+            Dictionary with test results
+        """
+        print_test_results.__name__ = "One-Way ANOVA"
+        
+        results = ParametricTests.compute_one_way_anova(*groups, alpha=alpha,
+                                                        group_moments=group_moments)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("One-way ANOVA")
+        
+        print_assumption_warnings(results.warnings)
+        for i, moments in enumerate(results.details['group_moments'], 1):
+            print_moments_summary(moments, f"Group {i}")
         
         print_test_results(results, hypotheses)
         
         return results
+    
+    @staticmethod
+    @cached_result('one_way_anova_grouped')
+    def compute_one_way_anova_grouped(values: List[float], labels: List[Any],
+                                      alpha: float = 0.05) -> TestResult:
+        """
+        One-way ANOVA on label-indexed data (no I/O)
+        
+        All group counts, means and sums of squares come from bincount
+        reductions over one value array, so hundreds of groups and tens of
+        millions of rows are handled in a few vectorized passes.
+        
+        Args:
+            values: Observations from all groups
+            labels: Group label of each observation (same length)
+            alpha: Significance level
+            
+        Returns:
+            TestResult with test results and assumption warnings; details
+            hold group_labels and group_moments
+        """
+        group_labels, group_moments = grouped_moments(values, labels)
+        results = ParametricTests.compute_one_way_anova(alpha=alpha, group_moments=group_moments)
+        results.details['group_labels'] = group_labels
+        return results
+    
+    @staticmethod
+    def one_way_anova_grouped(values: List[float], labels: List[Any],
+                              alpha: float = 0.05) -> Dict[str, Any]:
+        """
+        One-way ANOVA on label-indexed data
+        
+        Args:
+            values: Observations from all groups
+            labels: Group label of each observation (same length)
+            alpha: Significance level
+            
+        Returns:
+            Dictionary with test results
+        """
+        results = ParametricTests.compute_one_way_anova_grouped(values, labels, alpha)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("One-way ANOVA")
+        
+        print_assumption_warnings(results.warnings)
+        for label, moments in zip(results.details['group_labels'], results.details['group_moments']):
+            print_moments_summary(moments, f"Group {label}")
+        
+        print_test_results(results, hypotheses)
+        
+        return results
+    
+    # Entry points for pipelines that already aggregate each sample to
+    # (n, mean, variance); they share the raw-data code path above.
+    
+    @staticmethod
+    def compute_students_t_test_from_summary(n: int, mean: float, variance: float,
+                                             population_mean: float = 0.0,
+                                             alpha: float = 0.05) -> TestResult:
+        """
+        One-sample Student's t-test from summary statistics
+        
+        Args:
+            n: Sample size
+            mean: Sample mean
+            variance: Sample variance (ddof=1)
+            population_mean: Hypothesized population mean
+            alpha: Significance level
+            
+        Returns:
+            TestResult identical to compute_students_t_test on the raw sample
+        """
+        return ParametricTests.compute_students_t_test(
+            None, population_mean, alpha, moments=RunningMoments.from_summary(n, mean, variance))
+    
+    @staticmethod
+    def compute_paired_t_test_from_summary(n: int, mean_difference: float,
+                                           variance_difference: float,
+                                           alpha: float = 0.05) -> TestResult:
+        """
+        Paired samples t-test from summary statistics of the differences
+        
+        Args:
+            n: Number of pairs
+            mean_difference: Mean of data2 - data1
+            variance_difference: Sample variance (ddof=1) of data2 - data1
+            alpha: Significance level
+            
+        Returns:
+            TestResult identical to compute_paired_t_test on the raw pairs
+        """
+        return ParametricTests.compute_paired_t_test(
+            alpha=alpha, diff_moments=RunningMoments.from_summary(n, mean_difference, variance_difference))
+    
+    @staticmethod
+    def compute_independent_t_test_from_summary(n1: int, mean1: float, variance1: float,
+                                                n2: int, mean2: float, variance2: float,
+                                                alpha: float = 0.05,
+                                                equal_var: bool = True) -> TestResult:
+        """
+        Independent samples t-test from summary statistics
+        
+        Levene's test needs the raw values, so equal_var is taken as given;
+        results match the raw-data path whenever Levene's test would not
+        have switched it to Welch's t-test.
+        
+        Args:
+            n1, mean1, variance1: Size, mean and sample variance of sample 1
+            n2, mean2, variance2: Size, mean and sample variance of sample 2
+            alpha: Significance level
+            equal_var: Whether to assume equal variances
+            
+        Returns:
+            TestResult with test results and assumption warnings
+        """
+        return ParametricTests.compute_independent_t_test(
+            None, None, alpha, equal_var,
+            moments1=RunningMoments.from_summary(n1, mean1, variance1),
+            moments2=RunningMoments.from_summary(n2, mean2, variance2))
+    
+    @staticmethod
+    def compute_f_test_from_summary(n1: int, variance1: float, n2: int, variance2: float,
+                                    alpha: float = 0.05) -> TestResult:
+        """
+        F-test for equality of variances from summary statistics
+        
+        Args:
+            n1, variance1: Size and sample variance of sample 1
+            n2, variance2: Size and sample variance of sample 2
+            alpha: Significance level
+            
+        Returns:
+            TestResult identical to compute_f_test on the raw samples
+        """
+        return ParametricTests.compute_f_test(
+            None, None, alpha,
+            moments1=RunningMoments.from_summary(n1, 0.0, variance1),
+            moments2=RunningMoments.from_summary(n2, 0.0, variance2))
+    
+    @staticmethod
+    def compute_one_way_anova_from_summary(counts: List[int], means: List[float],
+                                           variances: List[float],
+                                           alpha: float = 0.05) -> TestResult:
+        """
+        One-way ANOVA from per-group summary statistics
+        
+        Args:
+            counts: Group sizes
+            means: Group means
+            variances: Group sample variances (ddof=1)
+            alpha: Significance level
+            
+        Returns:
+            TestResult identical to compute_one_way_anova on the raw groups
+        """
+        if not len(counts) == len(means) == len(variances):
+            raise ValueError("counts, means and variances must have the same length")
+        
+        group_moments = [RunningMoments.from_summary(n, mean, variance)
+                         for n, mean, variance in zip(counts, means, variances)]
+        return ParametricTests.compute_one_way_anova(alpha=alpha, group_moments=group_moments)
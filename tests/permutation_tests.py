@@ -0,0 +1,399 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+from utils.results import TestResult
+from utils.result_cache import cached_result
+from utils.ranking import RankInfo, rank_info_or_compute, sort_and_rank
+from utils.resampling import (DEFAULT_TOLERANCE, SeedLike, SequentialStopper, block_size_for,
+                              resample_blocks, seed_sequence, sequential_block_sizes)
+
+DEFAULT_PERMUTATIONS = 10_000
+
+# Relative tolerance when comparing permuted statistics with the observed
+# one, so that rounding in a different summation order is not counted as
+# a difference (as in scipy.stats.permutation_test)
+TOLERANCE = 100 * np.finfo(np.float64).eps
+
+def _permutation_block(rng: np.random.Generator, size: int, n: int) -> np.ndarray:
+    """size independent permutations of 0..n-1, one per row"""
+    return rng.permuted(np.broadcast_to(np.arange(n), (size, n)), axis=1)
+
+def _mean_difference(values: np.ndarray, n1: int, index: np.ndarray) -> np.ndarray:
+    """|mean of the first n1 - mean of the rest| for each row of indices"""
+    sums1 = values[index[..., :n1]].sum(axis=-1)
+    total = values.sum()
+    return np.abs(sums1 / n1 - (total - sums1) / (len(values) - n1))
+
+def _u_deviation(ranks: np.ndarray, n1: int, index: np.ndarray) -> np.ndarray:
+    """|U1 - n1*n2/2| for each row of indices"""
+    n2 = len(ranks) - n1
+    u1 = ranks[index[..., :n1]].sum(axis=-1) - n1 * (n1 + 1) / 2
+    return np.abs(u1 - n1 * n2 / 2)
+
+def _between_groups_ss(values: np.ndarray, sizes: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """Between-groups sum of squares when the rows of indices assign the groups in turn"""
+    starts = np.cumsum(sizes) - sizes
+    group_sums = np.add.reduceat(values[index], starts, axis=-1)
+    return np.sum(group_sums**2 / sizes, axis=-1) - values.sum()**2 / len(values)
+
+def _abs_correlation(z_x: np.ndarray, z_y: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """|Pearson correlation| of standardized x with standardized y reordered by each row"""
+    return np.abs(z_y[index] @ z_x) / len(z_x)
+
+_STATISTICS = {
+    'mean_difference': _mean_difference,
+    'u': _u_deviation,
+    'between_ss': _between_groups_ss,
+    'correlation': _abs_correlation,
+}
+
+def _count_extreme(shared: Tuple[str, Tuple[Any, ...], float], rng: np.random.Generator,
+                   size: int) -> int:
+    """Permuted statistics at least as extreme as the observed one in one block"""
+    name, arrays, observed = shared
+    index = _permutation_block(rng, size, len(arrays[0]))
+    permuted = _STATISTICS[name](*arrays, index)
+    return int(np.count_nonzero(permuted >= observed - TOLERANCE * abs(observed)))
+
+def _run_permutations(name: str, arrays: Tuple[Any, ...], n_permutations: int,
+                      seed: SeedLike, workers: Optional[int], alpha: float,
+                      sequential: bool = False, tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, Any]:
+    """
+    Observed statistic, exceedance count and p-value of a permutation test
+    
+    With sequential=True, n_permutations is an upper limit: the run stops
+    as soon as the decision at alpha is settled (see SequentialStopper).
+    Sequential runs use blocks that end on the stopper's looks (see
+    sequential_block_sizes) so they can stop after a few hundred
+    permutations; they are reproducible for any worker count but draw
+    different streams from a fixed-length run with the same seed.
+    """
+    if n_permutations < 1:
+        raise ValueError("At least one permutation is required")
+    n = len(arrays[0])
+    observed = float(_STATISTICS[name](*arrays, np.arange(n)))
+    
+    seed = seed_sequence(seed)
+    block_size = block_size_for(n)
+    stopper = None
+    if sequential:
+        block_size = sequential_block_sizes(n_permutations, block_size)
+        stopper = SequentialStopper(alpha, tolerance, n_permutations)
+    
+    n_extreme = n_used = 0
+    blocks = resample_blocks(_count_extreme, (name, arrays, observed), n_permutations,
+                             block_size, seed, workers, n)
+    for i, count in enumerate(blocks):
+        n_extreme += count
+        n_used += block_size[i] if sequential else min(block_size, n_permutations - n_used)
+        if stopper is not None and stopper.settled(n_extreme, n_used):
+            blocks.close()
+            break
+    
+    run = {
+        'observed': observed,
+        'n_extreme': n_extreme,
+        'n_permutations': n_used,
+        # The observed arrangement counts as one of the permutations
+        'p_value': (n_extreme + 1) / (n_used + 1),
+        'seed': seed.entropy,
+    }
+    if sequential:
+        run['error_tolerance'] = tolerance
+    return run
+
+class PermutationTests:
+    """
+    Permutation versions of the two-sample, ANOVA and correlation tests
+    
+    Each method compares the test's own statistic with its distribution
+    over random relabellings of the data. Permutations are drawn in
+    vectorized blocks spread over a process pool; every block has its own
+    SeedSequence-spawned stream, so a given seed reproduces the p-value
+    bit for bit with any number of workers.
+    
+    The compute_* methods are memoized by cached_result under their seed;
+    runs without a seed are stored under the fresh seed they report back,
+    so repeating a call never replays the same random draw.
+    """
+    
+    @staticmethod
+    def _results(test_name: str, statistic_name: str, statistic: float, run: Dict[str, Any],
+                 n_permutations: int, alpha: float, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Results dictionary shared by the permutation tests"""
+        results = {
+            'test_name': test_name,
+            statistic_name: statistic,
+            'p_value': run['p_value'],
+            **(extra or {}),
+            'n_permutations': run['n_permutations'],
+            'n_extreme': run['n_extreme'],
+            'seed': run['seed'],
+            'interpretation': f"{'Reject' if run['p_value'] < alpha else 'Fail to reject'} H0 at α = {alpha}"
+        }
+        if 'error_tolerance' in run:
+            results['max_permutations'] = n_permutations
+            results['error_tolerance'] = run['error_tolerance']
+            results['stopped_early'] = run['n_permutations'] < n_permutations
+        return results
+    
+    @staticmethod
+    @cached_result('permutation_mean_difference', seed_argument='seed',
+                   ignored_arguments=('workers',))
+    def compute_mean_difference_test(data1: List[float], data2: List[float],
+                                     n_permutations: int = DEFAULT_PERMUTATIONS, alpha: float = 0.05,
+                                     seed: SeedLike = None, workers: Optional[int] = None,
+                                     sequential: bool = False,
+                                     tolerance: float = DEFAULT_TOLERANCE) -> TestResult:
+        """
+        Permutation test on the difference in means of two independent samples
+        (the statistic of the independent samples t-test)
+        
+        Args:
+            data1: First independent sample
+            data2: Second independent sample
+            n_permutations: Number of random relabellings
+            alpha: Significance level
+            seed: Seed for reproducible results (reported back in 'seed')
+            workers: Worker processes (default: all CPUs for large runs)
+            sequential: Stop as soon as the decision at alpha is settled,
+                        treating n_permutations as an upper limit
+            tolerance: Allowed probability of a different decision than
+                       the full run (sequential mode)
+        
+        Returns:
+            TestResult with the two-sided permutation p-value
+        """
+        data1 = np.asarray(data1, dtype=float).ravel()
+        data2 = np.asarray(data2, dtype=float).ravel()
+        n1, n2 = len(data1), len(data2)
+        if n1 == 0 or n2 == 0:
+            raise ValueError("Both samples must be non-empty")
+        
+        warnings = []
+        if n1 < 5 or n2 < 5:
+            warnings.append("Small sample sizes. Few distinct permutations exist.")
+        
+        pooled = np.concatenate([data1, data2])
+        run = _run_permutations('mean_difference', (pooled, n1), n_permutations, seed, workers,
+                                alpha, sequential, tolerance)
+        
+        results = PermutationTests._results(
+            "Permutation Test (Difference in Means)", 'mean_difference',
+            np.mean(data1) - np.mean(data2), run, n_permutations, alpha,
+            {'n1': n1, 'n2': n2})
+        
+        return TestResult(results, warnings)
+    
+    @staticmethod
+    @cached_result('permutation_mann_whitney', seed_argument='seed',
+                   ignored_arguments=('workers',))
+    def compute_mann_whitney_test(data1: List[float], data2: List[float],
+                                  n_permutations: int = DEFAULT_PERMUTATIONS, alpha: float = 0.05,
+                                  seed: SeedLike = None, workers: Optional[int] = None,
+                                  sequential: bool = False,
+                                  tolerance: float = DEFAULT_TOLERANCE) -> TestResult:
+        """
+        Permutation test on the Mann-Whitney U statistic
+        
+        The pooled sample is ranked once (with average ranks for ties);
+        each permutation then only sums ranks.
+        
+        Args:
+            data1: First independent sample
+            data2: Second independent sample
+            n_permutations: Number of random relabellings
+            alpha: Significance level
+            seed: Seed for reproducible results (reported back in 'seed')
+            workers: Worker processes (default: all CPUs for large runs)
+            sequential: Stop as soon as the decision at alpha is settled,
+                        treating n_permutations as an upper limit
+            tolerance: Allowed probability of a different decision than
+                       the full run (sequential mode)
+        
+        Returns:
+            TestResult with the two-sided permutation p-value
+        """
+        data1 = np.asarray(data1, dtype=float).ravel()
+        data2 = np.asarray(data2, dtype=float).ravel()
+        n1, n2 = len(data1), len(data2)
+        if n1 == 0 or n2 == 0:
+            raise ValueError("Both samples must be non-empty")
+        
+        warnings = []
+        if n1 < 3 or n2 < 3:
+            warnings.append("Very small sample sizes. Few distinct permutations exist.")
+        
+        _, ranks, _ = sort_and_rank(np.concatenate([data1, data2]))
+        run = _run_permutations('u', (ranks, n1), n_permutations, seed, workers,
+                                alpha, sequential, tolerance)
+        
+        u_statistic = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+        results = PermutationTests._results(
+            "Permutation Test (Mann-Whitney U)", 'u_statistic', u_statistic,
+            run, n_permutations, alpha, {'n1': n1, 'n2': n2})
+        
+        return TestResult(results, warnings)
+    
+    @staticmethod
+    @cached_result('permutation_one_way_anova', seed_argument='seed',
+                   ignored_arguments=('workers',))
+    def compute_one_way_anova(*groups: List[float], n_permutations: int = DEFAULT_PERMUTATIONS,
+                              alpha: float = 0.05, seed: SeedLike = None,
+                              workers: Optional[int] = None, sequential: bool = False,
+                              tolerance: float = DEFAULT_TOLERANCE) -> TestResult:
+        """
+        Permutation test on the one-way ANOVA F statistic
+        
+        F is increasing in the between-groups sum of squares for fixed
+        data, so the permutations compare that sum of squares directly.
+        
+        Args:
+            groups: Variable number of independent groups
+            n_permutations: Number of random relabellings
+            alpha: Significance level
+            seed: Seed for reproducible results (reported back in 'seed')
+            workers: Worker processes (default: all CPUs for large runs)
+            sequential: Stop as soon as the decision at alpha is settled,
+                        treating n_permutations as an upper limit
+            tolerance: Allowed probability of a different decision than
+                       the full run (sequential mode)
+        
+        Returns:
+            TestResult with the permutation p-value of F
+        """
+        if len(groups) < 2:
+            raise ValueError("ANOVA requires at least 2 groups")
+        
+        groups = [np.asarray(group, dtype=float).ravel() for group in groups]
+        sizes = np.array([len(group) for group in groups])
+        if np.any(sizes == 0):
+            raise ValueError("All groups must be non-empty")
+        
+        k, n_total = len(groups), int(sizes.sum())
+        if n_total <= k:
+            raise ValueError("ANOVA requires more observations than groups")
+        
+        warnings = [f"Group {i} has small sample size."
+                    for i, size in enumerate(sizes, 1) if size < 3]
+        
+        pooled = np.concatenate(groups)
+        run = _run_permutations('between_ss', (pooled, sizes), n_permutations, seed, workers,
+                                alpha, sequential, tolerance)
+        
+        ss_between = run['observed']
+        ss_within = np.sum((pooled - pooled.mean())**2) - ss_between
+        f_statistic = (ss_between / (k - 1)) / (ss_within / (n_total - k))
+        
+        results = PermutationTests._results(
+            "Permutation Test (One-Way ANOVA F)", 'f_statistic', f_statistic,
+            run, n_permutations, alpha, {'n_groups': k, 'total_n': n_total})
+        
+        return TestResult(results, warnings)
+    
+    @staticmethod
+    @cached_result('permutation_spearman', seed_argument='seed',
+                   ignored_arguments=('workers',))
+    def compute_spearman_correlation(x_data: List[float], y_data: List[float],
+                                     n_permutations: int = DEFAULT_PERMUTATIONS, alpha: float = 0.05,
+                                     seed: SeedLike = None, workers: Optional[int] = None,
+                                     rank_info_x: Optional[RankInfo] = None,
+                                     rank_info_y: Optional[RankInfo] = None,
+                                     sequential: bool = False,
+                                     tolerance: float = DEFAULT_TOLERANCE) -> TestResult:
+        """
+        Permutation test on Spearman's rank correlation
+        
+        The ranks are standardized once, so each permuted rho is one dot
+        product (a matrix-vector product per block).
+        
+        Args:
+            x_data: X variable data
+            y_data: Y variable data
+            n_permutations: Number of random pairings
+            alpha: Significance level
+            seed: Seed for reproducible results (reported back in 'seed')
+            workers: Worker processes (default: all CPUs for large runs)
+            sequential: Stop as soon as the decision at alpha is settled,
+                        treating n_permutations as an upper limit
+            tolerance: Allowed probability of a different decision than
+                       the full run (sequential mode)
+            rank_info_x: Precomputed ranks of x_data
+            rank_info_y: Precomputed ranks of y_data
+        
+        Returns:
+            TestResult with the two-sided permutation p-value
+        """
+        if len(x_data) != len(y_data):
+            raise ValueError("X and Y must have the same length")
+        
+        ranks_x = rank_info_or_compute(x_data, rank_info_x).ranks
+        ranks_y = rank_info_or_compute(y_data, rank_info_y).ranks
+        if np.ptp(ranks_x) == 0 or np.ptp(ranks_y) == 0:
+            raise ValueError("Correlation is undefined for a constant variable")
+        
+        warnings = []
+        if len(ranks_x) < 10:
+            warnings.append("Small sample size. Few distinct permutations exist.")
+        
+        z_x = (ranks_x - ranks_x.mean()) / ranks_x.std()
+        z_y = (ranks_y - ranks_y.mean()) / ranks_y.std()
+        run = _run_permutations('correlation', (z_x, z_y), n_permutations, seed, workers,
+                                alpha, sequential, tolerance)
+        
+        results = PermutationTests._results(
+            "Permutation Test (Spearman's Rank Correlation)", 'correlation_coefficient',
+            np.corrcoef(ranks_x, ranks_y)[1, 0], run, n_permutations, alpha,
+            {'n_pairs': len(ranks_x)})
+        
+        return TestResult(results, warnings)
+    
+    @staticmethod
+    def mean_difference_test(data1: List[float], data2: List[float],
+                             n_permutations: int = DEFAULT_PERMUTATIONS, alpha: float = 0.05,
+                             seed: SeedLike = None, workers: Optional[int] = None,
+                             sequential: bool = False,
+                             tolerance: float = DEFAULT_TOLERANCE) -> TestResult:
+        """Permutation test on the difference in means (see compute_mean_difference_test)"""
+        return PermutationTests.compute_mean_difference_test(
+            data1, data2, n_permutations=n_permutations, alpha=alpha, seed=seed, workers=workers,
+            sequential=sequential, tolerance=tolerance)
+    
+    @staticmethod
+    def mann_whitney_test(data1: List[float], data2: List[float],
+                          n_permutations: int = DEFAULT_PERMUTATIONS, alpha: float = 0.05,
+                          seed: SeedLike = None, workers: Optional[int] = None,
+                          sequential: bool = False,
+                          tolerance: float = DEFAULT_TOLERANCE) -> TestResult:
+        """Permutation test on the Mann-Whitney U statistic (see compute_mann_whitney_test)"""
+        return PermutationTests.compute_mann_whitney_test(
+            data1, data2, n_permutations=n_permutations, alpha=alpha, seed=seed, workers=workers,
+            sequential=sequential, tolerance=tolerance)
+    
+    @staticmethod
+    def one_way_anova(*groups: List[float], n_permutations: int = DEFAULT_PERMUTATIONS,
+                      alpha: float = 0.05, seed: SeedLike = None,
+                      workers: Optional[int] = None, sequential: bool = False,
+                      tolerance: float = DEFAULT_TOLERANCE) -> TestResult:
+        """Permutation test on the one-way ANOVA F statistic (see compute_one_way_anova)"""
+        return PermutationTests.compute_one_way_anova(
+            *groups, n_permutations=n_permutations, alpha=alpha, seed=seed, workers=workers,
+            sequential=sequential, tolerance=tolerance)
+    
+    @staticmethod
+    def spearman_correlation(x_data: List[float], y_data: List[float],
+                             n_permutations: int = DEFAULT_PERMUTATIONS, alpha: float = 0.05,
+                             seed: SeedLike = None, workers: Optional[int] = None,
+                             rank_info_x: Optional[RankInfo] = None,
+                             rank_info_y: Optional[RankInfo] = None,
+                             sequential: bool = False,
+                             tolerance: float = DEFAULT_TOLERANCE) -> TestResult:
+        """Permutation test on Spearman's rank correlation (see compute_spearman_correlation)"""
+        return PermutationTests.compute_spearman_correlation(
+            x_data, y_data, n_permutations=n_permutations, alpha=alpha, seed=seed, workers=workers,
+            rank_info_x=rank_info_x, rank_info_y=rank_info_y, sequential=sequential,
+            tolerance=tolerance)
@@ -0,0 +1,445 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+"""
+Post-hoc Pairwise Comparisons Module
+All-pairs follow-ups to one-way ANOVA and the Kruskal-Wallis test
+"""
+
+import numpy as np
+import scipy.stats as stats
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from utils.validators import get_hypothesis_input
+from utils.formatters import (print_test_results, print_assumption_warnings,
+                            get_significance_stars, print_significance_legend)
+from utils.sufficient_stats import RunningMoments, moments_or_compute
+from utils.ranking import RankInfo, rank_info_or_compute, pooled_rank_sums, tie_sum
+from utils.multiple_testing import CORRECTION_NAMES, adjust_p_values
+from utils.studentized_range import studentized_range_sf, studentized_range_ppf
+from utils.results import TestResult
+from utils.result_cache import cached_result
+
+# Pairs listed by the interactive methods, smallest p-values first; the
+# full matrices are always in the result details
+MAX_PRINTED_PAIRS = 45
+
+def _pair_matrix(upper: np.ndarray, k: int, diagonal: Any, antisymmetric: bool = False) -> np.ndarray:
+    """k x k matrix from its upper-triangle values in np.triu_indices order"""
+    matrix = np.full((k, k), diagonal, dtype=upper.dtype)
+    i, j = np.triu_indices(k, 1)
+    matrix[i, j] = upper
+    matrix[j, i] = -upper if antisymmetric else upper
+    return matrix
+
+def _interval_matrices(differences: np.ndarray, half_widths: np.ndarray,
+                       k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Lower and upper confidence limit matrices for group i minus group j"""
+    lower = _pair_matrix(differences - half_widths, k, 0.0)
+    upper = _pair_matrix(differences + half_widths, k, 0.0)
+    i, j = np.triu_indices(k, 1)
+    lower[j, i], upper[j, i] = -upper[i, j], -lower[i, j]
+    return lower, upper
+
+def _group_labels(group_labels: Optional[Sequence[Any]], k: int) -> List[Any]:
+    """Group labels, defaulting to 1..k"""
+    if group_labels is None:
+        return list(range(1, k + 1))
+    if len(group_labels) != k:
+        raise ValueError("Need one label per group")
+    return list(group_labels)
+
+class PostHocTests:
+    """
+    Class containing all-pairs post-hoc comparisons
+    
+    Every comparison of the k groups is computed at once from per-group
+    summaries (RunningMoments for Tukey HSD and Games-Howell, pooled rank
+    sums for Dunn's test), so the k(k-1)/2 pairs cost a few broadcast array
+    operations rather than one test call each. The pairwise results are
+    k x k matrices in details['pairwise'], indexed like the groups.
+    """
+    
+    @staticmethod
+    def _moments(groups: Tuple[Optional[List[float]], ...],
+                 group_moments: Optional[List[RunningMoments]]) -> List[RunningMoments]:
+        """Running moments of every group, as in compute_one_way_anova"""
+        if not groups and group_moments is not None:
+            groups = [None] * len(group_moments)
+        if len(groups) < 2:
+            raise ValueError("Post-hoc comparisons require at least 2 groups")
+        if group_moments is None:
+            group_moments = [None] * len(groups)
+        elif len(group_moments) != len(groups):
+            raise ValueError("group_moments must have one entry per group")
+        return [moments_or_compute(None if group is None else np.asarray(group, dtype=float), moments)
+                for group, moments in zip(groups, group_moments)]
+    
+    @staticmethod
+    def _check_alpha(alpha: float):
+        """Reject significance levels outside (0, 1)"""
+        if not 0 < alpha < 1:
+            raise ValueError("Significance level must be between 0 and 1")
+    
+    @staticmethod
+    def _summary(test_name: str, k: int, reject: np.ndarray, alpha: float) -> Dict[str, Any]:
+        """Result entries shared by all post-hoc tests"""
+        n_comparisons = int(reject.size)
+        n_significant = int(np.count_nonzero(reject))
+        return {
+            'test_name': test_name,
+            'n_groups': k,
+            'n_comparisons': n_comparisons,
+            'n_significant': n_significant,
+            'interpretation': f"{n_significant} of {n_comparisons} pairs differ significantly at α = {alpha}"
+        }
+    
+    @staticmethod
+    @cached_result('tukey_hsd')
+    def compute_tukey_hsd(*groups: List[float], alpha: float = 0.05,
+                          group_moments: Optional[List[RunningMoments]] = None,
+                          group_labels: Optional[Sequence[Any]] = None) -> TestResult:
+        """
+        Tukey's HSD test, Tukey-Kramer for unequal group sizes (no I/O)
+        
+        Args:
+            groups: Variable number of group data (may be omitted when
+                    group_moments is given, e.g. from compute_one_way_anova)
+            alpha: Family-wise significance level
+            group_moments: Precomputed running moments, one per group
+            group_labels: Names of the groups (default 1..k)
+        
+        Returns:
+            TestResult with the pair counts; details hold the pairwise
+            matrices (mean differences, q statistics, p-values, reject
+            flags and simultaneous confidence limits)
+        """
+        test_name = "Tukey HSD"
+        PostHocTests._check_alpha(alpha)
+        group_moments = PostHocTests._moments(groups, group_moments)
+        
+        k = len(group_moments)  # number of groups
+        counts = np.array([moments.count for moments in group_moments], dtype=float)
+        means = np.array([moments.mean for moments in group_moments])
+        df = int(counts.sum()) - k
+        if df < 1:
+            raise ValueError("Tukey HSD requires more observations than groups")
+        
+        # Validate assumptions
+        warnings = []
+        
+        variances = np.array([moments.variance for moments in group_moments])
+        if np.nanmax(variances) > 4 * np.nanmin(variances):
+            warnings.append("Group variances differ by more than a factor of 4. Consider Games-Howell.")
+        
+        # Pooled within-group variance, as in one-way ANOVA
+        mse = np.sum([moments.m2 for moments in group_moments]) / df
+        
+        # All pairs at once
+        i, j = np.triu_indices(k, 1)
+        differences = means[i] - means[j]
+        se = np.sqrt(mse / 2 * (1 / counts[i] + 1 / counts[j]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            q_statistics = np.abs(differences) / se
+        p_values = studentized_range_sf(q_statistics, k, df)
+        q_critical = studentized_range_ppf(1 - alpha, k, df)
+        reject = p_values < alpha
+        ci_lower, ci_upper = _interval_matrices(differences, q_critical * se, k)
+        
+        results = PostHocTests._summary(test_name, k, reject, alpha)
+        results.update({
+            'degrees_of_freedom': df,
+            'critical_value': q_critical
+        })
+        
+        details = {
+            'group_moments': group_moments,
+            'pairwise': {
+                'groups': _group_labels(group_labels, k),
+                'mean_differences': _pair_matrix(differences, k, 0.0, antisymmetric=True),
+                'statistics': _pair_matrix(q_statistics, k, 0.0),
+                'p_values': _pair_matrix(p_values, k, 1.0),
+                'reject': _pair_matrix(reject, k, False),
+                'ci_lower': ci_lower,
+                'ci_upper': ci_upper
+            }
+        }
+        
+        return TestResult(results, warnings, details)
+    
+    @staticmethod
+    @cached_result('games_howell')
+    def compute_games_howell(*groups: List[float], alpha: float = 0.05,
+                             group_moments: Optional[List[RunningMoments]] = None,
+                             group_labels: Optional[Sequence[Any]] = None) -> TestResult:
+        """
+        Games-Howell test for unequal variances (no I/O)
+        
+        Each pair uses its own Welch standard error and Welch-Satterthwaite
+        degrees of freedom, referred to the studentized range distribution
+        for all k groups.
+        
+        Args:
+            groups: Variable number of group data (may be omitted when
+                    group_moments is given, e.g. from compute_one_way_anova)
+            alpha: Family-wise significance level
+            group_moments: Precomputed running moments, one per group
+            group_labels: Names of the groups (default 1..k)
+        
+        Returns:
+            TestResult with the pair counts; details hold the pairwise
+            matrices (mean differences, q statistics, degrees of freedom,
+            p-values and reject flags)
+        """
+        test_name = "Games-Howell Test"
+        PostHocTests._check_alpha(alpha)
+        group_moments = PostHocTests._moments(groups, group_moments)
+        
+        k = len(group_moments)  # number of groups
+        counts = np.array([moments.count for moments in group_moments], dtype=float)
+        if np.any(counts < 2):
+            raise ValueError("Games-Howell requires at least 2 observations per group")
+        means = np.array([moments.mean for moments in group_moments])
+        variances = np.array([moments.variance for moments in group_moments])
+        
+        # Validate assumptions
+        warnings = []
+        
+        for label, count in zip(_group_labels(group_labels, k), counts):
+            if count < 6:
+                warnings.append(f"Group {label} has small sample size. Games-Howell may be liberal.")
+        
+        # Welch standard error and degrees of freedom of every pair
+        i, j = np.triu_indices(k, 1)
+        differences = means[i] - means[j]
+        v_i, v_j = variances[i] / counts[i], variances[j] / counts[j]
+        se = np.sqrt(v_i + v_j)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df = (v_i + v_j)**2 / (v_i**2 / (counts[i] - 1) + v_j**2 / (counts[j] - 1))
+            q_statistics = np.sqrt(2) * np.abs(differences) / se
+        p_values = studentized_range_sf(q_statistics, k, df)
+        reject = p_values < alpha
+        
+        results = PostHocTests._summary(test_name, k, reject, alpha)
+        
+        details = {
+            'group_moments': group_moments,
+            'pairwise': {
+                'groups': _group_labels(group_labels, k),
+                'mean_differences': _pair_matrix(differences, k, 0.0, antisymmetric=True),
+                'statistics': _pair_matrix(q_statistics, k, 0.0),
+                'degrees_of_freedom': _pair_matrix(df, k, np.nan),
+                'p_values': _pair_matrix(p_values, k, 1.0),
+                'reject': _pair_matrix(reject, k, False)
+            }
+        }
+        
+        return TestResult(results, warnings, details)
+    
+    @staticmethod
+    @cached_result('dunn_test')
+    def compute_dunn_test(*groups: List[float], alpha: float = 0.05, p_adjust: Optional[str] = 'holm',
+                          rank_infos: Optional[List[Optional[RankInfo]]] = None,
+                          rank_summary: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+                          group_labels: Optional[Sequence[Any]] = None) -> TestResult:
+        """
+        Dunn's test of mean pooled ranks with tie correction (no I/O)
+        
+        Args:
+            groups: Variable number of independent groups (may be omitted
+                    when rank_summary is given)
+            alpha: Significance level for the adjusted p-values
+            p_adjust: 'bonferroni', 'holm', 'bh', 'by' or None for raw p-values
+            rank_infos: Precomputed ranks of each group (entries may be None)
+            rank_summary: (group_sizes, rank_sums, tie_counts) of the pooled
+                          ranking, as kept in the Kruskal-Wallis details
+            group_labels: Names of the groups (default 1..k)
+        
+        Returns:
+            TestResult with the pair counts; details hold the pairwise
+            matrices (mean rank differences, z statistics, raw and adjusted
+            p-values and reject flags)
+        """
+        test_name = "Dunn's Test"
+        PostHocTests._check_alpha(alpha)
+        
+        if p_adjust is not None and p_adjust not in CORRECTION_NAMES:
+            raise ValueError(f"Unknown correction method '{p_adjust}'")
+        
+        if rank_summary is None:
+            if len(groups) < 2:
+                raise ValueError("Post-hoc comparisons require at least 2 groups")
+            if rank_infos is None:
+                rank_infos = [None] * len(groups)
+            sorted_groups = [rank_info_or_compute(group, info).sorted_values(group)
+                             for group, info in zip(groups, rank_infos)]
+            rank_sums, tie_counts = pooled_rank_sums(sorted_groups)
+            counts = np.array([len(group) for group in sorted_groups], dtype=float)
+        else:
+            counts, rank_sums, tie_counts = (np.asarray(array) for array in rank_summary)
+            counts = counts.astype(float)
+            if len(counts) < 2:
+                raise ValueError("Post-hoc comparisons require at least 2 groups")
+        
+        k = len(counts)  # number of groups
+        n_total = counts.sum()
+        
+        # Validate assumptions
+        warnings = []
+        
+        for label, count in zip(_group_labels(group_labels, k), counts):
+            if count < 5:
+                warnings.append(f"Group {label} has small sample size.")
+        
+        # Variance of a mean rank, reduced for ties
+        rank_variance = n_total * (n_total + 1) / 12 - tie_sum(tie_counts) / (12 * (n_total - 1))
+        if rank_variance <= 0:
+            return TestResult({
+                'test_name': test_name,
+                'error': "Test failed: All numbers are identical"
+            }, warnings)
+        
+        mean_ranks = rank_sums / counts
+        i, j = np.triu_indices(k, 1)
+        differences = mean_ranks[i] - mean_ranks[j]
+        z_statistics = differences / np.sqrt(rank_variance * (1 / counts[i] + 1 / counts[j]))
+        raw_p_values = 2 * stats.norm.sf(np.abs(z_statistics))
+        p_values = raw_p_values if p_adjust is None else adjust_p_values(raw_p_values, p_adjust)
+        reject = p_values < alpha
+        
+        results = PostHocTests._summary(test_name, k, reject, alpha)
+        results['p_adjustment'] = CORRECTION_NAMES[p_adjust] if p_adjust is not None else "None"
+        
+        details = {
+            'mean_ranks': mean_ranks,
+            'pairwise': {
+                'groups': _group_labels(group_labels, k),
+                'mean_rank_differences': _pair_matrix(differences, k, 0.0, antisymmetric=True),
+                'statistics': _pair_matrix(z_statistics, k, 0.0, antisymmetric=True),
+                'unadjusted_p_values': _pair_matrix(raw_p_values, k, 1.0),
+                'p_values': _pair_matrix(p_values, k, 1.0),
+                'reject': _pair_matrix(reject, k, False)
+            }
+        }
+        
+        return TestResult(results, warnings, details)
+    
+    @staticmethod
+    def _print_pairs(results: TestResult, difference_key: str, difference_label: str,
+                     statistic_label: str):
+        """Print the pairwise table, most significant pairs first"""
+        pairwise = results.details['pairwise']
+        labels = pairwise['groups']
+        i, j = np.triu_indices(len(labels), 1)
+        p_values = pairwise['p_values'][i, j]
+        order = np.argsort(p_values, kind='stable')
+        
+        print(f"\n{results['test_name']} - Pairwise Comparisons:")
+        print("-" * 70)
+        print(f"{'Group A':<14} {'Group B':<14} {difference_label:<12} {statistic_label:<10} {'p-value':<10}")
+        print("-" * 70)
+        for index in order[:MAX_PRINTED_PAIRS]:
+            a, b = i[index], j[index]
+            p = p_values[index]
+            print(f"{str(labels[a]):<14} {str(labels[b]):<14} {pairwise[difference_key][a, b]:<12.4f} "
+                  f"{pairwise['statistics'][a, b]:<10.4f} {p:<10.4f} {get_significance_stars(p)}")
+        if len(order) > MAX_PRINTED_PAIRS:
+            print(f"... {len(order) - MAX_PRINTED_PAIRS} more pairs (see details['pairwise'])")
+        print("-" * 70)
+        print_significance_legend()
+    
+    @staticmethod
+    def tukey_hsd(*groups: List[float], alpha: float = 0.05,
+                  group_moments: Optional[List[RunningMoments]] = None,
+                  group_labels: Optional[Sequence[Any]] = None) -> Dict[str, Any]:
+        """
+        Tukey's HSD test, Tukey-Kramer for unequal group sizes
+        
+        Args:
+            groups: Variable number of group data (may be omitted when
+                    group_moments is given)
+            alpha: Family-wise significance level
+            group_moments: Precomputed running moments, one per group
+            group_labels: Names of the groups (default 1..k)
+        
+        Returns:
+            Dictionary with test results
+        """
+        results = PostHocTests.compute_tukey_hsd(*groups, alpha=alpha, group_moments=group_moments,
+                                                 group_labels=group_labels)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Tukey HSD")
+        
+        print_assumption_warnings(results.warnings)
+        PostHocTests._print_pairs(results, 'mean_differences', 'Difference', 'q')
+        print_test_results(results, hypotheses)
+        
+        return results
+    
+    @staticmethod
+    def games_howell(*groups: List[float], alpha: float = 0.05,
+                     group_moments: Optional[List[RunningMoments]] = None,
+                     group_labels: Optional[Sequence[Any]] = None) -> Dict[str, Any]:
+        """
+        Games-Howell test for unequal variances
+        
+        Args:
+            groups: Variable number of group data (may be omitted when
+                    group_moments is given)
+            alpha: Family-wise significance level
+            group_moments: Precomputed running moments, one per group
+            group_labels: Names of the groups (default 1..k)
+        
+        Returns:
+            Dictionary with test results
+        """
+        results = PostHocTests.compute_games_howell(*groups, alpha=alpha, group_moments=group_moments,
+                                                    group_labels=group_labels)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Games-Howell Test")
+        
+        print_assumption_warnings(results.warnings)
+        PostHocTests._print_pairs(results, 'mean_differences', 'Difference', 'q')
+        print_test_results(results, hypotheses)
+        
+        return results
+    
+    @staticmethod
+    def dunn_test(*groups: List[float], alpha: float = 0.05, p_adjust: Optional[str] = 'holm',
+                  rank_infos: Optional[List[Optional[RankInfo]]] = None,
+                  rank_summary: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+                  group_labels: Optional[Sequence[Any]] = None) -> Dict[str, Any]:
+        """
+        Dunn's test of mean pooled ranks
+        
+        Args:
+            groups: Variable number of independent groups (may be omitted
+                    when rank_summary is given)
+            alpha: Significance level for the adjusted p-values
+            p_adjust: 'bonferroni', 'holm', 'bh', 'by' or None for raw p-values
+            rank_infos: Precomputed ranks of each group (entries may be None)
+            rank_summary: (group_sizes, rank_sums, tie_counts) of the pooled ranking
+            group_labels: Names of the groups (default 1..k)
+        
+        Returns:
+            Dictionary with test results
+        """
+        results = PostHocTests.compute_dunn_test(*groups, alpha=alpha, p_adjust=p_adjust,
+                                                 rank_infos=rank_infos, rank_summary=rank_summary,
+                                                 group_labels=group_labels)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Dunn's Test")
+        
+        print_assumption_warnings(results.warnings)
+        
+        if 'error' in results:
+            return results
+        
+        PostHocTests._print_pairs(results, 'mean_rank_differences', 'Rank diff', 'z')
+        print_test_results(results, hypotheses)
+        
+        return results
@@ -5,18 +5,267 @@
 
 """
 Additional Regression Analysis Module
-This module is imported by correlation_tests.py and can be extended for more complex regression analyses
+Multiple linear regression; simple linear regression is in correlation_tests.py
 """
 
-# This file serves as a placeholder for future regression analysis extensions
-# The main regression functionality is in correlation_tests.py
-
 # Planned updates:
-# - Multiple regression analysis
 # - Polynomial regression
 # - Logistic regression
 # - Non-linear regression models
 # - Regression diagnostics
 # - Cross-validation techniques
 
-pass
+import numpy as np
+import scipy.stats as stats
+from typing import List, Dict, Any, Optional, Sequence
+from utils.validators import get_hypothesis_input
+from utils.formatters import (print_test_results, print_assumption_warnings,
+                            print_moments_summary, get_significance_stars,
+                            print_significance_legend)
+from utils.sufficient_stats import RegressionQR
+from utils.results import TestResult
+from utils.result_cache import cached_result
+
+# Rows factored per block, so the working copy of the design matrix stays
+# small however many rows there are
+CHUNK_ROWS = 1 << 16
+
+class RegressionTests:
+    """
+    Class containing multiple regression analyses
+    
+    Each analysis has a compute_* method that returns a TestResult without
+    any input() or print() calls, and an interactive method of the original
+    name that asks for hypotheses and prints the results.
+    """
+    
+    @staticmethod
+    def _factor_rows(x_data: Sequence[Sequence[float]], y_data: Sequence[float],
+                     intercept: bool) -> RegressionQR:
+        """Factor predictors and response block by block (TSQR)"""
+        y = np.asarray(y_data, dtype=float).ravel()
+        x = np.asarray(x_data, dtype=float) if isinstance(x_data, np.ndarray) else None
+        if x is not None and x.ndim == 2:
+            # Already a (rows x predictors) matrix
+            predictors = [x[:, j] for j in range(x.shape[1])]
+        else:
+            predictors = [np.asarray(column, dtype=float).ravel() for column in x_data]
+        
+        if len(predictors) == 0:
+            raise ValueError("At least one predictor is required")
+        if any(len(column) != len(y) for column in predictors):
+            raise ValueError("Every predictor must have the same length as the response")
+        if not np.all(np.isfinite(y)) or not all(np.all(np.isfinite(column)) for column in predictors):
+            raise ValueError("Data contains non-finite values")
+        
+        factor = RegressionQR(len(predictors), intercept)
+        for start in range(0, len(y), CHUNK_ROWS):
+            stop = start + CHUNK_ROWS
+            block = np.column_stack([column[start:stop] for column in predictors])
+            factor = factor.merge(RegressionQR.from_arrays(block, y[start:stop], intercept))
+        return factor
+    
+    @staticmethod
+    @cached_result('multiple_regression')
+    def compute_multiple_regression(x_data: Optional[Sequence[Sequence[float]]] = None,
+                                    y_data: Optional[List[float]] = None,
+                                    alpha: float = 0.05,
+                                    predictor_names: Optional[List[str]] = None,
+                                    intercept: bool = True,
+                                    regression_qr: Optional[RegressionQR] = None) -> TestResult:
+        """
+        Multiple Linear Regression with coefficient t-tests and overall F-test (no I/O)
+        
+        The design matrix is reduced block by block to the R factor of its
+        QR decomposition (TSQR), so neither X'X nor any n x n matrix is
+        formed. A RegressionQR built elsewhere in chunks (e.g. by
+        utils.loaders.stream_regression_qr) can be passed instead of the data.
+        
+        Args:
+            x_data: Predictor datasets (one sequence per predictor) or a
+                    (rows x predictors) array; may be None when regression_qr is given
+            y_data: Response variable; may be None when regression_qr is given
+            alpha: Significance level
+            predictor_names: Names of the predictors (default x1, x2, ...)
+            intercept: Whether to fit an intercept
+            regression_qr: Precomputed RegressionQR of (x, y)
+        
+        Returns:
+            TestResult with model fit statistics; details hold the
+            coefficient table, the ANOVA table and the factor
+        """
+        test_name = "Multiple Linear Regression"
+        
+        if regression_qr is None:
+            if x_data is None or y_data is None:
+                raise ValueError("Either data or a precomputed RegressionQR is required")
+            regression_qr = RegressionTests._factor_rows(x_data, y_data, intercept)
+        intercept = regression_qr.intercept
+        
+        n = regression_qr.count
+        n_coefficients = regression_qr.n_coefficients
+        n_predictors = n_coefficients - int(intercept)
+        if n_predictors < 1:
+            raise ValueError("At least one predictor is required")
+        if n <= n_coefficients:
+            raise ValueError(f"Need more than {n_coefficients} observations for "
+                             f"{n_coefficients} coefficients")
+        
+        if predictor_names is None:
+            predictor_names = [f"x{j}" for j in range(1, n_predictors + 1)]
+        elif len(predictor_names) != n_predictors:
+            raise ValueError("Need one name per predictor")
+        names = (['Intercept'] if intercept else []) + list(predictor_names)
+        
+        # Validate assumptions
+        warnings = []
+        
+        if n < 10 * n_predictors:
+            warnings.append("Fewer than 10 observations per predictor. Estimates may be unstable.")
+        
+        # Least-squares fit from the triangular factor
+        coefficients, xtx_inverse, ss_res = regression_qr.solve()
+        
+        # Sums of squares (uncentred total without an intercept)
+        if intercept:
+            ss_tot = regression_qr.y.m2
+        else:
+            ss_tot = regression_qr.y.m2 + n * regression_qr.y.mean ** 2
+        ss_reg = max(ss_tot - ss_res, 0.0)
+        
+        # Degrees of freedom
+        df_reg = n_predictors
+        df_res = n - n_coefficients
+        df_tot = n - 1 if intercept else n
+        
+        # Mean squares
+        ms_reg = ss_reg / df_reg
+        ms_res = ss_res / df_res
+        
+        # F-statistic for overall model
+        if ms_res > 0:
+            f_statistic = ms_reg / ms_res
+            f_p_value = stats.f.sf(f_statistic, df_reg, df_res)
+        else:
+            f_statistic = np.inf
+            f_p_value = 0.0
+            warnings.append("The model fits the data exactly (zero residual variance).")
+        
+        # R-squared and adjusted R-squared
+        r_squared = ss_reg / ss_tot if ss_tot > 0 else 0
+        adj_r_squared = 1 - (ms_res / (ss_tot / df_tot)) if ss_tot > 0 else 0
+        
+        # Standard error of regression
+        se_regression = np.sqrt(ms_res)
+        
+        # Coefficient standard errors, t-tests and confidence intervals
+        std_errors = np.sqrt(ms_res * np.diag(xtx_inverse))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_statistics = coefficients / std_errors
+        p_values = 2 * stats.t.sf(np.abs(t_statistics), df_res)
+        t_critical = stats.t.ppf(1 - alpha/2, df_res)
+        
+        results = {
+            'test_name': test_name,
+            'r_squared': r_squared,
+            'adjusted_r_squared': adj_r_squared,
+            'f_statistic': f_statistic,
+            'f_p_value': f_p_value,
+            'regression_std_error': se_regression,
+            'n_observations': n,
+            'n_predictors': n_predictors,
+            'degrees_of_freedom': df_res,
+            'interpretation': f"{'Reject' if f_p_value < alpha else 'Fail to reject'} H0 at α = {alpha}"
+        }
+        
+        details = {
+            'regression_qr': regression_qr,
+            'coefficients': {
+                'names': names,
+                'estimates': coefficients,
+                'std_errors': std_errors,
+                't_statistics': t_statistics,
+                'p_values': p_values,
+                'ci_lower': coefficients - t_critical * std_errors,
+                'ci_upper': coefficients + t_critical * std_errors
+            },
+            'covariance': ms_res * xtx_inverse,
+            'anova': {
+                'ss_reg': ss_reg, 'ss_res': ss_res, 'ss_tot': ss_tot,
+                'df_reg': df_reg, 'df_res': df_res, 'df_tot': df_tot,
+                'ms_reg': ms_reg, 'ms_res': ms_res
+            }
+        }
+        
+        return TestResult(results, warnings, details)
+    
+    @staticmethod
+    def multiple_regression(x_data: Optional[Sequence[Sequence[float]]] = None,
+                            y_data: Optional[List[float]] = None,
+                            alpha: float = 0.05,
+                            predictor_names: Optional[List[str]] = None,
+                            intercept: bool = True,
+                            regression_qr: Optional[RegressionQR] = None) -> Dict[str, Any]:
+        """
+        Multiple Linear Regression with coefficient t-tests and overall F-test
+        
+        Args:
+            x_data: Predictor datasets (one sequence per predictor) or a
+                    (rows x predictors) array; may be None when regression_qr is given
+            y_data: Response variable; may be None when regression_qr is given
+            alpha: Significance level
+            predictor_names: Names of the predictors (default x1, x2, ...)
+            intercept: Whether to fit an intercept
+            regression_qr: Precomputed RegressionQR of (x, y)
+        
+        Returns:
+            Dictionary with model fit statistics
+        """
+        results = RegressionTests.compute_multiple_regression(x_data, y_data, alpha, predictor_names,
+                                                              intercept, regression_qr)
+        
+        # Get hypotheses
+        hypotheses = get_hypothesis_input("Multiple Linear Regression")
+        
+        print_assumption_warnings(results.warnings)
+        
+        table = results.details['coefficients']
+        anova = results.details['anova']
+        ss_reg, ss_res, ss_tot = anova['ss_reg'], anova['ss_res'], anova['ss_tot']
+        df_reg, df_res, df_tot = anova['df_reg'], anova['df_res'], anova['df_tot']
+        ms_reg, ms_res = anova['ms_reg'], anova['ms_res']
+        f_statistic, f_p_value = results['f_statistic'], results['f_p_value']
+        
+        # Print comprehensive results
+        print("\nMultiple Linear Regression")
+        print("=" * 70)
+        print(f"R-squared: {results['r_squared']:.4f}")
+        print(f"Adjusted R-squared: {results['adjusted_r_squared']:.4f}")
+        print(f"Standard Error: {results['regression_std_error']:.4f}")
+        print(f"F-statistic: {f_statistic:.4f} (p = {f_p_value:.4f})")
+        
+        # Coefficient table
+        print("\nCoefficients:")
+        print("-" * 70)
+        print(f"{'Term':<14} {'Estimate':<12} {'Std Error':<12} {'t':<10} {'p-value':<10}")
+        print("-" * 70)
+        for name, estimate, se, t, p in zip(table['names'], table['estimates'], table['std_errors'],
+                                            table['t_statistics'], table['p_values']):
+            print(f"{name:<14} {estimate:<12.4f} {se:<12.4f} {t:<10.4f} {p:<10.4f} {get_significance_stars(p)}")
+        print("-" * 70)
+        print_significance_legend()
+        
+        # ANOVA table
+        print("\nANOVA Table:")
+        print("-" * 70)
+        print(f"{'Source':<12} {'SS':<12} {'df':<6} {'MS':<12} {'F':<10} {'p-value':<10}")
+        print("-" * 70)
+        print(f"{'Regression':<12} {ss_reg:<12.4f} {df_reg:<6} {ms_reg:<12.4f} {f_statistic:<10.4f} {f_p_value:<10.4f}")
+        print(f"{'Residual':<12} {ss_res:<12.4f} {df_res:<6} {ms_res:<12.4f}")
+        print(f"{'Total':<12} {ss_tot:<12.4f} {df_tot:<6}")
+        print("-" * 70)
+        
+        print_moments_summary(results.details['regression_qr'].y, "Y Variable (Response)")
+        print_test_results(results, hypotheses)
+        
+        return results
@@ -0,0 +1,132 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+import numpy as np
+from scipy import special
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from utils.resampling import (BLOCK_ELEMENTS, SeedLike, block_size_for, resample_blocks,
+                              seed_sequence)
+
+DEFAULT_RESAMPLES = 9999
+
+# statistic(*samples, *args) with every sample a 2-D array holding one
+# resample per row, returning one value per row
+Statistic = Callable[..., np.ndarray]
+
+def _bootstrap_block(shared: Tuple[Statistic, Tuple[np.ndarray, ...], Tuple[Any, ...]],
+                     rng: np.random.Generator, size: int) -> np.ndarray:
+    """Statistic over one block of resamples drawn with replacement within each sample"""
+    statistic, samples, args = shared
+    resampled = [sample[rng.integers(0, len(sample), size=(size, len(sample)))]
+                 for sample in samples]
+    return statistic(*resampled, *args)
+
+def _jackknife(statistic: Statistic, samples: Tuple[np.ndarray, ...],
+               args: Tuple[Any, ...]) -> List[np.ndarray]:
+    """Leave-one-out statistics for each sample, computed in bounded-size chunks"""
+    n_total = sum(len(sample) for sample in samples)
+    chunk = max(1, BLOCK_ELEMENTS // n_total)
+    values = []
+    for i, sample in enumerate(samples):
+        n = len(sample)
+        base = np.arange(n - 1)
+        sample_values = []
+        for start in range(0, n, chunk):
+            left_out = np.arange(start, min(start + chunk, n))[:, np.newaxis]
+            rows = len(left_out)
+            reduced = [sample[base + (base >= left_out)] if j == i
+                       else np.broadcast_to(other, (rows, len(other)))
+                       for j, other in enumerate(samples)]
+            sample_values.append(statistic(*reduced, *args))
+        values.append(np.concatenate(sample_values))
+    return values
+
+def _bca_levels(statistic: Statistic, samples: Tuple[np.ndarray, ...], args: Tuple[Any, ...],
+                observed: float, distribution: np.ndarray, alpha: float) -> Tuple[float, float]:
+    """Bias-corrected and accelerated quantile levels"""
+    z0 = special.ndtri(np.mean(distribution < observed))
+    
+    numerator = denominator = 0.0
+    for values in _jackknife(statistic, samples, args):
+        # Influence values (n - 1)(mean - theta_i) scaled by 1/n, which
+        # weights the samples as in Efron & Tibshirani (1993), eq. 15.36
+        deviations = (len(values) - 1) / len(values) * (values.mean() - values)
+        numerator += np.sum(deviations**3)
+        denominator += np.sum(deviations**2)
+    acceleration = numerator / (6 * denominator**1.5) if denominator > 0 else 0.0
+    
+    z = special.ndtri(np.array([alpha / 2, 1 - alpha / 2]))
+    levels = special.ndtr(z0 + (z0 + z) / (1 - acceleration * (z0 + z)))
+    return levels[0], levels[1]
+
+def bootstrap_ci(statistic: Statistic, samples: Sequence[Sequence[float]],
+                 args: Tuple[Any, ...] = (), n_resamples: int = DEFAULT_RESAMPLES,
+                 confidence_level: float = 0.95, method: str = 'bca',
+                 seed: SeedLike = None, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Bootstrap confidence interval of a vectorized statistic
+    
+    Each sample is resampled with replacement independently. Resample
+    indices are drawn a block at a time, so one block's (resamples x
+    observations) matrix stays below BLOCK_ELEMENTS entries, and the blocks
+    run over a process pool with SeedSequence-spawned streams (see
+    resample_blocks), which makes the interval reproducible for any number
+    of workers.
+    
+    Args:
+        statistic: Module-level function of 2-D resample matrices (one row
+                   per resample) returning one value per row
+        samples: The observed samples
+        args: Extra arguments passed to the statistic
+        n_resamples: Number of bootstrap resamples
+        confidence_level: Coverage of the interval
+        method: 'percentile' or 'bca' (bias-corrected and accelerated)
+        seed: Seed for reproducible results
+        workers: Worker processes (default: all CPUs for large runs)
+    
+    Returns:
+        Dictionary with statistic, ci_lower, ci_upper, standard_error,
+        n_resamples, method and seed
+    """
+    if method not in ('percentile', 'bca'):
+        raise ValueError("Method must be 'percentile' or 'bca'")
+    if not 0 < confidence_level < 1:
+        raise ValueError("Confidence level must be between 0 and 1")
+    
+    samples = tuple(np.asarray(sample, dtype=float).ravel() for sample in samples)
+    if any(len(sample) < 2 for sample in samples):
+        raise ValueError("Each sample needs at least 2 observations to bootstrap")
+    
+    observed = float(statistic(*[sample[np.newaxis, :] for sample in samples], *args)[0])
+    
+    seed = seed_sequence(seed)
+    n_observations = sum(len(sample) for sample in samples)
+    distribution = np.concatenate(list(resample_blocks(
+        _bootstrap_block, (statistic, samples, args), n_resamples,
+        block_size_for(n_observations), seed, workers, n_observations)))
+    distribution = distribution[np.isfinite(distribution)]
+    
+    alpha = 1 - confidence_level
+    if len(distribution) == 0:
+        low, high = np.nan, np.nan
+    elif method == 'bca':
+        low, high = _bca_levels(statistic, samples, args, observed, distribution, alpha)
+    else:
+        low, high = alpha / 2, 1 - alpha / 2
+    
+    if np.isnan(low) or np.isnan(high):
+        ci_lower = ci_upper = np.nan
+    else:
+        ci_lower, ci_upper = np.quantile(distribution, [low, high])
+    
+    return {
+        'statistic': observed,
+        'ci_lower': ci_lower,
+        'ci_upper': ci_upper,
+        'standard_error': np.std(distribution, ddof=1) if len(distribution) > 1 else np.nan,
+        'n_resamples': len(distribution),
+        'method': method,
+        'seed': seed.entropy,
+    }
@@ -0,0 +1,180 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+import numpy as np
+import scipy.stats as stats
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+from utils.ranking import RankInfo, rank_info_or_compute
+
+ArrayLike = Union[np.ndarray, Sequence[float]]
+
+# Variables per side of a tile: one tile of each output matrix is
+# 2048 x 2048 float64 (32 MB), however many variables there are
+DEFAULT_TILE_SIZE = 2048
+
+def standardized_columns(datasets: Sequence[ArrayLike], method: str = 'pearson',
+                         rank_infos: Optional[Sequence[Optional[RankInfo]]] = None) -> np.ndarray:
+    """
+    (n x m) matrix of centred, unit-norm columns, one per dataset
+    
+    Spearman columns are the ranks (from the RankInfo when given, so every
+    dataset is ranked at most once). With unit-norm columns the correlation
+    matrix is just Z'Z. Constant columns have no defined correlation and
+    come back as NaN.
+    
+    Args:
+        datasets: m equal-length samples
+        method: 'pearson' or 'spearman'
+        rank_infos: Precomputed ranks of each dataset (entries may be None)
+    
+    Returns:
+        Standardized data matrix
+    """
+    if method not in ('pearson', 'spearman'):
+        raise ValueError("method must be 'pearson' or 'spearman'")
+    if len(datasets) < 2:
+        raise ValueError("A correlation matrix needs at least 2 datasets")
+    n = len(datasets[0])
+    if any(len(data) != n for data in datasets):
+        raise ValueError("All datasets must have the same length")
+    if rank_infos is None:
+        rank_infos = [None] * len(datasets)
+    
+    z = np.empty((n, len(datasets)))
+    for column, (data, rank_info) in enumerate(zip(datasets, rank_infos)):
+        if method == 'spearman':
+            z[:, column] = rank_info_or_compute(data, rank_info).ranks
+        else:
+            z[:, column] = data
+    if not np.all(np.isfinite(z)):
+        raise ValueError("Data contains non-finite values")
+    
+    z -= z.mean(axis=0)
+    norms = np.sqrt(np.einsum('ij,ij->j', z, z))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z /= np.where(norms > 0, norms, np.nan)
+    return z
+
+def correlation_p_values(r: np.ndarray, n: int) -> np.ndarray:
+    """Two-sided p-values of the t test of zero correlation, elementwise"""
+    dof = n - 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_statistic = r * np.sqrt((dof / ((r + 1.0) * (1.0 - r))).clip(0))
+    return 2 * stats.t.sf(np.abs(t_statistic), dof)
+
+def fisher_z_interval(r: np.ndarray, n: int, alpha: float = 0.05) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fisher z-transformation confidence limits, elementwise
+    
+    As in the single Spearman test, |r| >= 0.999 gives no interval (NaN).
+    """
+    z_critical = stats.norm.ppf(1 - alpha/2)
+    half_width = z_critical / np.sqrt(n - 3)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_r = np.arctanh(np.where(np.abs(r) < 0.999, r, np.nan))
+    return np.tanh(z_r - half_width), np.tanh(z_r + half_width)
+
+def iter_correlation_tiles(z: np.ndarray, tile_size: int = DEFAULT_TILE_SIZE
+                           ) -> Iterator[Tuple[slice, slice, np.ndarray]]:
+    """
+    Correlation matrix of standardized columns, one tile at a time
+    
+    Yields the tiles on and above the diagonal; each is one BLAS matrix
+    product of two column blocks, so memory stays at the data plus one
+    tile however many variables there are. The lower triangle is the
+    transpose.
+    
+    Args:
+        z: Standardized data from standardized_columns
+        tile_size: Variables per side of a tile
+    
+    Yields:
+        (rows, cols, r) with r the correlations of columns rows x cols
+    """
+    m = z.shape[1]
+    for row_start in range(0, m, tile_size):
+        rows = slice(row_start, min(row_start + tile_size, m))
+        left = z[:, rows]
+        for col_start in range(row_start, m, tile_size):
+            cols = slice(col_start, min(col_start + tile_size, m))
+            r = np.clip(left.T @ z[:, cols], -1.0, 1.0)
+            if row_start == col_start:
+                np.fill_diagonal(r, np.where(np.isnan(np.diag(r)), np.nan, 1.0))
+            yield rows, cols, r
+
+def correlation_matrix(datasets: Sequence[ArrayLike], method: str = 'pearson', alpha: float = 0.05,
+                       rank_infos: Optional[Sequence[Optional[RankInfo]]] = None,
+                       tile_size: int = DEFAULT_TILE_SIZE,
+                       out: Optional[Sequence[np.ndarray]] = None) -> List[np.ndarray]:
+    """
+    All-pairs correlations with p-values and Fisher z confidence limits
+    
+    Only the data and one tile are held in working memory; for very many
+    variables the four outputs can be disk-backed arrays passed as out
+    (e.g. from np.lib.format.open_memmap).
+    
+    Args:
+        datasets: m equal-length samples
+        method: 'pearson' or 'spearman'
+        alpha: Significance level of the confidence limits
+        rank_infos: Precomputed ranks of each dataset (entries may be None)
+        tile_size: Variables per side of a tile
+        out: Four preallocated m x m float arrays to fill
+    
+    Returns:
+        [r, p_values, ci_lower, ci_upper], each m x m
+    """
+    z = standardized_columns(datasets, method, rank_infos)
+    n, m = z.shape
+    if n < 4:
+        raise ValueError("A correlation matrix needs at least 4 observations")
+    
+    if out is None:
+        matrices = [np.empty((m, m)) for _ in range(4)]
+    elif len(out) != 4 or any(np.shape(matrix) != (m, m) for matrix in out):
+        raise ValueError(f"out must be four {m} x {m} arrays")
+    else:
+        matrices = list(out)
+    for rows, cols, r in iter_correlation_tiles(z, tile_size):
+        tiles = (r, correlation_p_values(r, n), *fisher_z_interval(r, n, alpha))
+        for matrix, tile in zip(matrices, tiles):
+            matrix[rows, cols] = tile
+            matrix[cols, rows] = tile.T
+    return matrices
+
+def strongest_pairs(r: np.ndarray, count: int, tile_size: int = DEFAULT_TILE_SIZE) -> List[Tuple[int, int]]:
+    """
+    The count pairs i < j with the largest |r|, strongest first
+    
+    Scans the upper triangle one block of rows at a time, so no m x m
+    temporary is created.
+    
+    Args:
+        r: Correlation matrix
+        count: Number of pairs to return
+        tile_size: Rows scanned per block
+    
+    Returns:
+        List of (i, j) index pairs
+    """
+    m = r.shape[0]
+    best_values = np.empty(0)
+    best_pairs = np.empty((0, 2), dtype=np.intp)
+    for row_start in range(0, m - 1, tile_size):
+        rows = np.arange(row_start, min(row_start + tile_size, m - 1))
+        block = np.abs(r[rows])
+        block[np.arange(m) <= rows[:, np.newaxis]] = -np.inf
+        block[np.isnan(block)] = -np.inf
+        flat = block.ravel()
+        keep = min(count, flat.size)
+        top = np.argpartition(flat, flat.size - keep)[flat.size - keep:]
+        top = top[np.isfinite(flat[top])]
+        best_values = np.concatenate([best_values, flat[top]])
+        best_pairs = np.concatenate([best_pairs, np.column_stack([rows[top // m], top % m])])
+        if len(best_values) > count:
+            order = np.argsort(-best_values, kind='stable')[:count]
+            best_values, best_pairs = best_values[order], best_pairs[order]
+    order = np.argsort(-best_values, kind='stable')
+    return [(int(i), int(j)) for i, j in best_pairs[order]]
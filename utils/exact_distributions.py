@@ -0,0 +1,153 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple, Union
+import numpy as np
+
+# Samples up to this size get exact p-values (Wilcoxon: non-zero
+# differences; Mann-Whitney: the larger sample)
+EXACT_MAX_N = 50
+
+# Mann-Whitney is also exact whenever the smaller sample is at most this
+# size, as in scipy's default method
+EXACT_MAX_SMALLER_N = 8
+
+# ... but only while its table (n1*n2/2 float64 values) stays small; at
+# most 4 MB each, and MANN_WHITNEY_CACHE_SIZE of them are kept
+EXACT_MAX_CELLS = 1_000_000
+MANN_WHITNEY_CACHE_SIZE = 32
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+@lru_cache(maxsize=MANN_WHITNEY_CACHE_SIZE)
+def _mann_whitney_cdf(m: int, n: int) -> np.ndarray:
+    """Lower half of the U null CDF for sample sizes m <= n"""
+    size = m * n // 2 + 1
+    pmf = np.zeros(size)
+    pmf[0] = 1.0
+    
+    for i in range(1, m + 1):
+        # Divide by (1 - q^i): a running sum with stride i
+        padded = np.zeros(-(-size // i) * i)
+        padded[:size] = pmf
+        pmf = padded.reshape(-1, i).cumsum(axis=0).ravel()[:size]
+        
+        # Multiply by (1 - q^(n+i))
+        shift = n + i
+        if shift < size:
+            pmf[shift:] -= pmf[:size - shift].copy()
+        
+        # Coefficients of [n+i choose i]_q divided by C(n+i, i)
+        pmf *= i / (n + i)
+    
+    cdf = np.cumsum(pmf)
+    cdf.setflags(write=False)
+    return cdf
+
+def mann_whitney_exact_applies(n1: int, n2: int) -> bool:
+    """Whether untied samples of these sizes get an exact Mann-Whitney p-value"""
+    return ((min(n1, n2) <= EXACT_MAX_SMALLER_N or max(n1, n2) <= EXACT_MAX_N)
+            and n1 * n2 <= EXACT_MAX_CELLS)
+
+def mann_whitney_cdf(n1: int, n2: int) -> np.ndarray:
+    """
+    Exact null CDF of the Mann-Whitney U statistic (no ties)
+    
+    The number of orderings with U = u is the coefficient of q^u in the
+    Gaussian binomial [n1+n2 choose n1]_q = prod_i (1 - q^(n2+i)) / (1 - q^i),
+    built one factor at a time. Tables are memoized by (n1, n2) and, the
+    distribution being symmetric, only cover u <= n1*n2/2.
+    
+    Args:
+        n1: First sample size
+        n2: Second sample size
+    
+    Returns:
+        Read-only array F with F[u] = P(U <= u) for u = 0 .. n1*n2 // 2
+    """
+    return _mann_whitney_cdf(min(n1, n2), max(n1, n2))
+
+def mann_whitney_exact_p(u_statistic: ArrayLike, n1: int, n2: int) -> Union[float, np.ndarray]:
+    """
+    Two-sided exact p-values of Mann-Whitney U statistics
+    
+    Vectorized over u_statistic, so any number of comparisons with the
+    same sample sizes share one table.
+    
+    Args:
+        u_statistic: U of either sample (U1 or U2), scalar or array
+        n1: First sample size
+        n2: Second sample size
+    
+    Returns:
+        p-value(s) with the shape of u_statistic
+    """
+    u = np.asarray(u_statistic, dtype=np.float64)
+    lower = np.minimum(u, n1 * n2 - u)
+    cdf = mann_whitney_cdf(n1, n2)
+    return np.minimum(2 * cdf[np.rint(lower).astype(np.intp)], 1.0)[()]
+
+@lru_cache(maxsize=128)
+def _signed_rank_cdf(weights: Tuple[int, ...]) -> np.ndarray:
+    """Lower half of the null CDF of a random-sign sum of integer weights"""
+    size = sum(weights) // 2 + 1
+    pmf = np.zeros(size)
+    pmf[0] = 1.0
+    
+    for w in weights:
+        if w < size:
+            pmf[w:] += pmf[:size - w].copy()
+        pmf *= 0.5
+    
+    cdf = np.cumsum(pmf)
+    cdf.setflags(write=False)
+    return cdf
+
+def _doubled_ranks(n: int, tie_counts: Optional[np.ndarray]) -> Tuple[int, ...]:
+    """Twice the (average) ranks 1..n, so that tied ranks stay integral"""
+    if tie_counts is None or len(tie_counts) == n:
+        return tuple(range(2, 2 * n + 1, 2))
+    starts = np.cumsum(tie_counts) - tie_counts
+    return tuple(np.repeat(2 * starts + tie_counts + 1, tie_counts).tolist())
+
+def wilcoxon_cdf(n: int, tie_counts: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Exact null CDF of twice the Wilcoxon signed-rank sum
+    
+    Each rank enters the sum with probability 1/2, so the distribution is
+    built by one shifted add per rank. With ties the midranks are used,
+    which gives the same distribution as enumerating every sign flip (the
+    permutation test). Tables are memoized by n (or by the tie pattern).
+    
+    Args:
+        n: Number of non-zero differences
+        tie_counts: Tie runs of the sorted |differences| (None if untied)
+    
+    Returns:
+        Read-only array F with F[s] = P(2 * R+ <= s) for s = 0 .. n(n+1) // 2
+    """
+    return _signed_rank_cdf(_doubled_ranks(n, tie_counts))
+
+def wilcoxon_exact_p(r_plus: ArrayLike, n: int,
+                     tie_counts: Optional[np.ndarray] = None) -> Union[float, np.ndarray]:
+    """
+    Two-sided exact p-values of Wilcoxon signed-rank sums
+    
+    Vectorized over r_plus, so any number of tests with the same n (and tie
+    pattern) share one table.
+    
+    Args:
+        r_plus: Rank sum of the positive (or negative) differences
+        n: Number of non-zero differences
+        tie_counts: Tie runs of the sorted |differences| (None if untied)
+    
+    Returns:
+        p-value(s) with the shape of r_plus
+    """
+    doubled = np.rint(2 * np.asarray(r_plus, dtype=np.float64))
+    lower = np.minimum(doubled, n * (n + 1) - doubled)
+    cdf = wilcoxon_cdf(n, tie_counts)
+    return np.minimum(2 * cdf[lower.astype(np.intp)], 1.0)[()]
@@ -3,8 +3,8 @@
 #https://mckenzie.page
 #Python Simple Statistical Tests
 
-import math
 from typing import Dict, Any, List, Optional
+import numpy as np
 
 def print_header(title: str, width: int = 80):
     """Print a formatted header"""
@@ -148,20 +148,33 @@ def print_data_summary(data: List[float], name: str = "Data"):
         data: Dataset
         name: Name of the dataset
     """
-    n = len(data)
-    mean_val = sum(data) / n
-    
-    if n > 1:
-        variance = sum((x - mean_val) ** 2 for x in data) / (n - 1)
-        std_dev = math.sqrt(variance)
-    else:
-        std_dev = 0
+    values = np.asarray(data, dtype=float)
+    n = len(values)
+    mean_val = values.mean()
+    std_dev = values.std(ddof=1) if n > 1 else 0
     
     print(f"\n{name} Summary:")
     print(f"  n = {n}")
     print(f"  Mean = {mean_val:.4f}")
     print(f"  Std Dev = {std_dev:.4f}")
-    print(f"  Range = [{min(data):.4f}, {max(data):.4f}]")
+    print(f"  Range = [{values.min():.4f}, {values.max():.4f}]")
+
+def print_moments_summary(moments, name: str = "Data"):
+    """
+    Print summary statistics from precomputed moments (no pass over the data)
+    
+    Args:
+        moments: RunningMoments for the dataset
+        name: Name of the dataset
+    """
+    std_dev = moments.std_dev if moments.count > 1 else 0
+    
+    print(f"\n{name} Summary:")
+    print(f"  n = {moments.count}")
+    print(f"  Mean = {moments.mean:.4f}")
+    print(f"  Std Dev = {std_dev:.4f}")
+    if not (np.isnan(moments.minimum) or np.isnan(moments.maximum)):
+        print(f"  Range = [{moments.minimum:.4f}, {moments.maximum:.4f}]")
 
 def format_regression_results(results: Dict[str, Any]) -> str:
     """
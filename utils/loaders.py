@@ -0,0 +1,363 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+import os
+import warnings
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from utils.sufficient_stats import (RunningMoments, CrossProducts, RegressionQR, CategoryCounts,
+                                   ContingencyCounts)
+
+# Delimiters implied by file extension; anything else is sniffed from the first line
+EXTENSION_DELIMITERS = {'.csv': ',', '.tsv': '\t', '.tab': '\t'}
+
+# Rows parsed per block by the streaming readers (~16 MB per float64 column)
+DEFAULT_CHUNK_ROWS = 2_000_000
+
+def _is_number(token: str) -> bool:
+    """Check whether a token parses as a float"""
+    try:
+        float(token)
+        return True
+    except ValueError:
+        return False
+
+def _split_line(line: str, delimiter: Optional[str]) -> List[str]:
+    """Split a line on a delimiter (None means any whitespace)"""
+    return [token.strip() for token in line.split(delimiter)]
+
+def _first_line(path: str) -> str:
+    """First non-blank line of a file"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        for line in f:
+            if line.strip():
+                return line.rstrip('\r\n')
+    return ''
+
+def _skip_header(f) -> None:
+    """Advance an open file past the header, i.e. its first non-blank line"""
+    for line in f:
+        if line.strip():
+            return
+
+def sniff_file_format(path: str, delimiter: Optional[str] = None) -> Tuple[Optional[str], List[str], int]:
+    """
+    Work out the delimiter, header and column count of a numeric text file
+    
+    Args:
+        path: File path
+        delimiter: Known delimiter, or None to detect it
+    
+    Returns:
+        tuple: (delimiter, header_names, n_columns) - delimiter None means
+               whitespace, header_names is empty when the first line is numeric
+    """
+    first_line = _first_line(path)
+    if not first_line:
+        raise ValueError(f"File '{path}' is empty")
+    
+    if delimiter is None:
+        extension = os.path.splitext(path)[1].lower()
+        if extension in EXTENSION_DELIMITERS:
+            delimiter = EXTENSION_DELIMITERS[extension]
+        elif ',' in first_line:
+            delimiter = ','
+        elif '\t' in first_line:
+            delimiter = '\t'
+        elif ';' in first_line:
+            delimiter = ';'
+    
+    tokens = _split_line(first_line, delimiter)
+    has_header = not all(_is_number(token) for token in tokens)
+    return delimiter, (tokens if has_header else []), len(tokens)
+
+def resolve_column(column: Union[int, str], header: List[str]) -> int:
+    """
+    Turn a column index or header name into a zero-based index
+    
+    Args:
+        column: Zero-based index or header name
+        header: Header names (empty if the file has none)
+    
+    Returns:
+        Zero-based column index
+    """
+    if isinstance(column, str):
+        if column not in header:
+            raise ValueError(f"Column '{column}' not found. Available: {', '.join(header) or 'none'}")
+        return header.index(column)
+    return int(column)
+
+def load_numeric_file(path: str, column: Optional[Union[int, str]] = None,
+                      delimiter: Optional[str] = None) -> np.ndarray:
+    """
+    Load one numeric column from a CSV, TSV, newline- or whitespace-separated file
+    
+    Parsing is done by NumPy's C text reader (np.loadtxt) straight into a
+    float64 array, reading only the selected column. When no column is
+    given, a file holding a single line of values (e.g. "1.5, 2.0, 3.1") is
+    read as one series.
+    
+    Args:
+        path: File path
+        column: Zero-based column index or header name (default: the first
+                column, or the whole line of a one-line file)
+        delimiter: Field delimiter (detected from extension/first line if None)
+    
+    Returns:
+        float64 array of the selected column
+    
+    Raises:
+        ValueError: If the file cannot be parsed
+    """
+    delimiter, header, n_columns = sniff_file_format(path, delimiter)
+    column_index = resolve_column(0 if column is None else column, header)
+    if not 0 <= column_index < n_columns:
+        raise ValueError(f"Column {column_index} does not exist (file has {n_columns} column(s))")
+    
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            if header:
+                _skip_header(f)
+            values = np.loadtxt(f, dtype=np.float64, delimiter=delimiter, comments=None,
+                                usecols=column_index, ndmin=1)
+        if len(values) == 1 and n_columns > 1 and not header and column is None:
+            # A single row of values is a series, not a one-row table
+            values = np.loadtxt(path, dtype=np.float64, delimiter=delimiter, comments=None,
+                                ndmin=1, encoding='utf-8-sig')
+    except (ValueError, IndexError) as e:
+        raise ValueError(f"Invalid data in '{path}': {e}")
+    
+    if len(values) == 0:
+        raise ValueError("No valid numbers found")
+    return values
+
+def iter_numeric_chunks(path: str, columns: Sequence[Union[int, str]] = (0,),
+                        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                        delimiter: Optional[str] = None) -> Iterator[np.ndarray]:
+    """
+    Stream selected numeric columns of a file in fixed-size row blocks
+    
+    Only one block is held in memory at a time, so files larger than RAM can
+    be reduced block by block.
+    
+    Args:
+        path: File path
+        columns: Column indices or header names to read
+        chunk_rows: Maximum number of rows per block
+        delimiter: Field delimiter (detected automatically if None)
+    
+    Yields:
+        float64 arrays of shape (rows_in_block, len(columns))
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be positive")
+    
+    delimiter, header, n_columns = sniff_file_format(path, delimiter)
+    indices = [resolve_column(column, header) for column in columns]
+    for index in indices:
+        if not 0 <= index < n_columns:
+            raise ValueError(f"Column {index} does not exist (file has {n_columns} column(s))")
+    
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        if header:
+            _skip_header(f)
+        
+        while True:
+            with warnings.catch_warnings():
+                # The final read past the end of the file is expected to be empty
+                warnings.simplefilter('ignore', UserWarning)
+                try:
+                    block = np.loadtxt(f, dtype=np.float64, delimiter=delimiter, comments=None,
+                                       usecols=indices, max_rows=chunk_rows, ndmin=2)
+                except (ValueError, IndexError) as e:
+                    raise ValueError(f"Invalid data in '{path}': {e}")
+            
+            if len(block) == 0:
+                return
+            yield block
+            if len(block) < chunk_rows:
+                return
+
+def stream_moments(path: str, column: Union[int, str] = 0,
+                   chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                   delimiter: Optional[str] = None) -> RunningMoments:
+    """
+    Reduce one column of a file to running moments without loading it
+    
+    Args:
+        path: File path
+        column: Column index or header name
+        chunk_rows: Rows per block
+        delimiter: Field delimiter (detected automatically if None)
+    
+    Returns:
+        RunningMoments of the column
+    """
+    moments = RunningMoments()
+    for block in iter_numeric_chunks(path, (column,), chunk_rows, delimiter):
+        moments = moments.merge(RunningMoments.from_array(block[:, 0]))
+    
+    if moments.count == 0:
+        raise ValueError("No valid numbers found")
+    return moments
+
+def stream_cross_products(path: str, x_column: Union[int, str] = 0,
+                          y_column: Union[int, str] = 1,
+                          chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                          delimiter: Optional[str] = None) -> CrossProducts:
+    """
+    Reduce two columns of a file to regression cross-products without loading it
+    
+    Args:
+        path: File path
+        x_column: Predictor column index or header name
+        y_column: Response column index or header name
+        chunk_rows: Rows per block
+        delimiter: Field delimiter (detected automatically if None)
+    
+    Returns:
+        CrossProducts of the (x, y) pairs
+    """
+    cross_products = CrossProducts()
+    for block in iter_numeric_chunks(path, (x_column, y_column), chunk_rows, delimiter):
+        cross_products = cross_products.merge(CrossProducts.from_arrays(block[:, 0], block[:, 1]))
+    
+    if cross_products.count == 0:
+        raise ValueError("No valid numbers found")
+    return cross_products
+
+def stream_regression_qr(path: str, x_columns: Sequence[Union[int, str]],
+                         y_column: Union[int, str], intercept: bool = True,
+                         chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                         delimiter: Optional[str] = None) -> RegressionQR:
+    """
+    Reduce a file to the triangular factor of a multiple regression without loading it
+    
+    Args:
+        path: File path
+        x_columns: Predictor column indices or header names
+        y_column: Response column index or header name
+        intercept: Whether the model has an intercept
+        chunk_rows: Rows per block
+        delimiter: Field delimiter (detected automatically if None)
+    
+    Returns:
+        RegressionQR of the rows
+    """
+    x_columns = tuple(x_columns)
+    factor = RegressionQR(len(x_columns), intercept)
+    for block in iter_numeric_chunks(path, x_columns + (y_column,), chunk_rows, delimiter):
+        factor = factor.merge(RegressionQR.from_arrays(block[:, :-1], block[:, -1], intercept))
+    
+    if factor.count == 0:
+        raise ValueError("No valid numbers found")
+    return factor
+
+def iter_category_chunks(path: str, columns: Sequence[Union[int, str]] = (0,),
+                         chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                         delimiter: Optional[str] = None,
+                         has_header: Optional[bool] = None) -> Iterator[np.ndarray]:
+    """
+    Stream selected categorical (text) columns of a file in fixed-size row blocks
+    
+    Fields are read as strings by NumPy's C text reader, with surrounding
+    whitespace and double quotes removed.
+    
+    Args:
+        path: File path
+        columns: Column indices or header names to read
+        chunk_rows: Maximum number of rows per block
+        delimiter: Field delimiter (detected automatically if None)
+        has_header: Whether the first line holds column names; None guesses
+                    from it, which treats any non-numeric first line as a header
+    
+    Yields:
+        String arrays of shape (rows_in_block, len(columns))
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be positive")
+    
+    delimiter, header, n_columns = sniff_file_format(path, delimiter)
+    if has_header is not None:
+        header = _split_line(_first_line(path), delimiter) if has_header else []
+    indices = [resolve_column(column, header) for column in columns]
+    for index in indices:
+        if not 0 <= index < n_columns:
+            raise ValueError(f"Column {index} does not exist (file has {n_columns} column(s))")
+    
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        if header:
+            _skip_header(f)
+        
+        while True:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                try:
+                    # No comment character: '#' is an ordinary character in labels like "C#"
+                    block = np.loadtxt(f, dtype=str, delimiter=delimiter, quotechar='"',
+                                       comments=None, usecols=indices, max_rows=chunk_rows,
+                                       ndmin=2)
+                except (ValueError, IndexError) as e:
+                    raise ValueError(f"Invalid data in '{path}': {e}")
+            
+            if len(block) == 0:
+                return
+            yield np.char.strip(block)
+            if len(block) < chunk_rows:
+                return
+
+def stream_category_counts(path: str, column: Union[int, str] = 0,
+                           chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                           delimiter: Optional[str] = None,
+                           has_header: Optional[bool] = None) -> CategoryCounts:
+    """
+    Count the categories of one column of raw records without loading the file
+    
+    Args:
+        path: File path
+        column: Column index or header name
+        chunk_rows: Rows per block
+        delimiter: Field delimiter (detected automatically if None)
+        has_header: Whether the first line holds column names (None guesses)
+    
+    Returns:
+        CategoryCounts of the column
+    """
+    counts = CategoryCounts()
+    for block in iter_category_chunks(path, (column,), chunk_rows, delimiter, has_header):
+        counts.update(block[:, 0])
+    
+    if counts.total == 0:
+        raise ValueError("No records found")
+    return counts
+
+def stream_contingency_table(path: str, row_column: Union[int, str] = 0,
+                             col_column: Union[int, str] = 1,
+                             chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                             delimiter: Optional[str] = None,
+                             has_header: Optional[bool] = None) -> ContingencyCounts:
+    """
+    Cross-tabulate two columns of raw records without loading the file
+    
+    Args:
+        path: File path
+        row_column: Column index or header name of the row category
+        col_column: Column index or header name of the column category
+        chunk_rows: Rows per block
+        delimiter: Field delimiter (detected automatically if None)
+        has_header: Whether the first line holds column names (None guesses)
+    
+    Returns:
+        ContingencyCounts of the records
+    """
+    table = ContingencyCounts()
+    for block in iter_category_chunks(path, (row_column, col_column), chunk_rows,
+                                      delimiter, has_header):
+        table.update(block[:, 0], block[:, 1])
+    
+    if table.total == 0:
+        raise ValueError("No records found")
+    return table
@@ -0,0 +1,117 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+import numpy as np
+from typing import Any, Dict, Sequence, Union
+
+ArrayLike = Union[np.ndarray, list]
+
+CORRECTION_NAMES = {
+    'bonferroni': "Bonferroni",
+    'holm': "Holm",
+    'bh': "Benjamini-Hochberg",
+    'by': "Benjamini-Yekutieli"
+}
+
+def adjust_p_values(p_values: ArrayLike, method: str = 'holm') -> np.ndarray:
+    """
+    Multiple-testing adjusted p-values
+    
+    Bonferroni and Holm control the family-wise error rate, Benjamini-Hochberg
+    and Benjamini-Yekutieli the false discovery rate (BY under any dependence).
+    The step-down and step-up adjustments need a single sort and one running
+    maximum or minimum, so m p-values cost O(m log m). NaN p-values (e.g. from
+    constant columns) are left out of the family and stay NaN.
+    
+    Args:
+        p_values: Array of raw p-values, any shape
+        method: 'bonferroni', 'holm', 'bh' or 'by'
+    
+    Returns:
+        Adjusted p-values in the shape and order of the input
+    """
+    if method not in CORRECTION_NAMES:
+        raise ValueError(f"Unknown correction method '{method}'; "
+                         f"use one of {', '.join(CORRECTION_NAMES)}")
+    p_values = np.asarray(p_values, dtype=float)
+    if np.any((p_values < 0) | (p_values > 1)):
+        raise ValueError("p-values must lie between 0 and 1")
+    
+    flat = p_values.ravel()
+    valid = ~np.isnan(flat)
+    p = flat[valid]
+    m = len(p)
+    adjusted = np.full(flat.shape, np.nan)
+    if m == 0:
+        return adjusted.reshape(p_values.shape)
+    
+    if method == 'bonferroni':
+        adjusted[valid] = np.minimum(m * p, 1.0)
+        return adjusted.reshape(p_values.shape)
+    
+    order = np.argsort(p, kind='stable')
+    ranks = np.arange(1, m + 1)
+    ordered = p[order]
+    
+    if method == 'holm':
+        # Step-down: max over j <= i of (m - j + 1) p_(j)
+        stepped = np.maximum.accumulate((m - ranks + 1) * ordered)
+    else:
+        # Step-up: min over j >= i of m p_(j) / j, scaled by sum(1/j) for BY
+        scale = m if method == 'bh' else m * np.sum(1.0 / ranks)
+        stepped = np.minimum.accumulate((scale * ordered / ranks)[::-1])[::-1]
+    
+    unsorted = np.empty(m)
+    unsorted[order] = np.minimum(stepped, 1.0)
+    adjusted[valid] = unsorted
+    return adjusted.reshape(p_values.shape)
+
+def correct_results(results: Union[Dict[str, Any], Sequence[Dict[str, Any]]],
+                    method: str = 'holm', alpha: float = 0.05,
+                    p_value_key: str = 'p_value') -> Union[Dict[str, Any], Sequence[Dict[str, Any]]]:
+    """
+    Adjust the p-values of a family of test results and write them back
+    
+    The family is every p-value across the given results: the per-column
+    arrays of a BatchTests result, a list of standalone test results, or a
+    list mixing both. All of them are corrected together in one pass, and
+    each result gains 'adjusted_p_value', 'reject_adjusted' and 'correction'
+    entries shaped like its own p-value. Standalone results (scalar p-value)
+    also get an 'adjusted_interpretation' string.
+    
+    Args:
+        results: One result dictionary or a sequence of them; updated in place
+        method: 'bonferroni', 'holm', 'bh' or 'by'
+        alpha: Significance level for the family (FWER or FDR)
+        p_value_key: Result entry holding the raw p-value(s)
+    
+    Returns:
+        The results passed in, for chaining
+    """
+    family = [results] if isinstance(results, dict) else list(results)
+    if not family:
+        return results
+    if any(p_value_key not in result for result in family):
+        raise ValueError(f"Every result needs a '{p_value_key}' entry")
+    
+    raw = [np.asarray(result[p_value_key], dtype=float) for result in family]
+    sizes = [p.size for p in raw]
+    adjusted = adjust_p_values(np.concatenate([p.ravel() for p in raw]), method)
+    name = CORRECTION_NAMES[method]
+    
+    for result, p, chunk in zip(family, raw, np.split(adjusted, np.cumsum(sizes)[:-1])):
+        with np.errstate(invalid='ignore'):
+            reject = chunk < alpha
+        if p.ndim == 0:
+            result['adjusted_p_value'] = float(chunk[0])
+            result['reject_adjusted'] = bool(reject[0])
+            result['adjusted_interpretation'] = (f"{'Reject' if reject[0] else 'Fail to reject'} "
+                                                 f"H0 at α = {alpha} ({name})")
+        else:
+            result['adjusted_p_value'] = chunk.reshape(p.shape)
+            result['reject_adjusted'] = reject.reshape(p.shape)
+        result['correction'] = name
+    
+    return results
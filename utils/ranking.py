@@ -0,0 +1,188 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+from typing import Optional, Sequence, Tuple, Union
+import numpy as np
+
+def _tie_runs(sorted_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start index and length of every run of equal values in a sorted array"""
+    n = len(sorted_values)
+    if not n:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    run_starts = np.flatnonzero(np.r_[True, sorted_values[1:] != sorted_values[:-1]])
+    return run_starts, np.diff(np.r_[run_starts, n])
+
+def sort_and_rank(values: Union[Sequence[float], np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sort permutation, average ranks and tie group sizes of a sample
+    
+    One sort gives the ranks (1-based, ties share the mean rank) and
+    the run lengths of tied values, which is all the rank tests need for
+    their tie corrections.
+    
+    Args:
+        values: Observations
+    
+    Returns:
+        tuple: (order, ranks, tie_counts) - values[order] is sorted and
+               tie_counts holds the length of every run of equal values
+               (1 for untied values)
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    n = len(values)
+    order = np.argsort(values)
+    sorted_values = values[order]
+    
+    run_starts, tie_counts = _tie_runs(sorted_values)
+    
+    # Mean of ranks start+1 .. start+count for each run
+    run_ranks = run_starts + (tie_counts + 1) / 2.0
+    ranks = np.empty(n, dtype=np.float64)
+    ranks[order] = np.repeat(run_ranks, tie_counts)
+    return order, ranks, tie_counts
+
+class RankInfo:
+    """
+    Sort permutation, ranks and tie runs of one sample
+    
+    DataManager keeps one per dataset so that the rank-based tests can
+    share a single sort instead of each ranking the data again. The
+    arrays are read-only.
+    """
+    
+    __slots__ = ('order', 'ranks', 'tie_counts')
+    
+    def __init__(self, order: np.ndarray, ranks: np.ndarray, tie_counts: np.ndarray):
+        for array in (order, ranks, tie_counts):
+            array.setflags(write=False)
+        self.order = order
+        self.ranks = ranks
+        self.tie_counts = tie_counts
+    
+    @classmethod
+    def from_array(cls, values: Union[Sequence[float], np.ndarray]) -> 'RankInfo':
+        """Sort and rank a sample"""
+        return cls(*sort_and_rank(values))
+    
+    @property
+    def n(self) -> int:
+        return len(self.order)
+    
+    def sorted_values(self, values: Union[Sequence[float], np.ndarray]) -> np.ndarray:
+        """The sample these ranks were computed from, in ascending order"""
+        return np.asarray(values, dtype=np.float64).ravel()[self.order]
+    
+    def __repr__(self) -> str:
+        return f"RankInfo(n={self.n}, distinct={len(self.tie_counts)})"
+
+def rank_info_or_compute(values: Union[Sequence[float], np.ndarray],
+                         rank_info: Optional[RankInfo] = None) -> RankInfo:
+    """
+    Use a precomputed RankInfo when available, otherwise rank the values
+    
+    Args:
+        values: Sample values
+        rank_info: Precomputed ranks of values
+    
+    Returns:
+        RankInfo for the sample
+    """
+    if rank_info is None:
+        return RankInfo.from_array(values)
+    if rank_info.n != np.size(values):
+        raise ValueError("Rank information does not match the sample size")
+    return rank_info
+
+def sorted_median(sorted_values: np.ndarray) -> float:
+    """Median of an already sorted sample (same result as np.median)"""
+    n = len(sorted_values)
+    if n == 0:
+        return np.nan
+    return (sorted_values[(n - 1) // 2] + sorted_values[n // 2]) / 2.0
+
+def pooled_rank_sums(sorted_samples: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rank sum of every sample within the pooled sample
+    
+    The samples must each be sorted already (see RankInfo.sorted_values),
+    so the stable sort of their concatenation only has to merge k sorted
+    runs rather than rank all the data from scratch.
+    
+    Args:
+        sorted_samples: k samples, each in ascending order
+    
+    Returns:
+        tuple: (rank_sums, tie_counts) - the k rank sums and the tie runs
+               of the pooled sample
+    """
+    sizes = [len(sample) for sample in sorted_samples]
+    pooled = np.concatenate(sorted_samples).astype(np.float64, copy=False)
+    codes = np.repeat(np.arange(len(sizes)), sizes)
+    
+    order = np.argsort(pooled, kind='stable')
+    run_starts, tie_counts = _tie_runs(pooled[order])
+    run_ranks = run_starts + (tie_counts + 1) / 2.0
+    
+    rank_sums = np.bincount(codes[order], weights=np.repeat(run_ranks, tie_counts),
+                            minlength=len(sizes))
+    return rank_sums, tie_counts
+
+def signed_rank_sums(sorted_differences: np.ndarray) -> Tuple[float, float, np.ndarray]:
+    """
+    Wilcoxon signed-rank sums of sorted differences, ignoring zeros
+    
+    The absolute values of the negative differences (read backwards) and
+    the positive differences are two sorted runs, so ranking |d| is a
+    merge of the two.
+    
+    Args:
+        sorted_differences: Differences in ascending order
+    
+    Returns:
+        tuple: (r_plus, r_minus, tie_counts) - rank sums of the positive
+               and negative differences and the tie runs of the non-zero |d|
+    """
+    negative_end = np.searchsorted(sorted_differences, 0.0, side='left')
+    positive_start = np.searchsorted(sorted_differences, 0.0, side='right')
+    
+    (r_minus, r_plus), tie_counts = pooled_rank_sums([-sorted_differences[:negative_end][::-1],
+                                                      sorted_differences[positive_start:]])
+    return r_plus, r_minus, tie_counts
+
+def tie_sum(tie_counts: np.ndarray) -> float:
+    """Sum of t^3 - t over tie runs, the tie term of the normal approximations"""
+    t = tie_counts.astype(np.float64)
+    return np.sum(t**3 - t)
+
+def tie_correction(tie_counts: np.ndarray, n: int) -> float:
+    """
+    Tie correction factor 1 - sum(t^3 - t) / (n^3 - n) used by
+    Kruskal-Wallis and Mann-Whitney
+    """
+    if n < 2:
+        return 1.0
+    return 1.0 - tie_sum(tie_counts) / (float(n)**3 - n)
+
+def grouped_medians(values: np.ndarray, codes: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Median of every group of a label-indexed sample
+    
+    A stable sort on the group codes (a radix sort when they fit in 16
+    bits) makes each group contiguous; each median is then a linear-time
+    selection on its segment.
+    
+    Args:
+        values: Observations
+        codes: Dense group codes 0..k-1 (see encode_groups)
+        counts: Observations per group
+    
+    Returns:
+        Array of k group medians
+    """
+    keys = codes.astype(np.uint16) if len(counts) <= np.iinfo(np.uint16).max + 1 else codes
+    grouped_values = values[np.argsort(keys, kind='stable')]
+    starts = np.cumsum(counts) - counts
+    return np.array([np.median(grouped_values[start:start + count]) if count else np.nan
+                     for start, count in zip(starts, counts)])
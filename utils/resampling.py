@@ -0,0 +1,185 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import scipy.stats as stats
+
+# Upper bound on the elements (resamples x observations) generated at once
+# by one block, which keeps each block's index array around 8 MB
+BLOCK_ELEMENTS = 1 << 20
+
+# Runs smaller than this (resamples x observations) finish faster in-process
+# than it takes to start a process pool, so workers=None only goes parallel
+# above it
+PARALLEL_MIN_ELEMENTS = 8 * BLOCK_ELEMENTS
+
+# Sequential runs look at the running p-value after this many resamples
+# and then every time the count doubles
+FIRST_LOOK = 100
+
+# Default chance that a sequential run reaches a different decision than
+# running every resample would
+DEFAULT_TOLERANCE = 1e-3
+
+SeedLike = Optional[Union[int, Sequence[int], np.random.SeedSequence]]
+BlockFunction = Callable[[Any, np.random.Generator, int], Any]
+
+def block_size_for(n_observations: int, limit: int = 10_000) -> int:
+    """
+    Resamples per block for samples of a given size
+    
+    Depends only on the data size, never on the worker count, so the block
+    boundaries (and with them the random streams) are the same however the
+    work is spread.
+    """
+    return int(max(1, min(limit, BLOCK_ELEMENTS // max(n_observations, 1))))
+
+def sequential_block_sizes(n_resamples: int, max_block_size: int) -> List[int]:
+    """
+    Block sizes for a sequential run: FIRST_LOOK, then whatever doubles the total
+    
+    The blocks end on SequentialStopper's looks (FIRST_LOOK, 2 * FIRST_LOOK,
+    4 * FIRST_LOOK, ...), so no block is smaller than the next look needs,
+    until they reach max_block_size. Like block_size_for, the sizes never
+    depend on the worker count.
+    """
+    sizes = []
+    done = 0
+    while done < n_resamples:
+        size = min(done or FIRST_LOOK, max_block_size, n_resamples - done)
+        sizes.append(size)
+        done += size
+    return sizes
+
+def seed_sequence(seed: SeedLike = None) -> np.random.SeedSequence:
+    """SeedSequence for a seed (fresh OS entropy when seed is None)"""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+# Per-process state for pool workers, set once by the pool initializer so
+# the shared arrays are not pickled again for every block
+_worker_function: Optional[BlockFunction] = None
+_worker_shared: Any = None
+
+def _init_worker(function: BlockFunction, shared: Any):
+    global _worker_function, _worker_shared
+    _worker_function = function
+    _worker_shared = shared
+
+def _run_worker_block(task: Tuple[np.random.SeedSequence, int]) -> Any:
+    seed, size = task
+    return _worker_function(_worker_shared, np.random.default_rng(seed), size)
+
+def resample_blocks(function: BlockFunction, shared: Any, n_resamples: int,
+                    block_size: Union[int, Sequence[int]], seed: SeedLike = None,
+                    workers: Optional[int] = None, n_observations: int = 1) -> Iterator[Any]:
+    """
+    Run a resampling computation in independent blocks, optionally in parallel
+    
+    The n_resamples draws are cut into blocks and block i draws
+    from the i-th child of the SeedSequence, so every block sees the same
+    random numbers whether it runs in this process or in any of the
+    workers. Results are yielded in block order; closing the iterator early
+    cancels the blocks not yet started.
+    
+    Args:
+        function: function(shared, rng, size) computing one block; must be a
+                  module-level function so worker processes can import it
+        shared: Read-only data passed to every block (sent once per worker)
+        n_resamples: Total number of resamples
+        block_size: Resamples per block (see block_size_for), or the size of
+                    every block in turn (see sequential_block_sizes)
+        seed: Seed or SeedSequence for the whole run
+        workers: Worker processes (default: all CPUs once n_resamples *
+                 n_observations reaches PARALLEL_MIN_ELEMENTS, else 1);
+                 1 runs in-process
+        n_observations: Size of the data each resample covers, used to
+                        judge whether a pool is worth starting
+    
+    Yields:
+        The result of each block, in order
+    """
+    seed = seed_sequence(seed)
+    if isinstance(block_size, (int, np.integer)):
+        n_blocks = -(-n_resamples // block_size) if n_resamples > 0 else 0
+        sizes = [min(block_size, n_resamples - i * block_size) for i in range(n_blocks)]
+    else:
+        sizes = list(block_size)
+        if sum(sizes) != n_resamples:
+            raise ValueError("Block sizes must add up to n_resamples")
+        n_blocks = len(sizes)
+    # The children spawn() would give, without advancing the caller's SeedSequence
+    children = [np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + (i,),
+                                       pool_size=seed.pool_size)
+                for i in range(n_blocks)]
+    
+    if workers is None:
+        workers = (os.cpu_count() or 1) if n_resamples * n_observations >= PARALLEL_MIN_ELEMENTS else 1
+    workers = min(workers, n_blocks)
+    if workers <= 1:
+        for child, size in zip(children, sizes):
+            yield function(shared, np.random.default_rng(child), size)
+        return
+    
+    # Keep a bounded number of blocks in flight so stopping early wastes little
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(function, shared)) as pool:
+        tasks = iter(zip(children, sizes))
+        pending = deque()
+        try:
+            for task in tasks:
+                pending.append(pool.submit(_run_worker_block, task))
+                if len(pending) >= 2 * workers:
+                    break
+            while pending:
+                result = pending.popleft().result()
+                task = next(tasks, None)
+                if task is not None:
+                    pending.append(pool.submit(_run_worker_block, task))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+class SequentialStopper:
+    """
+    Confidence-bounded early stopping for Monte Carlo p-values
+    
+    Checks the exceedance count at FIRST_LOOK resamples and at every
+    doubling after that. The run stops once a Clopper-Pearson interval for
+    the true p-value lies entirely above or below alpha. The error budget
+    is split evenly over all possible looks, so the chance that the
+    decision differs from the one an infinite run would give is at most
+    tolerance.
+    """
+    
+    def __init__(self, alpha: float, tolerance: float, max_resamples: int):
+        if not 0 < tolerance < 1:
+            raise ValueError("Error tolerance must be between 0 and 1")
+        self.alpha = alpha
+        n_looks = 1 + max(0, int(np.ceil(np.log2(max_resamples / FIRST_LOOK))))
+        self.level = tolerance / n_looks
+        self.next_look = FIRST_LOOK
+    
+    def p_value_bounds(self, n_extreme: int, n_resamples: int) -> Tuple[float, float]:
+        """Two-sided Clopper-Pearson bounds at the per-look error level"""
+        lower = stats.beta.ppf(self.level / 2, n_extreme, n_resamples - n_extreme + 1) if n_extreme else 0.0
+        upper = (stats.beta.ppf(1 - self.level / 2, n_extreme + 1, n_resamples - n_extreme)
+                 if n_extreme < n_resamples else 1.0)
+        return lower, upper
+    
+    def settled(self, n_extreme: int, n_resamples: int) -> bool:
+        """Whether the decision at alpha is settled (only evaluated at the look points)"""
+        if n_resamples < self.next_look:
+            return False
+        while self.next_look <= n_resamples:
+            self.next_look *= 2
+        lower, upper = self.p_value_bounds(n_extreme, n_resamples)
+        return upper < self.alpha or lower > self.alpha
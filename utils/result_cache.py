@@ -0,0 +1,487 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+import copy
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+import numpy as np
+from scipy import sparse
+from utils.results import TestResult
+from utils.sufficient_stats import (RunningMoments, CrossProducts, RegressionQR, CategoryCounts,
+                                   ContingencyCounts)
+from utils.ranking import RankInfo
+
+# Default budgets for the in-process cache
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Default budget for the on-disk cache
+DEFAULT_DISK_MAX_BYTES = 512 * 1024 * 1024
+
+# Bumped whenever cached result layouts change, invalidating older disk entries
+CACHE_FORMAT_VERSION = 1
+
+# Digests of read-only arrays, keyed by the memory they view. Stored datasets
+# are immutable, so re-running a test on them does not rehash the data.
+_array_digests: Dict[Tuple, Tuple[weakref.ref, bytes]] = {}
+
+def _root_array(array: np.ndarray) -> np.ndarray:
+    """Follow .base to the array that owns the memory"""
+    root = array
+    while isinstance(root.base, np.ndarray):
+        root = root.base
+    return root
+
+def _hash_array(array: np.ndarray) -> bytes:
+    """Digest of an array's dtype, shape and contents"""
+    if not array.flags.writeable:
+        root = _root_array(array)
+        if not root.flags.writeable:
+            memo_key = (id(root), array.__array_interface__['data'][0],
+                        array.shape, array.strides, array.dtype.str)
+            cached = _array_digests.get(memo_key)
+            if cached is not None and cached[0]() is root:
+                return cached[1]
+            digest = _hash_array_contents(array)
+            try:
+                ref = weakref.ref(root, lambda _, key=memo_key: _array_digests.pop(key, None))
+            except TypeError:
+                return digest
+            _array_digests[memo_key] = (ref, digest)
+            return digest
+    return _hash_array_contents(array)
+
+def _hash_array_contents(array: np.ndarray) -> bytes:
+    """Hash array bytes without the memo"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{array.dtype.str}{array.shape}".encode())
+    h.update(np.ascontiguousarray(array).data)
+    return h.digest()
+
+def _update_hash(h: 'hashlib._Hash', value: Any):
+    """Feed a value into a running hash"""
+    if isinstance(value, np.ndarray):
+        h.update(b'A')
+        h.update(_hash_array(value))
+    elif sparse.issparse(value):
+        # Canonical CSR form, so equal tables in any sparse format share a key
+        table = sparse.csr_matrix(value, copy=True)
+        table.sum_duplicates()
+        table.eliminate_zeros()
+        h.update(b'P')
+        h.update(str(table.shape).encode())
+        for array in (table.data, table.indices, table.indptr):
+            h.update(_hash_array_contents(array))
+    elif isinstance(value, RunningMoments):
+        h.update(b'M')
+        h.update(repr(sorted(value.to_dict().items())).encode())
+    elif isinstance(value, CrossProducts):
+        h.update(b'X')
+        _update_hash(h, value.x)
+        _update_hash(h, value.y)
+        h.update(repr((value.cxy, value.dxx, value.dxy, value.dyy)).encode())
+    elif isinstance(value, RegressionQR):
+        h.update(b'Q')
+        _update_hash(h, value.r)
+        _update_hash(h, value.y)
+        h.update(repr(value.intercept).encode())
+    elif isinstance(value, CategoryCounts):
+        h.update(b'K')
+        _update_hash(h, value.counts)
+        h.update(repr(value.categories.labels).encode())
+    elif isinstance(value, ContingencyCounts):
+        h.update(b'C')
+        _update_hash(h, value.keys)
+        _update_hash(h, value.counts)
+        h.update(repr((value.rows.labels, value.cols.labels)).encode())
+    elif isinstance(value, RankInfo):
+        # Ranks are derived from a sample that is already part of the key
+        h.update(b'R')
+        h.update(str(value.n).encode())
+    elif isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, (int, float)) and not isinstance(item, bool)
+                         for item in value):
+            _update_hash(h, np.asarray(value, dtype=float))
+        else:
+            h.update(b'L' if isinstance(value, list) else b'T')
+            h.update(str(len(value)).encode())
+            for item in value:
+                _update_hash(h, item)
+    elif isinstance(value, dict):
+        h.update(b'D')
+        for k in sorted(value):
+            h.update(repr(k).encode())
+            _update_hash(h, value[k])
+    else:
+        h.update(b'S')
+        h.update(repr(value).encode())
+
+def content_hash(*values: Any) -> str:
+    """
+    Content-addressed digest of test inputs
+    
+    Arrays are hashed by dtype, shape and bytes (digests of read-only arrays
+    such as stored datasets are memoized), moments and cross-products by
+    their fields, and other values by repr.
+    
+    Args:
+        values: Values to hash
+    
+    Returns:
+        Hex digest
+    """
+    h = hashlib.blake2b(digest_size=20)
+    for value in values:
+        _update_hash(h, value)
+    return h.hexdigest()
+
+def _estimate_size(value: Any) -> int:
+    """Rough number of bytes held by a cached value"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes + 112
+    if sparse.issparse(value):
+        return sum(_estimate_size(getattr(value, name)) for name in ('data', 'indices', 'indptr', 'row', 'col')
+                   if isinstance(getattr(value, name, None), np.ndarray))
+    if isinstance(value, TestResult):
+        return (_estimate_size(dict(value)) + _estimate_size(value.warnings)
+                + _estimate_size(value.details))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_estimate_size(k) + _estimate_size(v)
+                                          for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+class ResultCache:
+    """
+    In-process LRU cache of test results
+    
+    Entries are keyed by test name plus a content hash of the inputs and
+    parameters, so the same test on the same data is answered without
+    recomputation. The least recently used entries are evicted once either
+    the entry or the memory budget is exceeded.
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self._entries: 'OrderedDict[str, Tuple[TestResult, int]]' = OrderedDict()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(test_name: str, *values: Any) -> str:
+        """Build a cache key from a test name and its inputs"""
+        return f"{test_name}:{content_hash(*values)}"
+    
+    def get(self, key: str) -> Optional[TestResult]:
+        """
+        Look up a result, marking it as recently used
+        
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return _copy_result(entry[0])
+    
+    def put(self, key: str, result: TestResult):
+        """Store a result, evicting old entries to stay within budget"""
+        if self.max_entries <= 0:
+            return
+        
+        size = _estimate_size(result)
+        if size > self.max_bytes:
+            return
+        
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (_copy_result(result), size)
+        self.current_bytes += size
+        self._evict()
+    
+    def configure(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        """Change the budgets, evicting entries if they are now exceeded"""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._evict()
+    
+    def _evict(self):
+        """Drop least recently used entries until within budget"""
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self.current_bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+    
+    def clear(self):
+        """Remove all entries (counters are kept)"""
+        self._entries.clear()
+        self.current_bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current usage"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+def _copy_result(result: TestResult) -> TestResult:
+    """Copy a result, details included, so callers cannot modify the cached entry"""
+    return TestResult(copy.deepcopy(dict(result)), result.warnings, copy.deepcopy(result.details))
+
+class DiskResultCache:
+    """
+    Persistent result cache in a SQLite database
+    
+    Uses the same content-addressed keys as ResultCache, so entries are found
+    again after a restart or from other processes working on the same data,
+    and a changed dataset simply hashes to a new key. Results are pickled;
+    least recently used rows are deleted once the size budget is exceeded.
+    Only point this at a file you trust, as entries are unpickled on load.
+    """
+    
+    def __init__(self, path: str, max_bytes: int = DEFAULT_DISK_MAX_BYTES):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        
+        # Several processes may share the file; WAL lets readers run during writes
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""CREATE TABLE IF NOT EXISTS results (
+                                  key TEXT PRIMARY KEY,
+                                  test_name TEXT NOT NULL,
+                                  value BLOB NOT NULL,
+                                  size INTEGER NOT NULL,
+                                  created REAL NOT NULL,
+                                  last_used REAL NOT NULL)""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self._conn.commit()
+    
+    def get(self, key: str) -> Optional[TestResult]:
+        """
+        Look up a result and refresh its last-used time
+        
+        Returns:
+            The stored result, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            
+            try:
+                result = pickle.loads(row[0])
+            except Exception:
+                # Unreadable entry (e.g. written by an incompatible version)
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            
+            self._conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            return result
+    
+    def put(self, key: str, result: TestResult):
+        """Store a result, evicting old rows to stay within budget"""
+        # Rule out results that cannot fit before paying to pickle them
+        if _estimate_size(result) > self.max_bytes:
+            return
+        value = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(value) > self.max_bytes:
+            return
+        
+        now = time.time()
+        test_name = key.split(':', 1)[0]
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                               (key, test_name, value, len(value), now, now))
+            self._evict()
+            self._conn.commit()
+    
+    def _evict(self):
+        """Delete least recently used rows until within budget"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM results ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM results WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+    
+    def clear(self):
+        """Delete all stored results"""
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current usage"""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'path': self.path,
+            'entries': entries,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+# Caches shared by all compute_* functions (the disk tier is opt-in)
+result_cache = ResultCache()
+disk_cache: Optional[DiskResultCache] = None
+
+def enable_disk_cache(path: str, max_bytes: int = DEFAULT_DISK_MAX_BYTES) -> DiskResultCache:
+    """
+    Back the in-process cache with a persistent SQLite store
+    
+    Args:
+        path: Database file (created if missing)
+        max_bytes: Size budget for stored results
+    
+    Returns:
+        The active DiskResultCache
+    """
+    global disk_cache
+    disable_disk_cache()
+    disk_cache = DiskResultCache(path, max_bytes)
+    return disk_cache
+
+def disable_disk_cache():
+    """Stop using (and close) the persistent store"""
+    global disk_cache
+    if disk_cache is not None:
+        disk_cache.close()
+        disk_cache = None
+
+def cached_result(test_name: str, seed_argument: Optional[str] = None,
+                  bypass_argument: Optional[str] = None,
+                  ignored_arguments: Tuple[str, ...] = ()) -> Callable:
+    """
+    Decorator memoizing a compute_* function in result_cache
+    
+    Arguments are bound to the function signature (defaults included), so
+    positional and keyword calls with the same values share an entry.
+    Misses fall through to disk_cache when it is enabled. Exceptions are
+    not cached.
+    
+    For randomized tests, seed_argument names the seed parameter. Results
+    drawn from fresh entropy (seed None) report it in their 'seed' entry;
+    they are never stored under the seedless key, which would freeze one
+    random draw, but under the key of that explicit seed, which reproduces
+    them. Results without a 'seed' entry took a deterministic path and are
+    cached as usual.
+    
+    Calls that pass bypass_argument (e.g. caller-owned output arrays) run
+    uncached: their inputs are not even hashed. ignored_arguments are left
+    out of the key, for parameters such as workers that cannot change the
+    result.
+    
+    Args:
+        test_name: Name used as the key prefix
+        seed_argument: Name of the seed parameter, if the test is randomized
+        bypass_argument: Name of a parameter that disables caching when not None
+        ignored_arguments: Names of parameters that do not affect the result
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        
+        def store(key: str, result: TestResult):
+            result_cache.put(key, result)
+            if disk_cache is not None:
+                disk_cache.put(key, result)
+        
+        def make_key(bound: inspect.BoundArguments) -> str:
+            return ResultCache.make_key(test_name, CACHE_FORMAT_VERSION,
+                                        *((name, value) for name, value in bound.arguments.items()
+                                          if name not in ignored_arguments))
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            if bypass_argument is not None and bound.arguments[bypass_argument] is not None:
+                return func(*args, **kwargs)
+            key = make_key(bound)
+            
+            result = result_cache.get(key)
+            if result is not None:
+                return result
+            
+            if disk_cache is not None:
+                result = disk_cache.get(key)
+                if result is not None:
+                    result_cache.put(key, result)
+                    return result
+            
+            result = func(*args, **kwargs)
+            if (seed_argument is not None and bound.arguments[seed_argument] is None
+                    and result.get('seed') is not None):
+                bound.arguments[seed_argument] = result['seed']
+                key = make_key(bound)
+            store(key, result)
+            return result
+        
+        wrapper.uncached = func
+        return wrapper
+    return decorator
@@ -0,0 +1,32 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+from typing import Any, Dict, List, Optional
+
+class TestResult(dict):
+    """
+    Results of a statistical test
+    
+    Behaves exactly like the results dictionaries the tests have always
+    returned, and additionally carries the assumption warnings and any
+    auxiliary arrays (expected tables, residuals, ...) that are used for
+    display but are not part of the printed results.
+    """
+    
+    __test__ = False  # Not a pytest test class
+    
+    def __init__(self, results: Optional[Dict[str, Any]] = None,
+                 warnings: Optional[List[str]] = None,
+                 details: Optional[Dict[str, Any]] = None):
+        super().__init__(results or {})
+        self.warnings: List[str] = list(warnings or [])
+        self.details: Dict[str, Any] = dict(details or {})
+    
+    def copy(self) -> 'TestResult':
+        """Shallow copy that keeps warnings and details"""
+        return TestResult(self, self.warnings, self.details)
+    
+    def __repr__(self) -> str:
+        return f"TestResult({dict.__repr__(self)}, warnings={self.warnings!r})"
@@ -0,0 +1,160 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+import numpy as np
+import scipy.stats as stats
+from scipy import special
+from typing import Sequence, Union
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+# Both integrals are mapped onto a standard normal variable and use fixed
+# Gauss-Legendre rules on [-NORMAL_LIMIT, NORMAL_LIMIT]: one over the
+# largest of the k means (exact in k), one over the chi-distributed
+# standard error, which needs more nodes for small degrees of freedom
+RANGE_NODES = 64
+CHI_NODES = 128
+NORMAL_LIMIT = 8.5
+
+def _normal_rule(n_nodes: int):
+    """Nodes and weights for integrals against the standard normal density"""
+    nodes, weights = np.polynomial.legendre.leggauss(n_nodes)
+    nodes = NORMAL_LIMIT * nodes
+    return nodes, NORMAL_LIMIT * weights * stats.norm.pdf(nodes)
+
+_RANGE_NODES, _RANGE_WEIGHTS = _normal_rule(RANGE_NODES)
+_CHI_NODES, _CHI_WEIGHTS = _normal_rule(CHI_NODES)
+
+# Upper bound on the (points x nodes x nodes) elements evaluated at once
+BLOCK_ELEMENTS = 1 << 21
+
+def _chi_nodes(df: np.ndarray) -> np.ndarray:
+    """sqrt(chi2_df / df) at the chi quadrature nodes, one row per df"""
+    df = df[:, np.newaxis]
+    chi2 = np.where(_CHI_NODES < 0, stats.chi2.ppf(special.ndtr(np.minimum(_CHI_NODES, 0)), df),
+                    stats.chi2.isf(special.ndtr(-np.maximum(_CHI_NODES, 0)), df))
+    return np.where(np.isinf(df), 1.0, np.sqrt(chi2 / df))
+
+def _range_sf(w: np.ndarray, k: int) -> np.ndarray:
+    """
+    P(range of k standard normals > w), elementwise
+    
+    Integrates 1 - (1 - Φ(z - w) / Φ(z))^(k-1) over the distribution of the
+    largest of the k normals, Φ(z)^k, mapped onto a standard normal so the
+    same nodes work for any k; log1p/expm1 keep small tail probabilities
+    at full relative precision.
+    """
+    log_cdf_max = special.log_ndtr(_RANGE_NODES) / k
+    z = special.ndtri_exp(log_cdf_max)
+    ratio = np.exp(special.log_ndtr(z - w[..., np.newaxis]) - log_cdf_max)
+    with np.errstate(divide='ignore'):
+        return -np.expm1((k - 1) * np.log1p(-np.minimum(ratio, 1.0))) @ _RANGE_WEIGHTS
+
+def _sf_block(q: np.ndarray, k: int, df: np.ndarray) -> np.ndarray:
+    """Survival function for one block of points"""
+    unique_df, inverse = np.unique(df, return_inverse=True)
+    s = _chi_nodes(unique_df)[inverse]
+    return _range_sf(q[:, np.newaxis] * s, k) @ _CHI_WEIGHTS
+
+def studentized_range_sf(q: ArrayLike, k: int, df: ArrayLike) -> Union[float, np.ndarray]:
+    """
+    Survival function of the studentized range distribution, vectorized
+    
+    P(Q > q) for the range of k means over an independent chi-based
+    standard error with df degrees of freedom (df may be np.inf). Both
+    integrals use fixed Gauss-Legendre rules, so a whole matrix of
+    post-hoc statistics is evaluated in a few array operations instead of
+    one adaptive quadrature per point as in scipy.stats.studentized_range.
+    
+    Args:
+        q: Studentized range statistic(s)
+        k: Number of groups
+        df: Degrees of freedom, scalar or broadcastable with q
+    
+    Returns:
+        Upper-tail probabilities shaped like the broadcast of q and df
+    """
+    if k < 2:
+        raise ValueError("The studentized range needs at least 2 groups")
+    q, df = np.broadcast_arrays(np.asarray(q, dtype=float), np.asarray(df, dtype=float))
+    shape = q.shape
+    q, df = q.ravel(), df.ravel()
+    
+    sf = np.full(q.shape, np.nan)
+    sf[q <= 0] = 1.0
+    points = np.flatnonzero((q > 0) & (df > 0))
+    block = max(1, BLOCK_ELEMENTS // (RANGE_NODES * CHI_NODES))
+    for start in range(0, len(points), block):
+        index = points[start:start + block]
+        sf[index] = _sf_block(q[index], k, df[index])
+    
+    sf = np.clip(sf, 0.0, 1.0).reshape(shape)
+    return sf[()] if sf.ndim == 0 else sf
+
+def studentized_range_ppf(p: ArrayLike, k: int, df: ArrayLike, tolerance: float = 1e-10,
+                          max_iterations: int = 100) -> Union[float, np.ndarray]:
+    """
+    Quantile function of the studentized range distribution, vectorized
+    
+    Solves studentized_range_sf(q) = 1 - p for every point at once with
+    the Illinois variant of regula falsi on log sf, which is close to
+    linear in q in the upper tail.
+    
+    Args:
+        p: Lower-tail probabilities in (0, 1) (e.g. 1 - alpha)
+        k: Number of groups
+        df: Degrees of freedom, scalar or broadcastable with p
+        tolerance: Absolute tolerance on q
+        max_iterations: Iteration cap
+    
+    Returns:
+        Critical values shaped like the broadcast of p and df
+    """
+    p, df = np.broadcast_arrays(np.asarray(p, dtype=float), np.asarray(df, dtype=float))
+    if np.any((p <= 0) | (p >= 1)):
+        # p = 1 has no finite quantile, and the bracketing below would never stop
+        raise ValueError("Probabilities must be strictly between 0 and 1")
+    shape = p.shape
+    target = np.log1p(-p.ravel())
+    df = df.ravel()
+    
+    # Bracket the root: sf(0) = 1, then double the upper end until sf drops below the target
+    lower = np.zeros(target.shape)
+    f_lower = -target
+    upper = np.full(target.shape, 4.0)
+    f_upper = np.log(np.maximum(studentized_range_sf(upper, k, df), 1e-300)) - target
+    while np.any(f_upper > 0):
+        grow = f_upper > 0
+        lower[grow], f_lower[grow] = upper[grow], f_upper[grow]
+        upper[grow] *= 2
+        f_upper[grow] = np.log(np.maximum(studentized_range_sf(upper[grow], k, df[grow]), 1e-300)) - target[grow]
+    
+    side = np.zeros(target.shape, dtype=int)
+    active = np.flatnonzero(upper - lower > tolerance)
+    for _ in range(max_iterations):
+        if len(active) == 0:
+            break
+        a, b, fa, fb = lower[active], upper[active], f_lower[active], f_upper[active]
+        c = np.clip(b - fb * (b - a) / (fb - fa), a, b)
+        fc = np.log(np.maximum(studentized_range_sf(c, k, df[active]), 1e-300)) - target[active]
+        
+        # Keep the sign change in [lower, upper]; halve the stale end's
+        # value when the same side is kept twice (Illinois)
+        left = fc > 0
+        lower[active[left]], f_lower[active[left]] = c[left], fc[left]
+        upper[active[~left]], f_upper[active[~left]] = c[~left], fc[~left]
+        stale_upper = left & (side[active] > 0)
+        stale_lower = ~left & (side[active] < 0)
+        f_upper[active[stale_upper]] /= 2
+        f_lower[active[stale_lower]] /= 2
+        side[active] = np.where(left, 1, -1)
+        
+        converged = (np.abs(fc) < 1e-12) | (upper[active] - lower[active] < tolerance)
+        done = active[converged]
+        lower[done] = upper[done] = c[converged]
+        active = active[~converged]
+    
+    q = ((lower + upper) / 2).reshape(shape)
+    return q[()] if q.ndim == 0 else q
@@ -0,0 +1,763 @@
+#Keith Ngamphon McKenzie
+#keith@mckenzie.page
+#https://mckenzie.page
+#Python Simple Statistical Tests
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+# Integer labels below DENSE_LABEL_FACTOR * n + DENSE_LABEL_SLACK are coded
+# with one bincount; larger ones would allocate a table mostly of empty slots
+DENSE_LABEL_FACTOR = 2
+DENSE_LABEL_SLACK = 1024
+
+# Floats beyond 2**53 are not all exact integers, so are not cast to int64
+FLOAT_INTEGER_LIMIT = 2.0**53
+
+# A contingency cell is keyed by (row code << CELL_CODE_BITS) | column code
+CELL_CODE_BITS = 31
+CELL_CODE_MASK = (1 << CELL_CODE_BITS) - 1
+
+class RunningMoments:
+    """
+    Mergeable first and second moments of a sample
+    
+    Keeps count, mean, M2 (sum of squared deviations from the mean), min and
+    max. Blocks of data are folded in with Chan et al.'s parallel update of
+    Welford's algorithm, so a dataset can grow without being rescanned.
+    """
+    
+    __slots__ = ('count', 'mean', 'm2', 'minimum', 'maximum')
+    
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0,
+                 minimum: float = math.inf, maximum: float = -math.inf):
+        self.count = int(count)
+        self.mean = float(mean)
+        self.m2 = float(m2)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+    
+    @classmethod
+    def from_array(cls, values: Union[Sequence[float], np.ndarray]) -> 'RunningMoments':
+        """
+        Compute moments of a block of values in one vectorized pass
+        
+        Args:
+            values: Sample values
+        
+        Returns:
+            RunningMoments for the block
+        """
+        data = np.asarray(values, dtype=np.float64).ravel()
+        if len(data) == 0:
+            return cls()
+        
+        mean = data.mean()
+        deviations = data - mean
+        return cls(len(data), mean, np.dot(deviations, deviations), data.min(), data.max())
+    
+    @classmethod
+    def from_summary(cls, count: int, mean: float, variance: float,
+                     minimum: float = math.nan, maximum: float = math.nan) -> 'RunningMoments':
+        """
+        Build moments from already-aggregated summary statistics
+        
+        Args:
+            count: Sample size
+            mean: Sample mean
+            variance: Sample variance (ddof=1)
+            minimum: Smallest value, if known
+            maximum: Largest value, if known
+        
+        Returns:
+            RunningMoments equivalent to those of the raw sample
+        """
+        if count < 1:
+            raise ValueError("Sample size must be positive")
+        if variance < 0:
+            raise ValueError("Variance must be non-negative")
+        return cls(count, mean, variance * (count - 1), minimum, maximum)
+    
+    def merge(self, other: 'RunningMoments') -> 'RunningMoments':
+        """
+        Combine two sets of moments (Chan et al. pairwise update)
+        
+        Args:
+            other: Moments of another, disjoint block
+        
+        Returns:
+            New RunningMoments describing both blocks
+        """
+        if other.count == 0:
+            return self.copy()
+        if self.count == 0:
+            return other.copy()
+        
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.count / n
+        m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / n
+        
+        return RunningMoments(n, mean, m2, min(self.minimum, other.minimum),
+                              max(self.maximum, other.maximum))
+    
+    def update(self, values: Union[Sequence[float], np.ndarray]) -> 'RunningMoments':
+        """
+        Fold a block of new values into these moments in place
+        
+        Args:
+            values: New sample values
+        
+        Returns:
+            self, for chaining
+        """
+        merged = self.merge(RunningMoments.from_array(values))
+        self.count, self.mean, self.m2 = merged.count, merged.mean, merged.m2
+        self.minimum, self.maximum = merged.minimum, merged.maximum
+        return self
+    
+    @classmethod
+    def combine(cls, parts: Iterable['RunningMoments']) -> 'RunningMoments':
+        """Merge any number of partial moments"""
+        total = cls()
+        for part in parts:
+            total = total.merge(part)
+        return total
+    
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1), NaN when fewer than two values"""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+    
+    @property
+    def std_dev(self) -> float:
+        """Sample standard deviation (ddof=1)"""
+        return math.sqrt(self.variance) if self.count > 1 else math.nan
+    
+    @property
+    def population_std(self) -> float:
+        """Population standard deviation (ddof=0)"""
+        return math.sqrt(self.m2 / self.count) if self.count > 0 else math.nan
+    
+    def copy(self) -> 'RunningMoments':
+        """Return an independent copy"""
+        return RunningMoments(self.count, self.mean, self.m2, self.minimum, self.maximum)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form, suitable for JSON"""
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                'min': self.minimum, 'max': self.maximum}
+    
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> 'RunningMoments':
+        """Rebuild moments from to_dict() output"""
+        return cls(values['count'], values['mean'], values['m2'], values['min'], values['max'])
+    
+    def __repr__(self) -> str:
+        return (f"RunningMoments(count={self.count}, mean={self.mean:.6g}, "
+                f"m2={self.m2:.6g}, min={self.minimum:.6g}, max={self.maximum:.6g})")
+
+def moments_or_compute(data: Optional[Union[Sequence[float], np.ndarray]],
+                       moments: Optional[RunningMoments] = None) -> RunningMoments:
+    """
+    Use precomputed moments when available, otherwise compute them from data
+    
+    Args:
+        data: Sample values (may be None when moments are given)
+        moments: Precomputed moments
+    
+    Returns:
+        RunningMoments for the sample
+    """
+    if moments is not None:
+        return moments
+    if data is None:
+        raise ValueError("Either data or precomputed moments are required")
+    return RunningMoments.from_array(data)
+
+def encode_groups(labels: Union[Sequence[Any], np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map group labels to dense integer codes 0..k-1
+    
+    Non-negative integer labels (including integral floats) no larger than
+    a small multiple of the number of observations are used directly,
+    skipping label values that never occur; any other labels (e.g. sparse
+    IDs like 10**9) are factorized with np.unique, so the bincount table
+    never outgrows the data.
+    
+    Args:
+        labels: One group label per observation
+    
+    Returns:
+        tuple: (codes, group_labels) - group_labels[code] is the original label
+    """
+    labels = np.asarray(labels)
+    if labels.ndim != 1:
+        raise ValueError("Group labels must be one-dimensional")
+    if len(labels) == 0:
+        return np.empty(0, dtype=np.intp), labels[:0]
+    
+    if (labels.dtype.kind == 'f' and np.all(np.abs(labels) <= FLOAT_INTEGER_LIMIT)
+            and np.all(labels == np.round(labels))):
+        # Integer labels stored in a float dataset
+        labels = labels.astype(np.int64)
+    
+    if (labels.dtype.kind in 'iu' and labels.min() >= 0
+            and labels.max() < DENSE_LABEL_FACTOR * len(labels) + DENSE_LABEL_SLACK):
+        present = np.bincount(labels) > 0
+        if present.all():
+            return labels.astype(np.intp, copy=False), np.arange(len(present))
+        # Renumber to skip label values that never occur
+        lookup = np.cumsum(present) - 1
+        return lookup[labels], np.flatnonzero(present)
+    
+    group_labels, codes = np.unique(labels, return_inverse=True)
+    return codes.ravel(), group_labels
+
+def grouped_moments(values: Union[Sequence[float], np.ndarray],
+                    labels: Union[Sequence[Any], np.ndarray]) -> Tuple[np.ndarray, List[RunningMoments]]:
+    """
+    Moments of every group in one pass of bincount reductions
+    
+    Args:
+        values: Observations
+        labels: Group label of each observation (same length)
+    
+    Returns:
+        tuple: (group_labels, moments) with one RunningMoments per group
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    codes, group_labels = encode_groups(labels)
+    if len(codes) != len(values):
+        raise ValueError("Values and labels must have equal length")
+    
+    k = len(group_labels)
+    counts = np.bincount(codes, minlength=k)
+    means = np.bincount(codes, weights=values, minlength=k) / counts
+    
+    # Second pass about the group means keeps M2 numerically stable
+    deviations = values - means[codes]
+    m2 = np.bincount(codes, weights=deviations * deviations, minlength=k)
+    
+    minimums = np.full(k, np.inf)
+    maximums = np.full(k, -np.inf)
+    np.minimum.at(minimums, codes, values)
+    np.maximum.at(maximums, codes, values)
+    
+    moments = [RunningMoments(n, mean, ss, lo, hi)
+               for n, mean, ss, lo, hi in zip(counts, means, m2, minimums, maximums)]
+    return group_labels, moments
+
+class CrossProducts:
+    """
+    Mergeable sufficient statistics for simple linear regression
+    
+    Holds running moments of x and y plus their co-moment
+    C_xy = sum((x - mean_x) * (y - mean_y)). Together these give the
+    sums n, Σx, Σy, Σx², Σy² and Σxy in a numerically stable centred form,
+    and blocks are combined with the same pairwise update as RunningMoments.
+    
+    For the Durbin-Watson statistic it also keeps the lag sums Σ(Δx)²,
+    Σ(Δx)(Δy) and Σ(Δy)² of successive differences, with the first and
+    last pair of the block. Residual differences are Δe = Δy - b·Δx for any
+    intercept, so Σ(Δe)² follows from the lag sums once the slope is known.
+    The lag sums assume the blocks are merged in row order (self first).
+    """
+    
+    __slots__ = ('x', 'y', 'cxy', 'dxx', 'dxy', 'dyy', 'first', 'last')
+    
+    def __init__(self, x: Optional[RunningMoments] = None, y: Optional[RunningMoments] = None,
+                 cxy: float = 0.0, dxx: float = 0.0, dxy: float = 0.0, dyy: float = 0.0,
+                 first: Optional[Tuple[float, float]] = None,
+                 last: Optional[Tuple[float, float]] = None):
+        self.x = x if x is not None else RunningMoments()
+        self.y = y if y is not None else RunningMoments()
+        self.cxy = float(cxy)
+        self.dxx = float(dxx)
+        self.dxy = float(dxy)
+        self.dyy = float(dyy)
+        self.first = first
+        self.last = last
+    
+    @classmethod
+    def from_arrays(cls, x_values: Union[Sequence[float], np.ndarray],
+                    y_values: Union[Sequence[float], np.ndarray]) -> 'CrossProducts':
+        """
+        Compute cross-products of a block of paired values
+        
+        Args:
+            x_values: X values
+            y_values: Y values (same length)
+        
+        Returns:
+            CrossProducts for the block
+        """
+        x = np.asarray(x_values, dtype=np.float64).ravel()
+        y = np.asarray(y_values, dtype=np.float64).ravel()
+        if len(x) != len(y):
+            raise ValueError("X and Y blocks must have equal length")
+        if len(x) == 0:
+            return cls()
+        
+        x_moments = RunningMoments.from_array(x)
+        y_moments = RunningMoments.from_array(y)
+        cxy = np.dot(x - x_moments.mean, y - y_moments.mean)
+        dx, dy = np.diff(x), np.diff(y)
+        return cls(x_moments, y_moments, cxy, np.dot(dx, dx), np.dot(dx, dy), np.dot(dy, dy),
+                   (float(x[0]), float(y[0])), (float(x[-1]), float(y[-1])))
+    
+    @property
+    def count(self) -> int:
+        """Number of (x, y) pairs"""
+        return self.x.count
+    
+    @property
+    def cxx(self) -> float:
+        """Sum of squared deviations of x"""
+        return self.x.m2
+    
+    @property
+    def cyy(self) -> float:
+        """Sum of squared deviations of y"""
+        return self.y.m2
+    
+    def residual_lag_sum(self, slope: float) -> float:
+        """
+        Σ(e_t - e_{t-1})² of the residuals of a line with the given slope
+        
+        Args:
+            slope: Fitted slope (the intercept cancels in the differences)
+        
+        Returns:
+            Sum of squared successive residual differences
+        """
+        return max(self.dyy - 2 * slope * self.dxy + slope * slope * self.dxx, 0.0)
+    
+    def merge(self, other: 'CrossProducts') -> 'CrossProducts':
+        """
+        Combine cross-products of two disjoint blocks
+        
+        Args:
+            other: Cross-products of the block that follows this one
+        
+        Returns:
+            New CrossProducts describing both blocks
+        """
+        if other.count == 0:
+            return self.copy()
+        if self.count == 0:
+            return other.copy()
+        
+        n = self.count + other.count
+        dx = other.x.mean - self.x.mean
+        dy = other.y.mean - self.y.mean
+        cxy = self.cxy + other.cxy + dx * dy * self.count * other.count / n
+        
+        # The pair of rows straddling the boundary adds one more difference
+        step_x = other.first[0] - self.last[0]
+        step_y = other.first[1] - self.last[1]
+        return CrossProducts(self.x.merge(other.x), self.y.merge(other.y), cxy,
+                             self.dxx + other.dxx + step_x * step_x,
+                             self.dxy + other.dxy + step_x * step_y,
+                             self.dyy + other.dyy + step_y * step_y,
+                             self.first, other.last)
+    
+    def update(self, x_values: Union[Sequence[float], np.ndarray],
+               y_values: Union[Sequence[float], np.ndarray]) -> 'CrossProducts':
+        """Fold the next block of paired values into these cross-products in place"""
+        merged = self.merge(CrossProducts.from_arrays(x_values, y_values))
+        for name in CrossProducts.__slots__:
+            setattr(self, name, getattr(merged, name))
+        return self
+    
+    @classmethod
+    def combine(cls, parts: Iterable['CrossProducts']) -> 'CrossProducts':
+        """Merge any number of partial cross-products, given in row order"""
+        total = cls()
+        for part in parts:
+            total = total.merge(part)
+        return total
+    
+    def copy(self) -> 'CrossProducts':
+        """Return an independent copy"""
+        return CrossProducts(self.x.copy(), self.y.copy(), self.cxy,
+                             self.dxx, self.dxy, self.dyy, self.first, self.last)
+    
+    def __repr__(self) -> str:
+        return f"CrossProducts(n={self.count}, cxx={self.cxx:.6g}, cxy={self.cxy:.6g}, cyy={self.cyy:.6g})"
+
+class RegressionQR:
+    """
+    Mergeable triangular factor for multiple linear regression (TSQR)
+    
+    Holds the upper-triangular R of the QR factorization of the augmented
+    design [X | y] (intercept column included when requested), plus the
+    running moments of y. Q is never kept: blocks of rows are factored
+    separately and two factors merge by factoring their stacked R's, so
+    memory is O(p²) for any number of rows and the least-squares solution
+    keeps the accuracy of QR rather than that of the normal equations.
+    """
+    
+    __slots__ = ('r', 'y', 'intercept')
+    
+    def __init__(self, n_predictors: int, intercept: bool = True,
+                 r: Optional[np.ndarray] = None, y: Optional[RunningMoments] = None):
+        size = n_predictors + int(intercept) + 1
+        self.r = r if r is not None else np.zeros((size, size))
+        self.y = y if y is not None else RunningMoments()
+        self.intercept = intercept
+    
+    @staticmethod
+    def _triangle(stacked: np.ndarray) -> np.ndarray:
+        """Square R factor of a stacked block (zero rows added for short blocks)"""
+        size = stacked.shape[1]
+        r = np.linalg.qr(stacked, mode='r')
+        if r.shape[0] < size:
+            r = np.vstack([r, np.zeros((size - r.shape[0], size))])
+        return r
+    
+    @classmethod
+    def from_arrays(cls, x_values: Union[Sequence[Sequence[float]], np.ndarray],
+                    y_values: Union[Sequence[float], np.ndarray],
+                    intercept: bool = True) -> 'RegressionQR':
+        """
+        Factor a block of rows
+        
+        Args:
+            x_values: Predictor matrix (rows x predictors), or one predictor as a vector
+            y_values: Response values (same number of rows)
+            intercept: Whether the model has an intercept column
+        
+        Returns:
+            RegressionQR for the block
+        """
+        x = np.asarray(x_values, dtype=np.float64)
+        if x.ndim == 1:
+            x = x[:, np.newaxis]
+        y = np.asarray(y_values, dtype=np.float64).ravel()
+        if x.ndim != 2 or len(x) != len(y):
+            raise ValueError("Predictors must be a matrix with one row per response value")
+        
+        columns = [np.ones((len(y), 1))] if intercept else []
+        stacked = np.hstack(columns + [x, y[:, np.newaxis]])
+        r = cls._triangle(stacked) if len(y) else None
+        return cls(x.shape[1], intercept, r, RunningMoments.from_array(y))
+    
+    @property
+    def count(self) -> int:
+        """Number of rows"""
+        return self.y.count
+    
+    @property
+    def n_coefficients(self) -> int:
+        """Number of fitted coefficients (predictors plus intercept)"""
+        return self.r.shape[0] - 1
+    
+    def merge(self, other: 'RegressionQR') -> 'RegressionQR':
+        """
+        Combine the factors of two disjoint blocks of rows
+        
+        Args:
+            other: Factor of another block with the same predictors
+        
+        Returns:
+            New RegressionQR describing both blocks
+        """
+        if self.r.shape != other.r.shape or self.intercept != other.intercept:
+            raise ValueError("Blocks must have the same predictors")
+        if other.count == 0:
+            return self.copy()
+        if self.count == 0:
+            return other.copy()
+        
+        r = self._triangle(np.vstack([self.r, other.r]))
+        return RegressionQR(self.n_coefficients - int(self.intercept), self.intercept,
+                            r, self.y.merge(other.y))
+    
+    def update(self, x_values: Union[Sequence[Sequence[float]], np.ndarray],
+               y_values: Union[Sequence[float], np.ndarray]) -> 'RegressionQR':
+        """Fold a block of rows into this factor in place"""
+        merged = self.merge(RegressionQR.from_arrays(x_values, y_values, self.intercept))
+        self.r, self.y = merged.r, merged.y
+        return self
+    
+    def solve(self) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Least-squares fit from the triangular factor
+        
+        Returns:
+            tuple: (coefficients, inverse of X'X, residual sum of squares)
+        """
+        p = self.n_coefficients
+        r_x, r_y = self.r[:p, :p], self.r[:p, p]
+        
+        diagonal = np.abs(np.diag(r_x))
+        if np.any(diagonal <= np.finfo(np.float64).eps * max(p, self.count) * diagonal.max(initial=0.0)):
+            raise ValueError("Predictors are collinear (design matrix is rank deficient)")
+        
+        r_inverse = np.linalg.solve(r_x, np.eye(p))
+        coefficients = r_inverse @ r_y
+        return coefficients, r_inverse @ r_inverse.T, float(self.r[p, p]**2)
+    
+    def copy(self) -> 'RegressionQR':
+        """Return an independent copy"""
+        return RegressionQR(self.n_coefficients - int(self.intercept), self.intercept,
+                            self.r.copy(), self.y.copy())
+    
+    def __repr__(self) -> str:
+        return f"RegressionQR(n={self.count}, coefficients={self.n_coefficients}, intercept={self.intercept})"
+
+class LabelEncoder:
+    """
+    Growing dictionary from category labels to dense integer codes
+    
+    Codes are handed out in order of first appearance and never change, so
+    blocks of records encoded one after another share one code space. Each
+    block is factorized with np.unique, so the Python-level work is per
+    distinct label rather than per record.
+    """
+    
+    __slots__ = ('labels', '_codes')
+    
+    def __init__(self, labels: Optional[Iterable[Any]] = None):
+        self.labels: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+        if labels is not None:
+            self.codes_for(labels)
+    
+    def __len__(self) -> int:
+        return len(self.labels)
+    
+    def codes_for(self, labels: Iterable[Any]) -> np.ndarray:
+        """Codes of the given distinct labels, adding unseen ones"""
+        codes = []
+        for label in labels:
+            code = self._codes.get(label)
+            if code is None:
+                code = self._codes[label] = len(self.labels)
+                self.labels.append(label)
+            codes.append(code)
+        return np.array(codes, dtype=np.intp)
+    
+    def encode(self, values: Union[Sequence[Any], np.ndarray]) -> np.ndarray:
+        """
+        Encode a block of labels
+        
+        Args:
+            values: One label per record
+        
+        Returns:
+            Integer code per record
+        """
+        values = np.asarray(values)
+        if values.ndim != 1:
+            raise ValueError("Category labels must be one-dimensional")
+        if len(values) == 0:
+            return np.empty(0, dtype=np.intp)
+        
+        distinct, inverse = np.unique(values, return_inverse=True)
+        return self.codes_for(distinct.tolist())[inverse.ravel()]
+    
+    def truncate(self, size: int):
+        """Forget every label added after the first size ones"""
+        for label in self.labels[size:]:
+            del self._codes[label]
+        del self.labels[size:]
+    
+    def copy(self) -> 'LabelEncoder':
+        """Return an independent copy"""
+        return LabelEncoder(self.labels)
+
+class CategoryCounts:
+    """
+    Mergeable frequency table of one categorical variable
+    
+    Raw records are folded in block by block: labels are dictionary-encoded
+    and counted with np.bincount, so no Python list of records is built.
+    The counts feed ChiSquareTests.compute_chi_square_goodness_of_fit.
+    """
+    
+    __slots__ = ('categories', 'counts')
+    
+    def __init__(self):
+        self.categories = LabelEncoder()
+        self.counts = np.zeros(0, dtype=np.int64)
+    
+    @classmethod
+    def from_array(cls, values: Union[Sequence[Any], np.ndarray]) -> 'CategoryCounts':
+        """Count a block of records"""
+        return cls().update(values)
+    
+    @property
+    def total(self) -> int:
+        """Number of records"""
+        return int(self.counts.sum())
+    
+    def _grow(self):
+        """Extend the counts to cover newly seen categories"""
+        if len(self.counts) < len(self.categories):
+            self.counts = np.pad(self.counts, (0, len(self.categories) - len(self.counts)))
+    
+    def update(self, values: Union[Sequence[Any], np.ndarray]) -> 'CategoryCounts':
+        """
+        Fold a block of records into the counts in place
+        
+        Args:
+            values: One category label per record
+        
+        Returns:
+            self, for chaining
+        """
+        codes = self.categories.encode(values)
+        self._grow()
+        self.counts += np.bincount(codes, minlength=len(self.counts))
+        return self
+    
+    def merge(self, other: 'CategoryCounts') -> 'CategoryCounts':
+        """
+        Combine the counts of two disjoint blocks of records
+        
+        Args:
+            other: Counts of another block
+        
+        Returns:
+            New CategoryCounts describing both blocks
+        """
+        merged = self.copy()
+        codes = merged.categories.codes_for(other.categories.labels)
+        merged._grow()
+        merged.counts[codes] += other.counts
+        return merged
+    
+    def copy(self) -> 'CategoryCounts':
+        """Return an independent copy"""
+        duplicate = CategoryCounts()
+        duplicate.categories = self.categories.copy()
+        duplicate.counts = self.counts.copy()
+        return duplicate
+    
+    def __repr__(self) -> str:
+        return f"CategoryCounts(categories={len(self.categories)}, total={self.total})"
+
+class ContingencyCounts:
+    """
+    Mergeable two-way contingency table built from raw categorical records
+    
+    Row and column labels are dictionary-encoded separately. Only the
+    non-empty cells are kept, as sorted combined codes
+    (row << CELL_CODE_BITS) | col with a count each, so a table over
+    thousands of categories on each axis costs memory in proportion to its
+    occupied cells rather than R x C. Each block of records is reduced with
+    np.unique and folded into the cells. The table feeds
+    ChiSquareTests.compute_chi_square_association.
+    """
+    
+    __slots__ = ('rows', 'cols', 'keys', 'counts')
+    
+    def __init__(self):
+        self.rows = LabelEncoder()
+        self.cols = LabelEncoder()
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+    
+    @classmethod
+    def from_arrays(cls, row_values: Union[Sequence[Any], np.ndarray],
+                    col_values: Union[Sequence[Any], np.ndarray]) -> 'ContingencyCounts':
+        """Count a block of (row category, column category) records"""
+        return cls().update(row_values, col_values)
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Number of row and column categories"""
+        return len(self.rows), len(self.cols)
+    
+    @property
+    def total(self) -> int:
+        """Number of records"""
+        return int(self.counts.sum())
+    
+    def cells(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Non-empty cells in row-major order
+        
+        Returns:
+            tuple: (row codes, column codes, counts)
+        """
+        return (self.keys >> CELL_CODE_BITS).astype(np.intp), \
+               (self.keys & CELL_CODE_MASK).astype(np.intp), self.counts
+    
+    @staticmethod
+    def _cell_keys(row_codes: np.ndarray, col_codes: np.ndarray) -> np.ndarray:
+        """Combined cell keys of row and column codes"""
+        return (row_codes.astype(np.int64) << CELL_CODE_BITS) | col_codes.astype(np.int64)
+    
+    def _add_cells(self, keys: np.ndarray, counts: np.ndarray):
+        """Fold (cell key, count) pairs into the cells"""
+        keys, inverse = np.unique(np.concatenate([self.keys, keys]), return_inverse=True)
+        merged = np.zeros(len(keys), dtype=np.int64)
+        np.add.at(merged, inverse.ravel(), np.concatenate([self.counts, counts]))
+        self.keys, self.counts = keys, merged
+    
+    def update(self, row_values: Union[Sequence[Any], np.ndarray],
+               col_values: Union[Sequence[Any], np.ndarray]) -> 'ContingencyCounts':
+        """
+        Fold a block of records into the table in place
+        
+        Args:
+            row_values: Row category of each record
+            col_values: Column category of each record (same length)
+        
+        Returns:
+            self, for chaining
+        """
+        if len(row_values) != len(col_values):
+            raise ValueError("Row and column categories must have equal length")
+        
+        # A rejected block must not leave its categories behind without counts
+        n_rows, n_cols = len(self.rows), len(self.cols)
+        try:
+            row_codes = self.rows.encode(row_values)
+            col_codes = self.cols.encode(col_values)
+            if max(len(self.rows), len(self.cols)) > CELL_CODE_MASK:
+                raise ValueError(f"At most {CELL_CODE_MASK} categories per axis are supported")
+        except ValueError:
+            self.rows.truncate(n_rows)
+            self.cols.truncate(n_cols)
+            raise
+        
+        # Reduce the block to its distinct cells before merging
+        keys, counts = np.unique(self._cell_keys(row_codes, col_codes), return_counts=True)
+        self._add_cells(keys, counts.astype(np.int64))
+        return self
+    
+    def merge(self, other: 'ContingencyCounts') -> 'ContingencyCounts':
+        """
+        Combine the tables of two disjoint blocks of records
+        
+        Args:
+            other: Table of another block
+        
+        Returns:
+            New ContingencyCounts describing both blocks
+        """
+        merged = self.copy()
+        row_codes = merged.rows.codes_for(other.rows.labels)
+        col_codes = merged.cols.codes_for(other.cols.labels)
+        other_rows, other_cols, other_counts = other.cells()
+        merged._add_cells(merged._cell_keys(row_codes[other_rows], col_codes[other_cols]),
+                          other_counts)
+        return merged
+    
+    def copy(self) -> 'ContingencyCounts':
+        """Return an independent copy"""
+        duplicate = ContingencyCounts()
+        duplicate.rows = self.rows.copy()
+        duplicate.cols = self.cols.copy()
+        duplicate.keys = self.keys.copy()
+        duplicate.counts = self.counts.copy()
+        return duplicate
+    
+    def __repr__(self) -> str:
+        return (f"ContingencyCounts(rows={len(self.rows)}, cols={len(self.cols)}, "
+                f"cells={len(self.keys)}, total={self.total})")
@@ -4,22 +4,40 @@
 #Python Simple Statistical Tests
 
 import re
+import warnings
 from typing import List, Any, Optional
 import numpy as np
 
-def parse_comma_separated(data_str: str) -> List[float]:
+def parse_comma_separated(data_str: str) -> np.ndarray:
     """
-    Parse comma-separated string into list of floats
+    Parse comma-separated string into an array of floats
+    
+    Well-formed input is parsed in one C-level call (np.fromstring); input
+    with empty fields or embedded spaces falls back to token-by-token parsing.
     
     Args:
         data_str: String containing comma-separated numbers
         
     Returns:
-        List of float values
+        float64 array of values
         
     Raises:
         ValueError: If parsing fails
     """
+    if not data_str.strip():
+        raise ValueError("No valid numbers found")
+    
+    with warnings.catch_warnings():
+        # Older NumPy warns (rather than raises) when it stops on malformed input
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            values = np.fromstring(data_str, dtype=np.float64, sep=',')
+            # Trust the fast path only when every field became one number
+            if len(values) > 0 and len(values) == data_str.count(',') + 1:
+                return values
+        except (ValueError, DeprecationWarning):
+            pass
+    
     # Remove extra whitespace and split by comma
     cleaned = re.sub(r'\s+', '', data_str)
     parts = cleaned.split(',')
@@ -31,7 +49,7 @@ def parse_comma_separated(data_str: str) -> List[float]:
         raise ValueError("No valid numbers found")
     
     try:
-        return [float(p) for p in parts]
+        return np.array([float(p) for p in parts], dtype=np.float64)
     except ValueError as e:
         raise ValueError(f"Invalid number format: {e}")
 
@@ -45,9 +63,13 @@ def validate_numeric_data(data: List[Any]) -> bool:
     Returns:
         bool: True if all values are numeric
     """
-    if not data:
+    if data is None or len(data) == 0:
         return False
     
+    # Arrays already carry a dtype, so there is nothing to convert
+    if isinstance(data, np.ndarray):
+        return bool(np.issubdtype(data.dtype, np.number))
+    
     try:
         [float(x) for x in data]
         return True
@@ -80,30 +102,43 @@ def validate_equal_sample_sizes(data1: List[float], data2: List[float]) -> bool:
     """
     return len(data1) == len(data2)
 
-def validate_normality_assumption(data: List[float], min_size: int = 30) -> tuple:
+def validate_normality_assumption(data: Optional[List[float]], min_size: int = 30,
+                                  moments=None) -> tuple:
     """
     Basic check for normality assumption
     
     Args:
-        data: Dataset to check
+        data: Dataset to check (may be None when moments are given)
         min_size: Minimum size for Central Limit Theorem
+        moments: Optional RunningMoments for the dataset; when its min and max
+                 are within 3 standard deviations the data is not rescanned
         
     Returns:
         tuple: (is_valid, warning_message)
     """
-    n = len(data)
+    n = moments.count if moments is not None else len(data)
     
     if n < min_size:
         return False, f"Sample size ({n}) is small. Consider normality testing."
     
     # Check for extreme outliers (beyond 3 standard deviations)
     if n > 1:
-        mean = np.mean(data)
-        std = np.std(data)
-        outliers = [x for x in data if abs(x - mean) > 3 * std]
+        if moments is not None:
+            std = moments.population_std
+            if (moments.maximum - moments.mean <= 3 * std and
+                    moments.mean - moments.minimum <= 3 * std):
+                return True, "Sample size adequate for normality assumption."
+            if data is None:
+                # Counting outliers needs the raw values; rely on sample size alone
+                return True, "Sample size adequate for normality assumption."
+        
+        values = np.asarray(data, dtype=float)
+        mean = values.mean()
+        std = values.std()
+        n_outliers = int(np.count_nonzero(np.abs(values - mean) > 3 * std))
         
-        if len(outliers) > n * 0.05:  # More than 5% outliers
-            return False, f"Dataset has {len(outliers)} potential outliers. Check normality."
+        if n_outliers > n * 0.05:  # More than 5% outliers
+            return False, f"Dataset has {n_outliers} potential outliers. Check normality."
     
     return True, "Sample size adequate for normality assumption."
 
@@ -191,6 +226,24 @@ def get_hypothesis_input(test_name: str) -> tuple:
     
     return null_hyp, alt_hyp
 
+def get_float_input(prompt: str, default: float = 0.0) -> float:
+    """
+    Ask the user for a number, re-prompting until one is entered
+    
+    Args:
+        prompt: Prompt text
+        default: Value used when the user just presses Enter
+    
+    Returns:
+        The entered number
+    """
+    while True:
+        try:
+            value = input(prompt).strip()
+            return float(value) if value else default
+        except ValueError:
+            print("Please enter a valid number.")
+
 def validate_correlation_data(x_data: List[float], y_data: List[float]) -> tuple:
     """
     Validate data for correlation analysis
@@ -209,10 +262,10 @@ def validate_correlation_data(x_data: List[float], y_data: List[float]) -> tuple
         return False, "Need at least 3 data points for correlation"
     
     # Check for constant variables
-    if len(set(x_data)) == 1:
+    if np.ptp(np.asarray(x_data, dtype=float)) == 0:
         return False, "X variable is constant (no variation)"
     
-    if len(set(y_data)) == 1:
+    if np.ptp(np.asarray(y_data, dtype=float)) == 0:
         return False, "Y variable is constant (no variation)"
     
     return True, None